@@ -1,26 +1,13 @@
-import json
-import numpy as np
+import os
+import joblib
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, accuracy_score
 
 # -------------------------------
-# 1. LOAD DATA
+# 1. LOAD TRAINED MODELS
+# Trained by main_control/train_models.py; nothing is fitted on import.
 # -------------------------------
-with open(r"D:\Codesprint2k25\detection_engine\earthquake_synthetic_dataset.json", "r") as f:
-    data = json.load(f)
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main_control", "Models")
 
-df = pd.DataFrame(data)
-
-# -------------------------------
-# 2. KEEP ONLY EARTHQUAKE EVENTS
-# -------------------------------
-df = df[df["label"] == "abnormal"].reset_index(drop=True)
-
-# -------------------------------
-# 3. FEATURE SELECTION
-# -------------------------------
 FEATURES = [
     "p_wave_amplitude",
     "s_wave_amplitude",
@@ -28,70 +15,15 @@ FEATURES = [
     "frequency_hz"
 ]
 
-X = df[FEATURES]
-
-# -------------------------------
-# 4. CREATE SYNTHETIC TARGETS
-# -------------------------------
-
-# 4.1 Magnitude (synthetic but realistic)
-df["magnitude"] = (
-    df["p_wave_amplitude"] + df["s_wave_amplitude"]
-) * 2.5
-
-# 4.2 Depth (already exists in dataset)
-y_depth = df["depth_km"]
-
-# 4.3 Epicenter (synthetic land / ocean)
-# Even longitude → ocean, Odd → land
-df["epicenter"] = df["longitude"].apply(
-    lambda x: 1 if int(abs(x)) % 2 == 0 else 0
-)  # 1 = ocean, 0 = land
-
-# Targets
-y_mag = df["magnitude"]
-y_epi = df["epicenter"]
-
-# -------------------------------
-# 5. TRAIN / TEST SPLIT
-# -------------------------------
-X_train, X_test, y_mag_train, y_mag_test = train_test_split(
-    X, y_mag, test_size=0.2, random_state=42
-)
-
-_, _, y_depth_train, y_depth_test = train_test_split(
-    X, y_depth, test_size=0.2, random_state=42
-)
-
-_, _, y_epi_train, y_epi_test = train_test_split(
-    X, y_epi, test_size=0.2, random_state=42
-)
-
-# -------------------------------
-# 6. TRAIN MODELS
-# -------------------------------
-mag_model = RandomForestRegressor(n_estimators=100, random_state=42)
-depth_model = RandomForestRegressor(n_estimators=100, random_state=42)
-epi_model = RandomForestClassifier(n_estimators=100, random_state=42)
-
-mag_model.fit(X_train, y_mag_train)
-depth_model.fit(X_train, y_depth_train)
-epi_model.fit(X_train, y_epi_train)
-
-# -------------------------------
-# 7. EVALUATION
-# -------------------------------
-print("Magnitude MAE:",
-      round(mean_absolute_error(y_mag_test, mag_model.predict(X_test)), 2))
-
-print("Depth MAE:",
-      round(mean_absolute_error(y_depth_test, depth_model.predict(X_test)), 2))
+_models = {}
 
-print("Epicenter Accuracy:",
-      round(accuracy_score(y_epi_test, epi_model.predict(X_test)), 2))
+def get_model(name):
+    if name not in _models:
+        _models[name] = joblib.load(os.path.join(MODEL_DIR, name + ".pkl"))
+    return _models[name]
 
 # -------------------------------
-# 8. PREDICTION FUNCTION
+# 2. PREDICTION FUNCTION
 # -------------------------------
 def predict_earthquake(features):
     """
@@ -104,9 +36,9 @@ def predict_earthquake(features):
 
     input_df = pd.DataFrame([features])
 
-    magnitude = mag_model.predict(input_df)[0]
-    depth = depth_model.predict(input_df)[0]
-    epicenter = epi_model.predict(input_df)[0]
+    magnitude = get_model("earthquake_magnitude").predict(input_df)[0]
+    depth = get_model("earthquake_depth").predict(input_df)[0]
+    epicenter = get_model("earthquake_epicenter").predict(input_df)[0]
 
     return {
         "magnitude": round(float(magnitude), 2),
@@ -115,7 +47,7 @@ def predict_earthquake(features):
     }
 
 # -------------------------------
-# 9. TEST SAMPLE
+# 3. TEST SAMPLE
 # -------------------------------
 if __name__ == "__main__":
     test_sample = {
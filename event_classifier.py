@@ -1,67 +1,26 @@
-import json
+import os
+import joblib
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
 
 # -------------------------------
-# 1. LOAD DATA
+# 1. LOAD TRAINED MODEL
+# Trained by main_control/train_models.py; nothing is fitted on import.
 # -------------------------------
-with open("D:\Codesprint2k25\detection_engine\earthquake_synthetic_dataset.json", "r") as f:
-    data = json.load(f)
-
-df = pd.DataFrame(data)
-
-# -------------------------------
-# 2. LABEL ENCODING
-# normal -> 0
-# earthquake -> 1
-# -------------------------------
-df["label_encoded"] = df["label"].map({
-    "normal": 0,
-    "abnormal": 1
-})
-
-# -------------------------------
-# 3. FEATURE SELECTION
-# -------------------------------
-FEATURES = [
-    "p_wave_amplitude",
-    "s_wave_amplitude",
-    "ps_time_diff_sec",
-    "frequency_hz"
-]
-
-X = df[FEATURES]
-y = df["label_encoded"]
-
-# -------------------------------
-# 4. TRAIN / TEST SPLIT
-# -------------------------------
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
-
-# -------------------------------
-# 5. TRAIN MODEL
-# -------------------------------
-model = RandomForestClassifier(
-    n_estimators=100,
-    random_state=42
+MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "main_control", "Models", "event_classifier.pkl"
 )
-model.fit(X_train, y_train)
 
-# -------------------------------
-# 6. EVALUATION
-# -------------------------------
-y_pred = model.predict(X_test)
-accuracy = accuracy_score(y_test, y_pred)
+_model = None
 
-print("Event Classifier Accuracy:", round(accuracy, 3))
+def get_model():
+    global _model
+    if _model is None:
+        _model = joblib.load(MODEL_PATH)
+    return _model
 
 # -------------------------------
-# 7. PREDICTION FUNCTION
+# 2. PREDICTION FUNCTION
 # -------------------------------
 def is_earthquake_event(sample):
     """
@@ -78,7 +37,7 @@ def is_earthquake_event(sample):
         sample["frequency_hz"]
     ]])
 
-    prob = model.predict_proba(input_data)[0][1]
+    prob = get_model().predict_proba(input_data)[0][1]
 
     is_event = prob >= 0.9
 
@@ -89,7 +48,7 @@ def is_earthquake_event(sample):
 
 
 # -------------------------------
-# 8. TEST WITH ONE SAMPLE
+# 3. TEST WITH ONE SAMPLE
 # -------------------------------
 if __name__ == "__main__":
     test_sample = {
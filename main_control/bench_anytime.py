@@ -0,0 +1,83 @@
+"""
+Compare anytime (early-exit) threshold decisions against full evaluation.
+
+    python bench_anytime.py [--scenarios 2000] [--repeat 300] [--chunk 16]
+
+Scenarios come from the simulation engine, turned into the seismic and
+tsunami inputs the event loop builds.  For is_earthquake_event and
+evaluate_tsunami it checks every anytime decision equals the full one,
+and reports how many trees were evaluated and the single-row latency of
+both modes.
+"""
+import argparse
+import time
+
+import numpy as np
+
+import compiled_forest
+from event_classifier import MODEL_NAME as EVENT_MODEL
+from event_classifier import is_earthquake_event
+from model_registry import get_compiled
+from simengine import SimulationEngine
+from tsunami_evaluator import MODEL_NAME as TSUNAMI_MODEL
+from tsunami_evaluator import evaluate_tsunami
+
+
+def seismic_input(s):
+    # as event_stream_with_models.run_cycle derives it
+    return {
+        "p_wave_amplitude": s["magnitude"]**1.4,
+        "s_wave_amplitude": s["magnitude"]**1.6,
+        "ps_time_diff_sec": max(0.5, s["depth_km"]/8),
+        "frequency_hz": max(0.8, 8 - s["magnitude"])
+    }
+
+
+def single_row_ms(fn, samples, repeat, **kwargs):
+    times = []
+    for i in range(repeat):
+        t = time.perf_counter()
+        fn(samples[i % len(samples)], **kwargs)
+        times.append(time.perf_counter() - t)
+    return np.percentile(times, 50) * 1e3, np.percentile(times, 99) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--chunk", type=int, default=compiled_forest.ANYTIME_CHUNK)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    compiled_forest.ANYTIME_CHUNK = args.chunk
+
+    engine = SimulationEngine(args.seed)
+    scenarios = [engine.get_next_state() for _ in range(args.scenarios)]
+    cases = [
+        ("event_classifier", EVENT_MODEL, is_earthquake_event,
+         [seismic_input(s) for s in scenarios], lambda r: bool(r["is_earthquake"])),
+        ("tsunami_model", TSUNAMI_MODEL, evaluate_tsunami,
+         scenarios, lambda r: (r["severity"], r["tsunami_alert"])),
+    ]
+
+    header = (f"{'model':<18}{'trees':>6}{'agree':>8}{'mean eval':>11}{'p50 eval':>10}"
+              f"{'full p50':>10}{'any p50':>9}{'full p99':>10}{'any p99':>9}")
+    print(header)
+    print("-" * len(header))
+    for label, model, fn, samples, decision in cases:
+        n_trees = get_compiled(model).n_trees
+        full = [fn(sample, anytime=False) for sample in samples]
+        fast = [fn(sample, anytime=True) for sample in samples]
+        agree = np.mean([decision(a) == decision(b) for a, b in zip(full, fast)])
+        evaluated = np.array([r["trees_evaluated"] for r in fast])
+
+        full_p50, full_p99 = single_row_ms(fn, samples, args.repeat, anytime=False)
+        any_p50, any_p99 = single_row_ms(fn, samples, args.repeat, anytime=True)
+        print(f"{label:<18}{n_trees:>6}{agree:>8.1%}{evaluated.mean():>11.1f}"
+              f"{np.median(evaluated):>10.0f}{full_p50:>10.3f}{any_p50:>9.3f}"
+              f"{full_p99:>10.3f}{any_p99:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
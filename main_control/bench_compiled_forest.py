@@ -0,0 +1,117 @@
+"""
+Compare CompiledForest against the pickled sklearn forests.
+
+    python bench_compiled_forest.py [--rows 2000] [--batch 64] [--repeat 200]
+
+For every model in Models/ it checks the outputs are bit-identical and
+reports single-row, small-batch and full-batch latency for both
+implementations.  Full batches above compiled_forest.LARGE_BATCH are
+handed back to sklearn, so that column should roughly tie.
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+
+from compiled_forest import CompiledForest
+
+BASE_DIR = os.path.dirname(__file__)
+MODEL_DIR = os.path.join(BASE_DIR, "Models")
+
+FOREST_MODELS = [
+    "event_classifier",
+    "earthquake_magnitude",
+    "earthquake_depth",
+    "earthquake_epicenter",
+    "tsunami_model",
+    "landslide_model",
+]
+
+
+def sample_inputs(model, rows, rng):
+    # Sweep each feature over a range wider than the split thresholds
+    lo = np.full(model.n_features_in_, np.inf)
+    hi = np.full(model.n_features_in_, -np.inf)
+    for est in model.estimators_:
+        tree = est.tree_
+        for f in range(model.n_features_in_):
+            t = tree.threshold[tree.feature == f]
+            if len(t):
+                lo[f] = min(lo[f], t.min())
+                hi[f] = max(hi[f], t.max())
+    lo = np.where(np.isfinite(lo), lo, 0.0)
+    hi = np.where(np.isfinite(hi), hi, 1.0)
+    span = hi - lo
+    return rng.uniform(lo - 0.2 * span, hi + 0.2 * span, size=(rows, model.n_features_in_))
+
+
+def time_calls(fn, X, repeat):
+    samples = []
+    for i in range(repeat):
+        row = X[i % len(X)][None, :]
+        t = time.perf_counter()
+        fn(row)
+        samples.append(time.perf_counter() - t)
+    return np.percentile(samples, 50) * 1e3, np.percentile(samples, 99) * 1e3
+
+
+def time_batch(fn, X, repeat=5):
+    best = np.inf
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(X)
+        best = min(best, time.perf_counter() - t)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    header = (f"{'model':<22}{'identical':>10}{'sk p50':>9}{'sk p99':>9}"
+              f"{'cf p50':>9}{'cf p99':>9}{'sk small':>10}{'cf small':>10}"
+              f"{'sk full':>9}{'cf full':>9}")
+    print(header)
+    print("-" * len(header))
+
+    for name in FOREST_MODELS:
+        model = joblib.load(os.path.join(MODEL_DIR, name + ".pkl"))
+        compiled = CompiledForest.from_sklearn(model)
+        X = sample_inputs(model, args.rows, rng)
+
+        if hasattr(model, "classes_"):
+            sk_fn, cf_fn = model.predict_proba, compiled.predict_proba
+        else:
+            sk_fn, cf_fn = model.predict, compiled.predict
+
+        identical = (
+            np.array_equal(sk_fn(X), cf_fn(X)) and
+            np.array_equal(sk_fn(X[:args.batch]), cf_fn(X[:args.batch])) and
+            np.array_equal(model.predict(X), compiled.predict(X)) and
+            all(np.array_equal(sk_fn(X[i:i + 1]), cf_fn(X[i:i + 1])) for i in range(50))
+        )
+
+        sk50, sk99 = time_calls(sk_fn, X, args.repeat)
+        cf50, cf99 = time_calls(cf_fn, X, args.repeat)
+        sk_small = time_batch(sk_fn, X[:args.batch])
+        cf_small = time_batch(cf_fn, X[:args.batch])
+        sk_full = time_batch(sk_fn, X)
+        cf_full = time_batch(cf_fn, X)
+
+        print(f"{name:<22}{str(identical):>10}{sk50:>9.3f}{sk99:>9.3f}"
+              f"{cf50:>9.3f}{cf99:>9.3f}{sk_small:>10.2f}{cf_small:>10.2f}"
+              f"{sk_full:>9.2f}{cf_full:>9.2f}")
+
+    print(f"\nlatencies in ms; small = {args.batch} rows, full = {args.rows} rows, best of 5")
+
+
+if __name__ == "__main__":
+    main()
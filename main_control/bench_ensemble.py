@@ -0,0 +1,79 @@
+"""
+Measure EnsembleEngine throughput and check it against SimulationEngine.
+
+    python bench_ensemble.py [--worlds 10000] [--steps 200] [--scalar-worlds 200]
+
+Steps --worlds vectorized worlds for --steps steps and reports
+scenario-steps per second, next to the scalar engine's.  Then compares
+summary statistics of the scenarios both produce (phase shares, field
+means, fault mix), which should agree to within sampling noise.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from simengine import FAULT_TYPES, PHASES, SCENARIO_DTYPE, EnsembleEngine, SimulationEngine
+
+
+def summarize(records):
+    """records: structured SCENARIO_DTYPE array -> {statistic: value}."""
+    out = {}
+    for code, name in enumerate(PHASES):
+        out[f"phase {name}"] = float(np.mean(records["phase"] == code))
+    for code, name in enumerate(FAULT_TYPES):
+        out[f"fault {name}"] = float(np.mean(records["fault_type"] == code))
+    for field in ("magnitude", "depth_km", "ocean_depth_m", "vertical_displacement_m",
+                  "rainfall_mm", "soil_moisture", "slope_angle_deg", "ground_vibration"):
+        out[f"mean {field}"] = float(np.mean(records[field]))
+    return out
+
+
+def scalar_records(worlds, steps, seed):
+    engines = SimulationEngine(seed).spawn(worlds)
+    rows = []
+    start = time.perf_counter()
+    for _ in range(steps):
+        for engine in engines:
+            s = engine.get_next_state()
+            rows.append((s["magnitude"], s["depth_km"], s["ocean_depth_m"],
+                         FAULT_TYPES.index(s["fault_type"]), s["vertical_displacement_m"],
+                         s["distance_to_coast_km"], s["rainfall_mm"], s["soil_moisture"],
+                         s["slope_angle_deg"], s["vegetation_index"], s["soil_type"],
+                         s["ground_vibration"], PHASES.index(s["phase"])))
+    elapsed = time.perf_counter() - start
+    return np.array(rows, dtype=SCENARIO_DTYPE), worlds * steps / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--worlds", type=int, default=10000)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--scalar-worlds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ensemble = EnsembleEngine(args.worlds, seed=args.seed)
+    batches = []
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        batches.append(ensemble.get_next_state())
+    elapsed = time.perf_counter() - start
+    vector_rate = args.worlds * args.steps / elapsed
+
+    scalar, scalar_rate = scalar_records(args.scalar_worlds, args.steps, args.seed)
+    print(f"ensemble {args.worlds:,} worlds x {args.steps} steps: "
+          f"{vector_rate:,.0f} scenario-steps/s ({elapsed:.2f} s)")
+    print(f"scalar   {args.scalar_worlds:,} worlds x {args.steps} steps: "
+          f"{scalar_rate:,.0f} scenario-steps/s ({vector_rate / scalar_rate:.0f}x slower)\n")
+
+    vector = summarize(np.concatenate(batches))
+    reference = summarize(scalar)
+    print(f"{'statistic':<32}{'ensemble':>12}{'scalar':>12}")
+    print("-" * 56)
+    for name, value in vector.items():
+        print(f"{name:<32}{value:>12.4f}{reference[name]:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compare one multi-output magnitude/depth forest against the separate pair.
+
+    python bench_multi_output.py [--earthquake PATH] [--n-estimators N]
+                                 [--repeat 300] [--batch 64]
+
+Both layouts are trained here on the same 80/20 split with the same
+number of trees per forest, then compared on holdout MAE per target,
+artifact size (pickle and compiled node count), and the latency of
+FusedEarthquakePredictor as served, epicenter forest included.  Nothing
+is written to Models/; train the joint model for serving with
+`train_models.py --models earthquake_magnitude_depth` and set
+EARTHQUAKE_JOINT=1.
+"""
+import argparse
+import pickle
+import time
+
+import numpy as np
+
+from compiled_forest import CompiledForest
+from earthquake_detector import FusedEarthquakePredictor
+from model_tasks import DATASETS, load_dataset, split_task
+from train_models import train_one
+
+
+def single_row_ms(predictor, X, repeat):
+    samples = []
+    for i in range(repeat):
+        row = X[i % len(X)][None, :]
+        t = time.perf_counter()
+        predictor.predict(row)
+        samples.append(time.perf_counter() - t)
+    return np.percentile(samples, 50) * 1e3, np.percentile(samples, 99) * 1e3
+
+
+def batch_ms(predictor, X, repeat=20):
+    best = np.inf
+    for _ in range(repeat):
+        t = time.perf_counter()
+        predictor.predict(X)
+        best = min(best, time.perf_counter() - t)
+    return best * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--earthquake", default=DATASETS["earthquake"])
+    parser.add_argument("--n-estimators", type=int, default=None)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+
+    df = load_dataset(args.earthquake)
+    models = {}
+    for name in ["earthquake_magnitude", "earthquake_depth",
+                 "earthquake_magnitude_depth", "earthquake_epicenter"]:
+        models[name], metrics = train_one(name, df, args.n_jobs, args.n_estimators)
+        print(f"🏋️ {name}: {metrics['metric']} {metrics['value']} ({metrics['fit_seconds']} s)")
+
+    # The pair's tasks and the joint task split the same rows the same way
+    _, X_test, _, y_test = split_task("earthquake_magnitude_depth", df)
+    X = np.ascontiguousarray(X_test, dtype=np.float32)
+    y = np.asarray(y_test)
+
+    compiled = {name: CompiledForest.from_sklearn(model) for name, model in models.items()}
+    layouts = {
+        "pair": (["earthquake_magnitude", "earthquake_depth"],
+                 FusedEarthquakePredictor(compiled["earthquake_magnitude"],
+                                          compiled["earthquake_depth"],
+                                          compiled["earthquake_epicenter"])),
+        "joint": (["earthquake_magnitude_depth"],
+                  FusedEarthquakePredictor(compiled["earthquake_magnitude_depth"],
+                                           compiled["earthquake_epicenter"])),
+    }
+
+    header = (f"\n{'layout':<8}{'mag MAE':>9}{'depth MAE':>11}{'trees':>7}{'nodes':>9}"
+              f"{'pickle KB':>11}{'p50 ms':>9}{'p99 ms':>9}{f'batch{args.batch} ms':>13}")
+    print(header)
+    print("-" * (len(header) - 1))
+
+    batch = np.resize(X, (args.batch, X.shape[1]))
+    for layout, (names, predictor) in layouts.items():
+        mag, depth, _, _ = predictor.predict(X)
+        mag_mae = float(np.mean(np.abs(y[:, 0] - mag)))
+        depth_mae = float(np.mean(np.abs(y[:, 1] - depth)))
+
+        trees = sum(compiled[name].n_trees for name in names)
+        nodes = sum(compiled[name].n_nodes for name in names)
+        size_kb = sum(len(pickle.dumps(models[name])) for name in names) / 1024
+        p50, p99 = single_row_ms(predictor, X, args.repeat)
+        print(f"{layout:<8}{mag_mae:>9.4f}{depth_mae:>11.4f}{trees:>7}{nodes:>9}"
+              f"{size_kb:>11.1f}{p50:>9.3f}{p99:>9.3f}{batch_ms(predictor, batch):>13.3f}")
+
+    print("\ntrees / nodes / pickle cover the magnitude+depth forests only;"
+          " latency includes the fused epicenter forest")
+
+
+if __name__ == "__main__":
+    main()
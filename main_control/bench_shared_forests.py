@@ -0,0 +1,104 @@
+"""
+Compare worker memory with per-process joblib.load against a shared bundle.
+
+    python bench_shared_forests.py [--workers 4] [--bundle Models/forests.bundle]
+
+Starts --workers fresh processes per mode, has each one load every
+forest and touch all of its node arrays (the steady state after enough
+predictions), then reads /proc/self/smaps_rollup while all of them are
+alive.  RSS counts shared pages in every process; PSS splits them between
+the processes sharing them, so the PSS total is the real footprint.
+
+    baseline  interpreter + imports, no models
+    joblib    registry.compiled() from the pickles (what the server does today)
+    bundle    registry.compiled() from the memory-mapped bundle
+"""
+import argparse
+import multiprocessing as mp
+import os
+
+import numpy as np
+
+from shared_forests import BUNDLE_PATH, DEFAULT_MODELS, export_bundle
+
+MODES = ["baseline", "joblib", "bundle"]
+
+
+def memory_kb():
+    out = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                out[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": out["Rss"],
+        "pss": out["Pss"],
+        "uss": out.get("Private_Clean", 0) + out.get("Private_Dirty", 0)
+    }
+
+
+def _worker(mode, bundle, names, barrier, results):
+    from model_registry import ModelRegistry
+
+    if mode != "baseline":
+        registry = ModelRegistry(variants={}, bundle=bundle if mode == "bundle" else None)
+        if mode == "joblib":
+            registry.bundle = None              # ignore MODEL_BUNDLE from the environment
+        for name in names:
+            forest = registry.compiled(name)
+            for arr in (forest.feature, forest.threshold, forest.missing_left,
+                        forest.value, forest.children, forest._child_base):
+                np.asarray(arr).sum()           # fault every page in
+            forest.predict(np.zeros((1, forest.n_features)))
+
+    barrier.wait()                              # everyone loaded: measure together
+    results.put(memory_kb())
+    barrier.wait()                              # stay alive until all have measured
+
+
+def run_mode(mode, workers, bundle, names):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(mode, bundle, names, barrier, results))
+             for _ in range(workers)]
+    for p in procs:
+        p.start()
+    samples = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return {key: sum(s[key] for s in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS)
+    parser.add_argument("--bundle", default=BUNDLE_PATH)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.bundle):
+        from model_registry import ModelRegistry
+        registry = ModelRegistry(variants={})
+        export_bundle({name: registry.compiled(name) for name in args.models}, args.bundle)
+
+    header = f"{'mode':<10}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}{'PSS/worker':>12}{'models PSS':>12}"
+    print(f"{args.workers} workers, {len(args.models)} forests, bundle "
+          f"{os.path.getsize(args.bundle) / 2**20:.1f} MB")
+    print(header)
+    print("-" * len(header))
+
+    base = None
+    for mode in MODES:
+        total = run_mode(mode, args.workers, args.bundle, args.models)
+        base = total if base is None else base
+        print(f"{mode:<10}{total['rss'] / 1024:>10.1f}{total['pss'] / 1024:>10.1f}"
+              f"{total['uss'] / 1024:>10.1f}{total['pss'] / 1024 / args.workers:>12.1f}"
+              f"{(total['pss'] - base['pss']) / 1024:>12.1f}")
+
+    print("\nmodels PSS = PSS total above the baseline, i.e. what loading the forests costs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import threading
+from concurrent.futures import Future
+
+from landslide_predictor import predict_landslide_risk
+from tsunami_evaluator import evaluate_tsunami
+
+
+class Cascade:
+    """
+    Cheap rule stages in front of one predictor.
+
+    stages is a list of (name, check); check(sample) is True when the
+    sample still needs the model.  The first check that fails decides the
+    outcome: gated(sample, stage) is returned and the model is never
+    called.  Samples that pass every stage go to the model, or to `model`
+    given per call (e.g. an InferencePool helper, whose result then comes
+    back as a future).  Every stage counts how many samples it checked,
+    passed on and short-circuited, so stats() shows the model calls saved.
+
+    Either way the result has the model's keys plus gated_by: the stage
+    that decided, or None when the model did.  Gated results carry the
+    rule's decision as the probability (0.0: every stage gates a "no
+    alert"), so consumers never see None where a number belongs.
+    """
+
+    def __init__(self, name, stages, model, gated):
+        self.name = name
+        self.stages = stages
+        self.model = model
+        self.gated = gated
+
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.model_calls = 0
+        self._counts = {stage: {"checked": 0, "passed": 0, "short_circuited": 0}
+                        for stage, _ in stages}
+
+    def __call__(self, sample, model=None):
+        with self._lock:
+            self.calls += 1
+
+        for stage, check in self.stages:
+            passed = check(sample)
+            with self._lock:
+                counts = self._counts[stage]
+                counts["checked"] += 1
+                counts["passed" if passed else "short_circuited"] += 1
+            if not passed:
+                return self.gated(sample, stage)
+
+        with self._lock:
+            self.model_calls += 1
+        result = (model or self.model)(sample)
+        if isinstance(result, Future):
+            return _ungated_future(result)
+        return _ungated(result)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "model_calls": self.model_calls,
+                "short_circuited": self.calls - self.model_calls,
+                "stages": {stage: dict(counts) for stage, counts in self._counts.items()}
+            }
+
+
+def _ungated(result):
+    # A copy: the model's dict may be a cached entry
+    return {**result, "gated_by": None}
+
+
+def _ungated_future(inner):
+    """_ungated for a pool / daemon future, keeping its model_versions."""
+    outer = Future()
+    outer.set_running_or_notify_cancel()
+
+    def done(f):
+        try:
+            result = f.result()
+        except BaseException as exc:
+            outer.set_exception(exc)
+            return
+        outer.model_versions = getattr(f, "model_versions", {})
+        outer.set_result(_ungated(result))
+
+    inner.add_done_callback(done)
+    return outer
+
+
+def result_of(value, timeout=None):
+    """A cascade result, waiting for it first if the model call went to a pool."""
+    return value.result(timeout) if isinstance(value, Future) else value
+
+
+# ----------------------------------------------------
+# 🌊 TSUNAMI
+# ----------------------------------------------------
+# evaluate_tsunami's basic_conditions, one stage each (the most selective
+# for engine scenarios first), then the fault check: a strike-slip
+# scaled probability tops out at 0.15, below every alert cut-off.
+TSUNAMI_STAGES = [
+    ("offshore", lambda s: s["ocean_depth_m"] > 50),
+    ("magnitude", lambda s: s["magnitude"] >= 6.5),
+    ("shallow", lambda s: s["depth_km"] <= 70),
+    ("uplift", lambda s: s["vertical_displacement_m"] >= 0.3),
+    ("fault", lambda s: s["fault_type"] != "strike-slip"),
+]
+
+def _tsunami_gated(sample, stage):
+    return {
+        "tsunami_probability": 0.0,
+        "scaled_probability": 0.0,
+        "fault_type": sample["fault_type"],
+        "severity": None,
+        "tsunami_alert": False,
+        "gated_by": stage
+    }
+
+tsunami = Cascade("tsunami", TSUNAMI_STAGES, evaluate_tsunami, _tsunami_gated)
+
+
+# ----------------------------------------------------
+# ⛰️ LANDSLIDE
+# ----------------------------------------------------
+# The simulation only scores terrain under heavy rain on a steep slope
+# (landslide_hazard_map applies the same thresholds to its grid)
+LANDSLIDE_RAIN_MM = 80
+LANDSLIDE_SLOPE_DEG = 25
+
+LANDSLIDE_STAGES = [
+    ("rainfall", lambda s: s["rainfall_mm"] > LANDSLIDE_RAIN_MM),
+    ("slope", lambda s: s["slope_angle_deg"] > LANDSLIDE_SLOPE_DEG),
+]
+
+def _landslide_gated(sample, stage):
+    return {
+        "landslide_alert": False,
+        "risk_score": 0.0,
+        "gated_by": stage
+    }
+
+landslide = Cascade("landslide", LANDSLIDE_STAGES, predict_landslide_risk, _landslide_gated)
+
+CASCADES = {c.name: c for c in (tsunami, landslide)}
+
+
+def stats():
+    return {name: c.stats() for name, c in CASCADES.items()}
@@ -0,0 +1,234 @@
+"""
+Convert a synthetic JSON dataset into a columnar, memory-mappable directory.
+
+    python columnar_dataset.py earthquake_synthetic_dataset.json data/earthquake
+                               [--categorical label fault_type] [--chunk-rows 65536]
+
+The JSON array is streamed (never loaded whole) twice: once to find the
+row count, column types, string widths and category sets, once to fill
+one .npy per column through np.lib.format.open_memmap.  schema.json
+records every column's dtype and, for categoricals, the code -> value
+table (code -1 = missing).  open_columns() maps the columns back with
+np.load(mmap_mode="r"), so reading a dataset costs only the pages used.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+SCHEMA_NAME = "schema.json"
+CATEGORICAL = ("label", "fault_type")
+READ_BYTES = 1 << 20
+
+
+# ----------------------------------------------------
+# 🌊 STREAMING JSON
+# ----------------------------------------------------
+def iter_records(path, read_bytes=READ_BYTES):
+    """Yield the objects of a top-level JSON array one at a time."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, eof, started = "", 0, False, False
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buf) or (pos > len(buf) - 64 and not eof):
+                # Keep a little lookahead so raw_decode never sees a cut-off value
+                chunk = f.read(read_bytes)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                if eof and not buf.strip():
+                    raise ValueError(f"{path}: unexpected end of file")
+                if not eof:
+                    continue
+
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"{path}: expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(read_bytes)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield obj
+            pos = end
+
+
+def iter_chunks(path, rows=65536):
+    """Lists of up to `rows` records, streamed from the file."""
+    chunk = []
+    for record in iter_records(path):
+        chunk.append(record)
+        if len(chunk) == rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ----------------------------------------------------
+# 🧱 CONVERSION
+# ----------------------------------------------------
+def infer_schema(path, categorical=CATEGORICAL):
+    """
+    First pass: row count and a dtype for every column seen.  A record
+    that lacks a key counts as a null for that column, like an explicit None.
+    """
+    rows, kinds, widths, categories, present = 0, {}, {}, {}, {}
+    for record in iter_records(path):
+        rows += 1
+        for key, value in record.items():
+            if value is None:
+                kinds.setdefault(key, None)
+                continue
+            present[key] = present.get(key, 0) + 1
+            if key in categorical:
+                kinds[key] = "category"
+                categories.setdefault(key, set()).add(value)
+            elif isinstance(value, str):
+                kinds[key] = "string"
+                widths[key] = max(widths.get(key, 0), len(value.encode()))
+            elif isinstance(value, bool):
+                kinds[key] = "bool" if kinds.get(key) in (None, "bool") else "float64"
+            elif isinstance(value, int):
+                kinds[key] = "int64" if kinds.get(key) in (None, "int64") else kinds[key]
+            else:
+                kinds[key] = "float64"
+
+    columns = {}
+    for key, kind in kinds.items():
+        if kind in ("int64", "bool") and present.get(key, 0) < rows:
+            kind = "float64"            # so missing values can be NaN
+        if kind == "category":
+            values = sorted(categories[key])
+            code_dtype = "int8" if len(values) < 128 else "int32"
+            columns[key] = {"kind": "category", "dtype": code_dtype, "categories": values}
+        elif kind == "string":
+            columns[key] = {"kind": "string", "dtype": f"S{widths[key]}"}
+        else:
+            columns[key] = {"kind": "number", "dtype": kind or "float64"}
+        columns[key]["file"] = key + ".npy"
+    return {"rows": rows, "source": os.path.abspath(path), "columns": columns}
+
+
+def _missing(spec):
+    if spec["kind"] == "category":
+        return -1
+    if spec["kind"] == "string":
+        return b""
+    return np.nan
+
+
+def convert(path, out_dir, categorical=CATEGORICAL, chunk_rows=65536):
+    """Second pass: stream the records into one memory-mapped .npy per column."""
+    schema = infer_schema(path, categorical)
+    os.makedirs(out_dir, exist_ok=True)
+
+    outputs, codes = {}, {}
+    for key, spec in schema["columns"].items():
+        outputs[key] = np.lib.format.open_memmap(
+            os.path.join(out_dir, spec["file"]), mode="w+",
+            dtype=np.dtype(spec["dtype"]), shape=(schema["rows"],)
+        )
+        if spec["kind"] == "category":
+            codes[key] = {value: i for i, value in enumerate(spec["categories"])}
+
+    start = 0
+    for chunk in iter_chunks(path, chunk_rows):
+        stop = start + len(chunk)
+        for key, spec in schema["columns"].items():
+            missing = _missing(spec)
+            values = [record.get(key) for record in chunk]
+            if key in codes:
+                values = [codes[key].get(v, -1) for v in values]
+            elif spec["kind"] == "string":
+                values = [v.encode() if v is not None else missing for v in values]
+            else:
+                values = [missing if v is None else v for v in values]
+            outputs[key][start:stop] = values
+        start = stop
+
+    for out in outputs.values():
+        out.flush()
+
+    tmp = os.path.join(out_dir, SCHEMA_NAME + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(schema, f, indent=2)
+    os.replace(tmp, os.path.join(out_dir, SCHEMA_NAME))
+    return schema
+
+
+# ----------------------------------------------------
+# 📂 READING
+# ----------------------------------------------------
+def read_schema(data_dir):
+    with open(os.path.join(data_dir, SCHEMA_NAME), "r") as f:
+        return json.load(f)
+
+
+def open_columns(data_dir, columns=None, mmap_mode="r"):
+    """name -> memory-mapped array (category columns hold their int codes)."""
+    schema = read_schema(data_dir)
+    names = columns or list(schema["columns"])
+    return {
+        name: np.load(os.path.join(data_dir, schema["columns"][name]["file"]), mmap_mode=mmap_mode)
+        for name in names
+    }
+
+
+def decode(data_dir, column, codes):
+    """Category codes -> values (None for missing)."""
+    spec = read_schema(data_dir)["columns"][column]
+    table = np.array(spec["categories"] + [None], dtype=object)
+    return table[codes]                 # code -1 picks the trailing None
+
+
+def to_frame(data_dir, columns=None):
+    """
+    DataFrame with categoricals and strings decoded, for code written
+    against the JSON layout (model_tasks, train_models).  This copies;
+    use open_columns for the zero-copy path.
+    """
+    schema = read_schema(data_dir)
+    arrays = open_columns(data_dir, columns)
+    frame = {}
+    for name, arr in arrays.items():
+        spec = schema["columns"][name]
+        if spec["kind"] == "category":
+            frame[name] = pd.Categorical.from_codes(arr, spec["categories"]).astype(object)
+        elif spec["kind"] == "string":
+            frame[name] = np.char.decode(arr, "utf-8").astype(object)
+        else:
+            frame[name] = np.asarray(arr)
+    return pd.DataFrame(frame)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source")
+    parser.add_argument("out_dir")
+    parser.add_argument("--categorical", nargs="+", default=list(CATEGORICAL))
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    args = parser.parse_args()
+
+    schema = convert(args.source, args.out_dir, args.categorical, args.chunk_rows)
+    print(f"✅ {schema['rows']} rows, {len(schema['columns'])} columns -> {args.out_dir}")
+    for name, spec in schema["columns"].items():
+        extra = f" {spec['categories']}" if spec["kind"] == "category" else ""
+        print(f"   {name:<26}{spec['dtype']:<8}{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import numpy as np
+
+from compiled_forest import CompiledForest
+
+# Reduced variants of a CompiledForest.  Every function returns a new
+# forest and leaves its input untouched.  round_thresholds_f32 and
+# prune_identical_leaves (at tolerance 0) never change a prediction;
+# take_trees, cap_depth and a pruning tolerance trade accuracy for size
+# and latency.
+
+
+def _is_leaf(forest):
+    return forest.left == np.arange(forest.n_nodes)
+
+
+def _depths(forest):
+    """Depth of every reachable node (-1 for unreachable ones)."""
+    depth = np.full(forest.n_nodes, -1)
+    is_leaf = _is_leaf(forest)
+    frontier = np.asarray(forest.roots)
+    level = 0
+    while len(frontier):
+        depth[frontier] = level
+        inner = frontier[~is_leaf[frontier]]
+        frontier = np.concatenate([forest.left[inner], forest.right[inner]])
+        level += 1
+    return depth
+
+
+def _rebuild(forest, keep, **changes):
+    """New forest holding only the nodes in `keep` (sorted), indices remapped."""
+    arrays = {name: changes.get(name, getattr(forest, name)) for name in CompiledForest.ARRAYS}
+
+    remap = np.full(forest.n_nodes, -1, dtype=np.int64)
+    remap[keep] = np.arange(len(keep))
+
+    n_features = forest.n_features
+    feature_dtype = np.int8 if n_features < 128 else np.int32
+
+    out = CompiledForest(
+        feature=arrays["feature"][keep].astype(feature_dtype),
+        threshold=arrays["threshold"][keep],
+        left=remap[arrays["left"][keep]].astype(np.int32),
+        right=remap[arrays["right"][keep]].astype(np.int32),
+        missing_left=arrays["missing_left"][keep],
+        value=np.ascontiguousarray(arrays["value"][keep]),
+        roots=remap[arrays["roots"]].astype(np.int32),
+        max_depth=0,
+        n_features=n_features,
+        classes=forest.classes_,
+    )
+    out.max_depth = int(_depths(out).max())
+    return out
+
+
+def compact(forest, **changes):
+    """Drop nodes no root can reach any more."""
+    probe = CompiledForest(
+        **{name: changes.get(name, getattr(forest, name)) for name in CompiledForest.ARRAYS},
+        max_depth=forest.max_depth, n_features=forest.n_features, classes=forest.classes_,
+    )
+    keep = np.flatnonzero(_depths(probe) >= 0)
+    return _rebuild(probe, keep)
+
+
+def take_trees(forest, n_trees):
+    """Keep the first n_trees estimators (trees are i.i.d., so any prefix will do)."""
+    if n_trees >= forest.n_trees:
+        return compact(forest)
+    end = forest.roots[n_trees]
+    return _rebuild(forest, np.arange(end), roots=forest.roots[:n_trees])
+
+
+def cap_depth(forest, max_depth):
+    """Turn every node at max_depth into a leaf carrying that node's own value."""
+    depth = _depths(forest)
+    cut = (depth == max_depth) & ~_is_leaf(forest)
+    own = np.arange(forest.n_nodes)
+
+    return compact(
+        forest,
+        left=np.where(cut, own, forest.left),
+        right=np.where(cut, own, forest.right),
+        threshold=np.where(cut, np.inf, forest.threshold),
+        feature=np.where(cut, 0, forest.feature),
+    )
+
+
+def round_thresholds_f32(forest):
+    """
+    Store thresholds as float32.  Each threshold is rounded *down* to the
+    nearest float32, so for float32 inputs (what the model sees) x <= t and
+    x <= float32(t) always agree: predictions are unchanged.
+    """
+    t = np.asarray(forest.threshold, dtype=np.float64)
+    t32 = t.astype(np.float32)
+    t32 = np.where(t32.astype(np.float64) > t, np.nextafter(t32, np.float32(-np.inf)), t32)
+    return compact(forest, threshold=t32.astype(np.float32))
+
+
+def prune_identical_leaves(forest, tolerance=0.0):
+    """
+    Collapse splits whose two children are leaves with identical values,
+    repeatedly, bottom-up.  Predictions are unchanged.
+
+    With tolerance > 0, sibling leaves whose values differ by at most that
+    much are merged too; the new leaf takes the split node's own value
+    (the sample-weighted mean of its children), which is lossy.
+    """
+    left = np.array(forest.left)
+    right = np.array(forest.right)
+    threshold = np.array(forest.threshold)
+    feature = np.array(forest.feature)
+    value = np.array(forest.value)
+    own = np.arange(forest.n_nodes)
+
+    while True:
+        is_leaf = left == own
+        inner = np.flatnonzero(~is_leaf)
+        l, r = left[inner], right[inner]
+        same = is_leaf[l] & is_leaf[r] & np.all(np.abs(value[l] - value[r]) <= tolerance, axis=1)
+        nodes = inner[same]
+        if not len(nodes):
+            break
+        if tolerance == 0:
+            value[nodes] = value[left[nodes]]
+        left[nodes] = nodes
+        right[nodes] = nodes
+        threshold[nodes] = np.inf
+        feature[nodes] = 0
+
+    return compact(forest, left=left, right=right, threshold=threshold,
+                   feature=feature, value=value)
+
+
+def derive_variant(forest, n_trees=None, max_depth=None, f32=True, prune=True, prune_tol=0.0):
+    out = forest
+    if n_trees:
+        out = take_trees(out, n_trees)
+    if max_depth:
+        out = cap_depth(out, max_depth)
+    if prune:
+        out = prune_identical_leaves(out, prune_tol)
+    if f32:
+        out = round_thresholds_f32(out)
+    if out is forest:
+        out = compact(forest)
+    return out
+
+
+def variant_name(n_trees=None, max_depth=None, f32=True, prune=True, prune_tol=0.0):
+    parts = [f"t{n_trees}" if n_trees else "tall", f"d{max_depth}" if max_depth else "dfull"]
+    if f32:
+        parts.append("f32")
+    if prune:
+        parts.append(f"p{prune_tol:g}" if prune_tol else "p")
+    return "-".join(parts)
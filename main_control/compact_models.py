@@ -0,0 +1,131 @@
+"""
+Derive compact variants of the forests in Models/ and report their
+accuracy / size / latency trade-off.
+
+    python compact_models.py [--models earthquake_magnitude ...]
+                             [--trees 1.0 0.5 0.25] [--depths 0 12 8]
+                             [--prune-tol 0] [--out Models/variants]
+
+Every variant uses float32 thresholds and pruned redundant leaves (both
+lossless); --trees keeps that fraction of the estimators and --depths
+caps tree depth (0 = full depth).  Variants are written as
+<model>__<variant>.npz, which the registry loads when configured through
+MODEL_VARIANTS, e.g. MODEL_VARIANTS="earthquake_magnitude=t75-d12-f32-p".
+"""
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+
+from compact_forest import derive_variant, variant_name
+from compiled_forest import CompiledForest
+from model_registry import MODEL_DIR, VARIANT_DIR
+from model_tasks import DATASETS, DEFAULT_TASKS, TASKS, load_dataset, score, split_task
+
+LANDSLIDE = "landslide_model"
+
+
+def landslide_holdout(rows=4000, seed=0):
+    """
+    No landslide dataset ships with the repo, so landslide variants are
+    scored on agreement with the full model over engine-range terrain.
+    """
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.uniform(0, 300, rows),          # rainfall_mm
+        rng.uniform(0.35, 1.0, rows),       # soil_moisture
+        rng.uniform(15, 55, rows),          # slope_angle_deg
+        rng.uniform(0.3, 0.8, rows),        # vegetation_index
+        rng.integers(0, 4, rows),           # soil_type
+        rng.uniform(0, 1.4, rows),          # ground_vibration
+    ])
+    return X, None
+
+
+def holdout(name, datasets):
+    if name == LANDSLIDE:
+        return landslide_holdout()
+    task = TASKS[name]
+    df = datasets.setdefault(task["dataset"], load_dataset(DATASETS[task["dataset"]]))
+    _, X_test, _, y_test = split_task(name, df)
+    return np.asarray(X_test, dtype=np.float64), np.asarray(y_test)
+
+
+def latency(forest, X, repeat):
+    fn = forest.predict_proba if forest.is_classifier else forest.predict
+    samples = []
+    for i in range(repeat):
+        row = X[i % len(X)][None, :]
+        t = time.perf_counter()
+        fn(row)
+        samples.append(time.perf_counter() - t)
+    return np.percentile(samples, 50) * 1e3, np.percentile(samples, 99) * 1e3
+
+
+def evaluate(name, forest, X, y, reference):
+    pred = forest.predict(X)
+    if y is None:
+        return "agreement", float(np.mean(pred == reference))
+    kind = "classifier" if forest.is_classifier else "regressor"
+    return score(kind, y, pred)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", nargs="+", default=DEFAULT_TASKS + [LANDSLIDE])
+    parser.add_argument("--trees", nargs="+", type=float, default=[1.0, 0.5, 0.25])
+    parser.add_argument("--depths", nargs="+", type=int, default=[0, 12, 8])
+    parser.add_argument("--prune-tol", type=float, default=0.0)
+    parser.add_argument("--out", default=VARIANT_DIR)
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    datasets = {}
+
+    header = (f"{'model':<22}{'variant':<20}{'trees':>6}{'nodes':>8}{'size KB':>9}"
+              f"{'load ms':>9}{'metric':>11}{'score':>9}{'p50 ms':>8}{'p99 ms':>8}")
+    print(header)
+    print("-" * len(header))
+
+    for name in args.models:
+        path = os.path.join(MODEL_DIR, name + ".pkl")
+        start = time.perf_counter()
+        full = CompiledForest.from_sklearn(joblib.load(path))
+        full_load = (time.perf_counter() - start) * 1e3
+        full.estimator = None           # time our traversal, not sklearn's
+
+        X, y = holdout(name, datasets)
+        reference = full.predict(X)
+
+        rows = [("original", full, os.path.getsize(path), full_load)]
+        for fraction in args.trees:
+            for depth in args.depths:
+                n_trees = max(1, int(round(full.n_trees * fraction)))
+                n_trees = None if n_trees >= full.n_trees else n_trees
+                vname = variant_name(n_trees, depth or None, prune_tol=args.prune_tol)
+                variant = derive_variant(full, n_trees, depth or None, prune_tol=args.prune_tol)
+
+                out_path = os.path.join(args.out, f"{name}__{vname}.npz")
+                variant.save(out_path)
+                start = time.perf_counter()
+                variant = CompiledForest.load(out_path)
+                load_ms = (time.perf_counter() - start) * 1e3
+                rows.append((vname, variant, os.path.getsize(out_path), load_ms))
+
+        for vname, forest, size, load_ms in rows:
+            metric, value = evaluate(name, forest, X, y, reference)
+            p50, p99 = latency(forest, X, args.repeat)
+            print(f"{name:<22}{vname:<20}{forest.n_trees:>6}{forest.n_nodes:>8}"
+                  f"{size / 1024:>9.1f}{load_ms:>9.2f}{metric:>11}{value:>9.4f}"
+                  f"{p50:>8.3f}{p99:>8.3f}")
+        print()
+
+    print("original = pickled sklearn forest (load = joblib.load + compile);"
+          " latency is single-row CompiledForest scoring")
+
+
+if __name__ == "__main__":
+    main()
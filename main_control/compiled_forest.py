@@ -0,0 +1,387 @@
+import os
+
+import joblib
+import numpy as np
+
+# A single row is scored with an all-node decision table, small batches by
+# walking every tree level by level.  Batches above LARGE_BATCH go back to
+# the sklearn estimator when we still hold it: its Cython traversal wins
+# once the per-call overhead is amortised.
+LARGE_BATCH = 256
+
+# Anytime classification walks trees ANYTIME_CHUNK at a time and stops a
+# row once its decision is settled by more than ANYTIME_MARGIN, far above
+# any float rounding between partial bounds and the full average.
+# ANYTIME_INFERENCE=1 turns it on for evaluate_tsunami, where most rows
+# settle after a few chunks of its large forest.  The event classifier's
+# forest is small enough that full scoring is faster (bench_anytime), so
+# it stays opt-in per call there.
+ANYTIME = os.environ.get("ANYTIME_INFERENCE") == "1"
+ANYTIME_CHUNK = 16
+ANYTIME_MARGIN = 1e-9
+
+
+class _TreeWalker:
+    """
+    Traversal over flattened node arrays.  Subclasses provide feature,
+    threshold, missing_left, children (left/right interleaved), roots,
+    max_depth and n_features.
+    """
+
+    def _as_input(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"expected input of shape (n, {self.n_features}), got {X.shape}")
+        return X
+
+    def _apply_row(self, row):
+        # Decide the child at every node once, then each level is a single gather
+        x = row[self.feature]
+        went_right = x > self.threshold
+        if np.isnan(row).any():
+            went_right |= np.isnan(x) & ~self.missing_left
+        nxt = self.children[self._child_base + went_right]
+        nodes = self.roots
+        for _ in range(self.max_depth):
+            nodes = nxt[nodes]
+        return nodes[None, :]
+
+    def _apply_levels(self, X):
+        # Tree-major walk: children[2 * node + went_right] is one gather per level
+        n = len(X)
+        columns = np.ascontiguousarray(X.T)
+        offsets = np.arange(n)
+        has_nan = np.isnan(columns).any()
+        nodes = np.repeat(self.roots[:, None], n, axis=1)
+        for _ in range(self.max_depth):
+            x = columns[self.feature[nodes], offsets]
+            went_right = x > self.threshold[nodes]
+            if has_nan:
+                went_right |= np.isnan(x) & ~self.missing_left[nodes]
+            nodes = self.children[2 * nodes + went_right]
+        return nodes.T
+
+    def apply(self, X):
+        """Leaf node index reached in every tree: (n_rows, n_trees)."""
+        X = self._as_input(X)
+        if len(X) == 1:
+            return self._apply_row(X[0])
+        return self._apply_levels(X)
+
+
+class CompiledForest(_TreeWalker):
+    """
+    A fitted sklearn RandomForest flattened into contiguous node arrays.
+
+    Every tree is stored back to back in the same arrays; leaves point to
+    themselves so a fixed number of steps always lands on a leaf.  Scoring
+    follows sklearn exactly (float32 inputs, per-tree values added in
+    estimator order, then divided by the tree count), so predict_proba /
+    predict are bit-identical to the original model.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left,
+                 value, roots, max_depth, n_features, classes=None, estimator=None,
+                 children=None, child_base=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value              # (n_nodes, n_classes) or (n_nodes, n_outputs)
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.classes_ = classes
+        self.is_classifier = classes is not None
+        self.estimator = estimator
+        # Traversal arrays may be handed in precomputed (e.g. mapped from a
+        # shared bundle) so nothing per-process has to be derived
+        if children is None:
+            children = np.stack([left, right], axis=1).ravel()
+        if child_base is None:
+            child_base = 2 * np.arange(len(feature))
+        self.children = children
+        self._child_base = child_base
+        self._bounds = {}               # anytime_proba: column -> suffix bounds
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    # ------------------------------------------------
+    # BUILD
+    # ------------------------------------------------
+    @classmethod
+    def from_sklearn(cls, model):
+        """A fitted forest, or a single decision tree (a forest of one)."""
+        estimators = getattr(model, "estimators_", None)
+        if estimators is None:
+            estimators = [model]
+
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+
+        for est in estimators:
+            tree = est.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            own = np.arange(offset, offset + n)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            missing.append(np.asarray(tree.missing_go_to_left, dtype=bool))
+            values.append(tree.value[:, 0, :] if tree.n_outputs == 1 else tree.value[:, :, 0])
+            roots.append(offset)
+            offset += n
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max(est.tree_.max_depth for est in estimators),
+            n_features=model.n_features_in_,
+            classes=getattr(model, "classes_", None),
+            estimator=model,
+        )
+
+    # ------------------------------------------------
+    # SAVE / LOAD
+    # ------------------------------------------------
+    ARRAYS = ("feature", "threshold", "left", "right", "missing_left", "value", "roots")
+
+    def arrays(self):
+        out = {name: getattr(self, name) for name in self.ARRAYS}
+        if self.is_classifier:
+            out["classes"] = self.classes_
+        return out
+
+    def save(self, path):
+        """Write the node arrays as an uncompressed .npz (no sklearn needed to load)."""
+        np.savez(path, max_depth=self.max_depth, n_features=self.n_features, **self.arrays())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                max_depth=int(data["max_depth"]),
+                n_features=int(data["n_features"]),
+                classes=data["classes"] if "classes" in data else None,
+                **{name: data[name] for name in cls.ARRAYS}
+            )
+
+    # ------------------------------------------------
+    # PREDICTION
+    # ------------------------------------------------
+    def tree_values(self, X):
+        """Per-tree leaf values: (n_rows, n_trees, n_classes or n_outputs)."""
+        return self.value[self.apply(X)]
+
+    def _average(self, tree_values):
+        # cumsum adds trees strictly in estimator order, like sklearn's
+        # accumulator; np.sum would use pairwise summation.
+        total = np.cumsum(tree_values, axis=1)[:, -1]
+        total /= self.n_trees
+        return total
+
+    def _use_estimator(self, X):
+        return self.estimator is not None and len(X) > LARGE_BATCH
+
+    def predict_proba(self, X):
+        if self._use_estimator(X):
+            return self.estimator.predict_proba(X)
+        return self._average(self.tree_values(X))
+
+    def predict(self, X):
+        if self._use_estimator(X):
+            return self.estimator.predict(X)
+        return self._finish(self._average(self.tree_values(X)))
+
+    def _finish(self, out):
+        # averaged values -> what sklearn's predict returns
+        if self.is_classifier:
+            return self.classes_.take(np.argmax(out, axis=1))
+        return out[:, 0] if out.shape[1] == 1 else out
+
+    # ------------------------------------------------
+    # ANYTIME CLASSIFICATION
+    # ------------------------------------------------
+    def _tree_bounds(self, column):
+        # suffix[k] = smallest / largest total trees k.. can still add
+        if column not in self._bounds:
+            values = self.value[:, column]
+            low = np.minimum.reduceat(values, self.roots)
+            high = np.maximum.reduceat(values, self.roots)
+            self._bounds[column] = (
+                np.append(np.cumsum(low[::-1])[::-1], 0.0),
+                np.append(np.cumsum(high[::-1])[::-1], 0.0),
+            )
+        return self._bounds[column]
+
+    def _walk(self, X, trees):
+        """Leaf reached by each row of X in trees[a:b]: (n_rows, b - a)."""
+        nodes = np.repeat(self.roots[trees][None, :], len(X), axis=0)
+        rows = np.arange(len(X))[:, None]
+        has_nan = np.isnan(X).any()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]]
+            went_right = x > self.threshold[nodes]
+            if has_nan:
+                went_right |= np.isnan(x) & ~self.missing_left[nodes]
+            nodes = self.children[2 * nodes + went_right]
+        return nodes
+
+    def _anytime_row(self, row, thresholds, column, chunk):
+        # One row: each chunk's nodes are a contiguous slice, decided with
+        # a handful of array ops; the bookkeeping stays in Python floats
+        suffix_low, suffix_high = self._tree_bounds(column)
+        bounds = np.append(self.roots, self.n_nodes)
+        has_nan = np.isnan(row).any()
+        thresholds = [float(t) for t in thresholds]
+        total, start, n = 0.0, 0, self.n_trees
+        while True:
+            stop = min(start + chunk, n)
+            lo, hi = bounds[start], bounds[stop]
+            x = row[self.feature[lo:hi]]
+            went_right = x > self.threshold[lo:hi]
+            if has_nan:
+                went_right |= np.isnan(x) & ~self.missing_left[lo:hi]
+            nxt = self.children[self._child_base[lo:hi] + went_right] - lo
+            nodes = self.roots[start:stop] - lo
+            for _ in range(self.max_depth):
+                nodes = nxt[nodes]
+            for value in self.value[nodes + lo, column].tolist():
+                total += value          # estimator order, as sklearn adds them
+
+            if stop == n:
+                prob = total / n
+                return prob, prob, prob, n
+            low = (total + suffix_low[stop]) / n
+            high = (total + suffix_high[stop]) / n
+            if all(low >= t + ANYTIME_MARGIN or high < t - ANYTIME_MARGIN for t in thresholds):
+                return total / stop, low, high, stop
+            start = stop
+
+    def anytime_proba(self, X, thresholds, column=1, chunk=None):
+        """
+        Probability of class `column` for threshold decisions, walking only
+        as many trees as the decision needs.
+
+        thresholds: shape (k,) or (n_rows, k); inf marks an unused slot.
+        Trees are evaluated in estimator order, chunk at a time.  A row
+        stops once, for every threshold, the remaining trees can no longer
+        move its probability from one side to the other.
+
+        Returns (prob, low, high, trees_evaluated) per row.  Rows that
+        needed every tree get the exact predict_proba value, with
+        low == high == prob.  Rows that stopped early get the mean of the
+        trees seen as prob, and exact bounds in [low, high].  For every
+        row and threshold t, `low >= t` is the full-evaluation decision.
+        """
+        X = self._as_input(X)
+        n = len(X)
+        chunk = chunk or ANYTIME_CHUNK
+        thresholds = np.broadcast_to(np.asarray(thresholds, dtype=np.float64),
+                                     (n, np.shape(thresholds)[-1]))
+        if n == 1:
+            return tuple(np.array([v]) for v in self._anytime_row(X[0], thresholds[0], column, chunk))
+
+        suffix_low, suffix_high = self._tree_bounds(column)
+
+        total = np.zeros(n)
+        trees = np.zeros(n, dtype=np.intp)
+        low = np.full(n, np.nan)
+        high = np.full(n, np.nan)
+        active = np.arange(n)
+        start = 0
+        while len(active) and start < self.n_trees:
+            stop = min(start + chunk, self.n_trees)
+            values = self.value[self._walk(X[active], slice(start, stop)), column]
+            # Prepending the running total keeps the additions strictly in
+            # estimator order, so a row that needs every tree is exact
+            total[active] = np.cumsum(np.column_stack([total[active], values]), axis=1)[:, -1]
+            trees[active] = stop
+
+            lo = (total[active] + suffix_low[stop]) / self.n_trees
+            hi = (total[active] + suffix_high[stop]) / self.n_trees
+            t = thresholds[active]
+            settled = np.all((lo[:, None] >= t + ANYTIME_MARGIN) | (hi[:, None] < t - ANYTIME_MARGIN),
+                             axis=1)
+            done = settled | (stop == self.n_trees)
+            low[active[done]] = lo[done]
+            high[active[done]] = hi[done]
+            active = active[~done]
+            start = stop
+
+        complete = trees == self.n_trees
+        prob = total / np.maximum(trees, 1)
+        prob[complete] = total[complete] / self.n_trees
+        low[complete] = high[complete] = prob[complete]
+        return prob, low, high, trees
+
+
+class FusedForests(_TreeWalker):
+    """
+    Several CompiledForests over the same features walked as one.
+
+    The node arrays are concatenated so one traversal reaches the leaves of
+    every tree of every forest; tree_values then splits the result back per
+    forest.  Each forest's output is identical to calling it on its own.
+    """
+
+    def __init__(self, forests):
+        n_features = {f.n_features for f in forests}
+        if len(n_features) != 1:
+            raise ValueError("fused forests must share the same input features")
+
+        self.forests = list(forests)
+        self.n_features = n_features.pop()
+
+        offsets = np.cumsum([0] + [f.n_nodes for f in self.forests])
+        self._node_offsets = offsets[:-1]
+
+        self.feature = np.concatenate([f.feature for f in self.forests])
+        self.threshold = np.concatenate([f.threshold for f in self.forests])
+        self.missing_left = np.concatenate([f.missing_left for f in self.forests])
+        self.children = np.concatenate([
+            f.children + off for f, off in zip(self.forests, self._node_offsets)
+        ])
+        self.roots = np.concatenate([
+            f.roots + off for f, off in zip(self.forests, self._node_offsets)
+        ])
+        self.max_depth = max(f.max_depth for f in self.forests)
+        self._child_base = 2 * np.arange(len(self.feature))
+
+        tree_offsets = np.cumsum([0] + [f.n_trees for f in self.forests])
+        self._tree_slices = [slice(a, b) for a, b in zip(tree_offsets[:-1], tree_offsets[1:])]
+
+    def tree_values(self, X):
+        """List with one (n_rows, n_trees, width) array per forest."""
+        leaves = self.apply(X)
+        return [
+            f.value[leaves[:, sl] - off]
+            for f, sl, off in zip(self.forests, self._tree_slices, self._node_offsets)
+        ]
+
+    def predict(self, X):
+        """One predict() output per forest, from a single traversal."""
+        if len(X) > LARGE_BATCH:
+            return [f.predict(X) for f in self.forests]
+        return [
+            f._finish(f._average(values))
+            for f, values in zip(self.forests, self.tree_values(X))
+        ]
+
+
+def load_compiled(path):
+    return CompiledForest.from_sklearn(joblib.load(path))
@@ -1,30 +1,151 @@
 import os
-import joblib
-import pandas as pd
-from collections import deque
 
-BASE_DIR = os.path.dirname(__file__)
+import numpy as np
 
-mag_model = joblib.load(os.path.join(BASE_DIR, "Models", "earthquake_magnitude.pkl"))
-depth_model = joblib.load(os.path.join(BASE_DIR, "Models", "earthquake_depth.pkl"))
-epi_model = joblib.load(os.path.join(BASE_DIR, "Models", "earthquake_epicenter.pkl"))
+from compiled_forest import FusedForests
+from feature_matrix import to_matrix
+from model_registry import get_compiled
+from smoothing_sessions import SmoothingStore
+
+MODEL_NAMES = ["earthquake_magnitude", "earthquake_depth", "earthquake_epicenter"]
+
+# Optional single multi-output forest predicting (magnitude, depth_km)
+# jointly; trained with `train_models.py --models earthquake_magnitude_depth`
+# and served instead of the pair when EARTHQUAKE_JOINT=1
+JOINT_MODEL_NAMES = ["earthquake_magnitude_depth", "earthquake_epicenter"]
+USE_JOINT = os.environ.get("EARTHQUAKE_JOINT") == "1"
+
+FEATURES = [
+    "p_wave_amplitude",
+    "s_wave_amplitude",
+    "ps_time_diff_sec",
+    "frequency_hz"
+]
 
 WINDOW_SIZE = 3
-mag_buffer = deque(maxlen=WINDOW_SIZE)
-depth_buffer = deque(maxlen=WINDOW_SIZE)
 
-def predict_earthquake(features):
-    input_df = pd.DataFrame([features])
+# One smoothing window per seismic source; callers that don't pass a
+# source_id share the default one, as before.
+DEFAULT_SOURCE = "default"
+sessions = SmoothingStore(window=WINDOW_SIZE)
+
+
+class FusedEarthquakePredictor:
+    """
+    Magnitude, depth and epicenter forests evaluated in one pass.
+
+    The input is validated and converted to a float32 matrix once, then a
+    single FusedForests traversal reaches the leaves of all three models.
+    The per-tree leaf values are already in hand at that point, so their
+    spread comes for free as an uncertainty estimate.
+
+    Built from two forests instead, the first is a multi-output regressor
+    whose two outputs are magnitude and depth: half the regression trees
+    to walk for the same results.
+    """
+
+    def __init__(self, *forests):
+        if len(forests) not in (2, 3):
+            raise ValueError("expected (magnitude, depth, epicenter) or (joint, epicenter) forests")
+        self.joint = len(forests) == 2
+        self.fused = FusedForests(forests)
+
+    def _regressions(self, outputs):
+        # per-forest outputs (averaged values or per-tree values) -> (magnitude, depth)
+        if self.joint:
+            return outputs[0][..., 0], outputs[0][..., 1]
+        return outputs[0][..., 0], outputs[1][..., 0]
+
+    def to_input(self, samples):
+        if isinstance(samples, dict):
+            samples = [samples]
+        if not isinstance(samples, np.ndarray):
+            for sample in samples:
+                missing = [name for name in FEATURES if name not in sample]
+                if missing:
+                    raise ValueError(f"missing seismic features: {missing}")
+        return np.ascontiguousarray(to_matrix(samples, FEATURES), dtype=np.float32)
+
+    def predict(self, samples, with_uncertainty=False):
+        """
+        Returns (magnitude, depth_km, epicenter, uncertainty) arrays.
+        uncertainty is None unless requested; otherwise a dict of per-row
+        standard deviations across trees (magnitude, depth_km) and the
+        ocean vote share of the epicenter forest.
+        """
+        X = self.to_input(samples)
+        if len(X) == 0:                         # nothing to reshape; callers get empty arrays
+            empty = np.empty(0)
+            uncertainty = {"magnitude_std": empty, "depth_std": empty, "ocean_vote": empty}
+            return empty, empty, np.empty(0, dtype=np.int64), uncertainty if with_uncertainty else None
+        forests = self.fused.forests
+        epi_fc = forests[-1]
 
-    mag_pred = float(mag_model.predict(input_df)[0])
-    depth_pred = float(depth_model.predict(input_df)[0])
-    epi_pred = int(epi_model.predict(input_df)[0])
+        if not with_uncertainty:
+            *regressions, epi = self.fused.predict(X)
+            regressions = [np.reshape(out, (len(X), -1)) for out in regressions]
+            mag, depth = self._regressions(regressions)
+            return mag, depth, epi, None
 
-    mag_buffer.append(mag_pred)
-    depth_buffer.append(depth_pred)
+        trees = self.fused.tree_values(X)
+        mag_trees, depth_trees = self._regressions(trees[:-1])
+        uncertainty = {
+            "magnitude_std": mag_trees.std(axis=1),
+            "depth_std": depth_trees.std(axis=1),
+            "ocean_vote": trees[-1][:, :, 1].mean(axis=1),
+        }
+        mag, depth = self._regressions([f._average(t) for f, t in zip(forests[:-1], trees[:-1])])
+        return mag, depth, epi_fc._finish(epi_fc._average(trees[-1])), uncertainty
+
+
+_predictor = None
+
+def get_predictor():
+    # Rebuilt whenever the registry hands out a different model version
+    global _predictor
+    forests = [get_compiled(name) for name in (JOINT_MODEL_NAMES if USE_JOINT else MODEL_NAMES)]
+    if _predictor is None or _predictor.fused.forests != forests:
+        _predictor = FusedEarthquakePredictor(*forests)
+    return _predictor
+
+
+def predict_earthquake(features, with_uncertainty=False, source_id=DEFAULT_SOURCE):
+    mag, depth, epi, spread = get_predictor().predict(features, with_uncertainty)
+
+    result = _smoothed_result(source_id, float(mag[0]), float(depth[0]), int(epi[0]))
+    if spread is not None:
+        result["uncertainty"] = _uncertainty_row(spread, 0)
+    return result
+
+def predict_earthquake_batch(samples, with_uncertainty=False, source_ids=DEFAULT_SOURCE):
+    """
+    samples: list of feature dicts or array shaped (n, 4) in FEATURES order.
+    source_ids: one source for the whole batch or a list with one per row.
+    The models run once over the whole batch; rows then go through their
+    source's smoothing window in order, exactly as n calls to
+    predict_earthquake would.
+    """
+    mags, depths, epis, spread = get_predictor().predict(samples, with_uncertainty)
+    if isinstance(source_ids, (str, int)):
+        source_ids = [source_ids] * len(mags)
+
+    results = []
+    for i, (mag, depth, epi) in enumerate(zip(mags, depths, epis)):
+        result = _smoothed_result(source_ids[i], float(mag), float(depth), int(epi))
+        if spread is not None:
+            result["uncertainty"] = _uncertainty_row(spread, i)
+        results.append(result)
+    return results
+
+def _uncertainty_row(spread, i):
+    return {
+        "magnitude_std": round(float(spread["magnitude_std"][i]), 3),
+        "depth_std": round(float(spread["depth_std"][i]), 2),
+        "ocean_vote": round(float(spread["ocean_vote"][i]), 3)
+    }
 
-    avg_mag = sum(mag_buffer) / len(mag_buffer)
-    avg_depth = sum(depth_buffer) / len(depth_buffer)
+def _smoothed_result(source_id, mag_pred, depth_pred, epi_pred):
+    avg_mag, avg_depth, filled = sessions.push(source_id, mag_pred, depth_pred)
 
     return {
         "current": {
@@ -37,7 +158,7 @@ def predict_earthquake(features):
         },
         "epicenter": "ocean" if epi_pred == 1 else "land",
         "confidence": {
-            "window_filled": len(mag_buffer) == WINDOW_SIZE,
-            "buffer_size": len(mag_buffer)
+            "window_filled": filled == WINDOW_SIZE,
+            "buffer_size": filled
         }
     }
\ No newline at end of file
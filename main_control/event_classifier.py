@@ -1,13 +1,20 @@
-import os
-import joblib
 import numpy as np
 
-BASE_DIR = os.path.dirname(__file__)
-MODEL_PATH = os.path.join(BASE_DIR, "Models", "event_classifier.pkl")
+from feature_matrix import to_matrix
+from model_registry import get_compiled
 
-model = joblib.load(MODEL_PATH)
+MODEL_NAME = "event_classifier"
 
-def is_earthquake_event(sample):
+FEATURES = [
+    "p_wave_amplitude",
+    "s_wave_amplitude",
+    "ps_time_diff_sec",
+    "frequency_hz"
+]
+
+EVENT_THRESHOLD = 0.6
+
+def is_earthquake_event(sample, anytime=False):
     input_data = np.array([[
         sample["p_wave_amplitude"],
         sample["s_wave_amplitude"],
@@ -15,13 +22,57 @@ def is_earthquake_event(sample):
         sample["frequency_hz"]
     ]])
 
-    prob = model.predict_proba(input_data)[0][1]
+    if anytime:
+        return _anytime_results(input_data)[0]
+
+    prob = get_compiled(MODEL_NAME).predict_proba(input_data)[0][1]
 
     return {
-        "is_earthquake": prob >= 0.6,   # 🔥 lowered threshold
+        "is_earthquake": prob >= EVENT_THRESHOLD,   # 🔥 lowered threshold
         "confidence": round(float(prob), 3)
     }
 
+def is_earthquake_event_batch(samples, anytime=False):
+    """
+    samples: list of seismic dicts or array shaped (n, 4) in FEATURES order.
+    One predict_proba call for the whole batch; same results as
+    is_earthquake_event applied row by row.
+    """
+    input_data = to_matrix(samples, FEATURES)
+    if len(input_data) == 0:
+        return []                               # sklearn rejects 0-row input
+
+    if anytime:
+        return _anytime_results(input_data)
+
+    probs = get_compiled(MODEL_NAME).predict_proba(input_data)[:, 1]
+    flags = probs >= EVENT_THRESHOLD
+
+    return [
+        {
+            "is_earthquake": flag,
+            "confidence": round(float(prob), 3)
+        }
+        for prob, flag in zip(probs, flags)
+    ]
+
+def _anytime_results(input_data):
+    """
+    Early-exit scoring: trees stop once the 0.6 decision is settled, so
+    is_earthquake always matches full evaluation.  confidence is exact
+    when every tree was needed, otherwise the mean of the trees evaluated.
+    """
+    prob, low, _, trees = get_compiled(MODEL_NAME).anytime_proba(input_data, [EVENT_THRESHOLD])
+
+    return [
+        {
+            "is_earthquake": bool(low[i] >= EVENT_THRESHOLD),
+            "confidence": round(float(prob[i]), 3),
+            "trees_evaluated": int(trees[i])
+        }
+        for i in range(len(prob))
+    ]
+
 def detect_earthquake(sample):
     result = is_earthquake_event(sample)
     return result["confidence"] * 10, 10
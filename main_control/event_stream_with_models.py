@@ -1,62 +1,74 @@
-import time
+import os
 import random
-import math
+import time
 
-from simengine import generate_scenario
+import cascade
+from simengine import engine, generate_scenario, new_seed, spawn_seeds
+from event_classifier import MODEL_NAME as EVENT_MODEL
 from event_classifier import is_earthquake_event
-from tsunami_evaluator import evaluate_tsunami
-from landslide_predictor import predict_landslide_risk
+from cascade import result_of
+from geo import ARABIAN_SEA, BAY_OF_BENGAL, HIMALAYAS, USER_LAT, USER_LON, haversine, nearest_city
+from landslide_predictor import MODEL_NAME as LANDSLIDE_MODEL
+from model_registry import registry
+from tsunami_evaluator import MODEL_NAME as TSUNAMI_MODEL
+from online_updates import observe_cycle
+from sim_clock import RealClock, VirtualClock
+from sim_checkpoint import CHECKPOINT_PATH, CHECKPOINT_SECONDS, read_checkpoint, write_checkpoint
 
 # -------------------------------------------------
 # EVENT STORE
 # -------------------------------------------------
 EVENT_STREAM = []
 
-def emit_event(event_type, severity, message, extra=None):
+# The stream keeps the latest EVENT_STREAM_LIMIT events (trimmed in bulk),
+# so accelerated runs can emit weeks of events in bounded memory.
+# Listeners get every event as it is emitted.
+EVENT_STREAM_LIMIT = 10000
+listeners = []
+
+# Every event reports the versions of the same models, the ones a cycle
+# scores with, whether or not a cascade skipped some of them
+SIMULATION_MODELS = [EVENT_MODEL, TSUNAMI_MODEL, LANDSLIDE_MODEL]
+
+# Event times come from the simulation clock: real time by default, a
+# sim_clock.VirtualClock for accelerated runs (see simulation_loop)
+clock = RealClock()
+CYCLE_SECONDS = 5
+
+_last_id = 0.0
+
+def emit_event(event_type, severity, message, extra=None, versions=None):
+    # versions: the model versions behind the event when the models ran
+    # elsewhere (a pool or the daemon); this process's registry otherwise
+    # ids stay unique even when several events share one clock reading
+    global _last_id
+    now = clock.now()
+    _last_id = max(now, _last_id + 1e-6)
+
     event = {
-        "id": time.time(),
-        "timestamp": time.time(),
+        "id": _last_id,
+        "timestamp": now,
         "type": event_type,
         "severity": severity,
-        "message": message
+        "message": message,
+        "model_versions": registry.versions(SIMULATION_MODELS) if versions is None else versions
     }
     if extra:
         event.update(extra)
 
     EVENT_STREAM.append(event)
+    if len(EVENT_STREAM) > 2 * EVENT_STREAM_LIMIT:
+        del EVENT_STREAM[:-EVENT_STREAM_LIMIT]
+    for listener in listeners:
+        listener(event)
     print(event)
 
 # -------------------------------------------------
 # INDIA GEO
 # -------------------------------------------------
-USER_LAT, USER_LON = 20.59, 78.96
-
-CITIES = [
-("Srinagar",34.08,74.79),("Shimla",31.10,77.17),("Dehradun",30.32,78.03),
-("Delhi",28.61,77.20),("Jaipur",26.91,75.79),("Ahmedabad",23.02,72.57),
-("Mumbai",19.07,72.87),("Bangalore",12.97,77.59),
-("Hyderabad",17.38,78.48),("Chennai",13.08,80.27),
-("Kochi",9.93,76.26),("Visakhapatnam",17.69,83.22),
-("Kolkata",22.57,88.36)
-]
-
-HIMALAYAS = [(30,79),(32,77),(34,75)]
-BAY_OF_BENGAL = [(12,88),(14,90),(16,92)]
-ARABIAN_SEA = [(18,66),(14,70)]
-
-def haversine(a,b,c,d):
-    R = 6371
-    dlat = math.radians(c-a)
-    dlon = math.radians(d-b)
-    x = math.sin(dlat/2)**2 + math.cos(math.radians(a))*math.cos(math.radians(c))*math.sin(dlon/2)**2
-    return 2*R*math.atan2(math.sqrt(x), math.sqrt(1-x))
-
-def nearest_city(lat,lon):
-    return min(CITIES, key=lambda c: haversine(lat,lon,c[1],c[2]))[0]
-
 def random_point(points, spread=0.6):
-    p = random.choice(points)
-    return p[0]+random.uniform(-spread,spread), p[1]+random.uniform(-spread,spread)
+    p = rng.choice(points)
+    return p[0]+rng.uniform(-spread,spread), p[1]+rng.uniform(-spread,spread)
 
 # -------------------------------------------------
 # EVENT BALANCING (THIS IS THE KEY PART)
@@ -68,124 +80,312 @@ cycles_without = {
     "landslide": 0
 }
 
+# -------------------------------------------------
+# SEEDING & REPLAY
+# -------------------------------------------------
+# One recorded seed drives a whole run: it spawns independent streams for
+# the engine and for event placement (zones, map jitter), so the seed plus
+# a step count reproduces the same scenarios and events.
+rng = random.Random()
+
+simulation_state = {
+    "seed": None,
+    "step": 0,
+    "clock": None,
+    "backend_fallbacks": 0
+}
+
+def seed_simulation(seed=None):
+    """Reset the engine, placement stream and counters from `seed`; returns the seed."""
+    seed = new_seed() if seed is None else seed
+    engine_seed, placement_seed = spawn_seeds(seed, 2)
+    engine.reset(engine_seed)
+    rng.seed(placement_seed)
+    for k in cycles_without:
+        cycles_without[k] = 0
+    simulation_state.update(seed=seed, step=0)
+    return seed
+
+def replay(seed, steps, backend=None):
+    """
+    Re-run the first `steps` cycles of the run seeded with `seed` and
+    return the events they emit.  Resets this process's simulation state.
+    """
+    seed_simulation(seed)
+    events = []
+    listeners.append(events.append)
+    try:
+        for _ in range(steps):
+            with registry.pinned():
+                run_cycle(backend)
+    finally:
+        listeners.remove(events.append)
+    return events
+
+# -------------------------------------------------
+# CHECKPOINTS
+# -------------------------------------------------
+def save_checkpoint(path=CHECKPOINT_PATH):
+    return write_checkpoint(path, engine, rng, {
+        "seed": simulation_state["seed"],
+        "step": simulation_state["step"],
+        "cycles_without": cycles_without,
+        "clock": clock.now()
+    })
+
+def restore_checkpoint(path=CHECKPOINT_PATH):
+    """
+    Put the engine, placement stream and counters back as they were at
+    the checkpoint.  A virtual clock resumes from the checkpoint's time.
+    Returns the loop state restored.
+    """
+    return apply_checkpoint(read_checkpoint(path))
+
+def apply_checkpoint(state):
+    """restore_checkpoint for a state already parsed by read_checkpoint."""
+    for name, value in state["engine"].items():
+        setattr(engine, name, value)
+    engine.rng.setstate(state["engine_rng"])
+    rng.setstate(state["rng"])
+
+    loop = state["loop"]
+    cycles_without.update(loop["cycles_without"])
+    simulation_state.update(seed=loop["seed"], step=loop["step"])
+    if isinstance(clock, VirtualClock):
+        clock.set(loop["clock"])
+    return loop
+
 # -------------------------------------------------
 # MAIN SIM LOOP
 # -------------------------------------------------
-def simulation_loop():
-    while True:
-        s = generate_scenario()
-        events_this_cycle = set()
-
-        # ---------------- EARTHQUAKE ----------------
-        seismic = {
-            "p_wave_amplitude": s["magnitude"]**1.4,
-            "s_wave_amplitude": s["magnitude"]**1.6,
-            "ps_time_diff_sec": max(0.5, s["depth_km"]/8),
-            "frequency_hz": max(0.8, 8 - s["magnitude"])
-        }
-
-        if is_earthquake_event(seismic)["is_earthquake"]:
-            zone = random.choice(["HIMALAYAS","BAY","ARABIAN"])
-            lat, lon = (
-                random_point(HIMALAYAS) if zone=="HIMALAYAS"
-                else random_point(BAY_OF_BENGAL,1.2) if zone=="BAY"
-                else random_point(ARABIAN_SEA,1.2)
-            )
-
-            city = nearest_city(lat,lon)
-            dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
-
-            severity = (
-                "critical" if s["magnitude"] >= 8.5 else
-                "high" if s["magnitude"] >= 7.2 else
-                "medium"
-            )
-
-            emit_event(
-                "earthquake",
-                severity,
-                f"M{s['magnitude']:.1f} earthquake near {city}",
-                {"lat":lat,"lon":lon,"location":city,"distance_km":dist}
-            )
-
-        # ---------------- TSUNAMI (NORMAL) ----------------
-        tsunami = evaluate_tsunami(s)
-        if tsunami["tsunami_alert"]:
-            lat, lon = random_point(BAY_OF_BENGAL,1.5)
-            city = nearest_city(lat,lon)
-            dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
-
-            emit_event(
-                "tsunami",
-                tsunami["severity"],
-                f"{tsunami['severity']} tsunami risk near {city}",
-                {"lat":lat,"lon":lon,"location":city,"distance_km":dist}
-            )
-
-            events_this_cycle.add("tsunami")
-
-        # ---------------- LANDSLIDE (NORMAL) ----------------
-        landslide_input = {
-            "rainfall_mm": s["rainfall_mm"],
-            "soil_moisture": s["soil_moisture"],
-            "slope_angle_deg": s["slope_angle_deg"],
-            "vegetation_index": s["vegetation_index"],
-            "soil_type": s["soil_type"],
-            "ground_vibration": s["ground_vibration"]
-        }
-
-        if (
-            landslide_input["rainfall_mm"] > 80 and
-            landslide_input["slope_angle_deg"] > 25 and
-            predict_landslide_risk(landslide_input)["landslide_alert"]
-        ):
-            lat, lon = random_point(HIMALAYAS)
-            city = nearest_city(lat,lon)
-            dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
-
-            emit_event(
-                "landslide",
-                "high",
-                f"Landslide warning near {city}",
-                {"lat":lat,"lon":lon,"location":city,"distance_km":dist}
-            )
-
-            events_this_cycle.add("landslide")
-
-        # ---------------- UPDATE GAP COUNTERS ----------------
-        for k in cycles_without:
-            if k in events_this_cycle:
-                cycles_without[k] = 0
-            else:
-                cycles_without[k] += 1
-
-        # ---------------- FORCE EVENTS IF STARVED ----------------
-        if cycles_without["tsunami"] >= EVENT_GAP_LIMIT:
-            lat, lon = random_point(BAY_OF_BENGAL,1.3)
-            city = nearest_city(lat,lon)
-            dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
-
-            emit_event(
-                "tsunami",
-                "low",
-                "Weak tsunami triggered after prolonged seismic inactivity",
-                {"lat":lat,"lon":lon,"location":city,"distance_km":dist}
-            )
-
-            cycles_without["tsunami"] = 0
-
-        if cycles_without["landslide"] >= EVENT_GAP_LIMIT:
-            lat, lon = random_point(HIMALAYAS)
-            city = nearest_city(lat,lon)
-            dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
-
-            emit_event(
-                "landslide",
-                "low",
-                "Localized landslide after prolonged instability",
-                {"lat":lat,"lon":lon,"location":city,"distance_km":dist}
-            )
-
-            cycles_without["landslide"] = 0
-
-        time.sleep(5)
+# How long one cycle waits for its backend answers before scoring inline
+BACKEND_TIMEOUT = 2.0
+
+def _backend_result(value, inline, sample, versions, deadline):
+    """
+    The backend's answer (or a cascade's gated result), merging the model
+    versions it reports into `versions`.  A backend that fails or has not
+    answered by `deadline` (time.monotonic()) is not waited on: the sample
+    is scored inline instead, so one stuck worker cannot stall the
+    simulation.
+    """
+    try:
+        result = result_of(value, max(0.0, deadline - time.monotonic()))
+    except Exception as exc:
+        simulation_state["backend_fallbacks"] += 1
+        print(f"⚠️ inference backend failed ({exc!r}); scoring inline")
+        result = inline(sample)
+        versions.update(registry.versions(SIMULATION_MODELS))
+        return result
+    versions.update(getattr(value, "model_versions", {}))
+    return result
+
+def run_cycle(backend=None, updaters=None):
+    """
+    One simulation step: score a fresh scenario and emit any events.
+    The tsunami and landslide calls go through their cascades, which skip
+    the model when a physical pre-check already decides the outcome.
+    With a backend (an InferencePool or InferenceClient) the model calls
+    that remain are submitted together and run in its worker processes
+    instead of on this thread; events carry the versions the backend
+    reports.
+    With updaters (online_updates.create_updaters) the scenario is fed to
+    their buffers as a labelled sample.
+    Returns the scenario.
+    """
+    simulation_state["step"] += 1
+    simulation_state["clock"] = clock.now()
+    s = generate_scenario()
+    events_this_cycle = set()
+
+    seismic = {
+        "p_wave_amplitude": s["magnitude"]**1.4,
+        "s_wave_amplitude": s["magnitude"]**1.6,
+        "ps_time_diff_sec": max(0.5, s["depth_km"]/8),
+        "frequency_hz": max(0.8, 8 - s["magnitude"])
+    }
+
+    landslide_input = {
+        "rainfall_mm": s["rainfall_mm"],
+        "soil_moisture": s["soil_moisture"],
+        "slope_angle_deg": s["slope_angle_deg"],
+        "vegetation_index": s["vegetation_index"],
+        "soil_type": s["soil_type"],
+        "ground_vibration": s["ground_vibration"]
+    }
+
+    # ---------------- MODEL CALLS ----------------
+    if backend is None:
+        versions = None
+        earthquake = is_earthquake_event(seismic)
+        tsunami = cascade.tsunami(s)
+        landslide = cascade.landslide(landslide_input)
+    else:
+        versions = {}
+        deadline = time.monotonic() + BACKEND_TIMEOUT
+        earthquake = backend.is_earthquake_event(seismic)
+        tsunami = cascade.tsunami(s, backend.evaluate_tsunami)
+        landslide = cascade.landslide(landslide_input, backend.predict_landslide_risk)
+        earthquake = _backend_result(earthquake, is_earthquake_event, seismic, versions, deadline)
+        tsunami = _backend_result(tsunami, cascade.tsunami.model, s, versions, deadline)
+        landslide = _backend_result(landslide, cascade.landslide.model, landslide_input, versions, deadline)
+
+    # ---------------- EARTHQUAKE ----------------
+    if earthquake["is_earthquake"]:
+        zone = rng.choice(["HIMALAYAS","BAY","ARABIAN"])
+        lat, lon = (
+            random_point(HIMALAYAS) if zone=="HIMALAYAS"
+            else random_point(BAY_OF_BENGAL,1.2) if zone=="BAY"
+            else random_point(ARABIAN_SEA,1.2)
+        )
+
+        city = nearest_city(lat,lon)
+        dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
+
+        severity = (
+            "critical" if s["magnitude"] >= 8.5 else
+            "high" if s["magnitude"] >= 7.2 else
+            "medium"
+        )
+
+        emit_event(
+            "earthquake",
+            severity,
+            f"M{s['magnitude']:.1f} earthquake near {city}",
+            {"lat":lat,"lon":lon,"location":city,"distance_km":dist},
+            versions
+        )
+
+    # ---------------- TSUNAMI (NORMAL) ----------------
+    if tsunami["tsunami_alert"]:
+        lat, lon = random_point(BAY_OF_BENGAL,1.5)
+        city = nearest_city(lat,lon)
+        dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
+
+        emit_event(
+            "tsunami",
+            tsunami["severity"],
+            f"{tsunami['severity']} tsunami risk near {city}",
+            {"lat":lat,"lon":lon,"location":city,"distance_km":dist},
+            versions
+        )
+
+        events_this_cycle.add("tsunami")
+
+    # ---------------- LANDSLIDE (NORMAL) ----------------
+    if landslide["landslide_alert"]:
+        lat, lon = random_point(HIMALAYAS)
+        city = nearest_city(lat,lon)
+        dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
+
+        emit_event(
+            "landslide",
+            "high",
+            f"Landslide warning near {city}",
+            {"lat":lat,"lon":lon,"location":city,"distance_km":dist},
+            versions
+        )
+
+        events_this_cycle.add("landslide")
+
+    # ---------------- UPDATE GAP COUNTERS ----------------
+    for k in cycles_without:
+        if k in events_this_cycle:
+            cycles_without[k] = 0
+        else:
+            cycles_without[k] += 1
+
+    # ---------------- FORCE EVENTS IF STARVED ----------------
+    if cycles_without["tsunami"] >= EVENT_GAP_LIMIT:
+        lat, lon = random_point(BAY_OF_BENGAL,1.3)
+        city = nearest_city(lat,lon)
+        dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
+
+        emit_event(
+            "tsunami",
+            "low",
+            "Weak tsunami triggered after prolonged seismic inactivity",
+            {"lat":lat,"lon":lon,"location":city,"distance_km":dist,"forced":True},
+            versions
+        )
+
+        cycles_without["tsunami"] = 0
+
+    if cycles_without["landslide"] >= EVENT_GAP_LIMIT:
+        lat, lon = random_point(HIMALAYAS)
+        city = nearest_city(lat,lon)
+        dist = round(haversine(USER_LAT,USER_LON,lat,lon),1)
+
+        emit_event(
+            "landslide",
+            "low",
+            "Localized landslide after prolonged instability",
+            {"lat":lat,"lon":lon,"location":city,"distance_km":dist,"forced":True},
+            versions
+        )
+
+        cycles_without["landslide"] = 0
+
+    # ---------------- ONLINE LEARNING ----------------
+    if updaters:
+        observe_cycle(updaters, s, seismic)
+
+    return s
+
+
+def _resume(path, seed):
+    """Restore the checkpoint at path unless there is none or seed asks for another run."""
+    if not path or not os.path.exists(path):
+        return None
+    # Validated and compared before anything is applied: a checkpoint of
+    # another run leaves the simulation state untouched
+    try:
+        start = time.perf_counter()
+        state = read_checkpoint(path)
+    except (OSError, ValueError) as exc:
+        print(f"⚠️ checkpoint not restored: {exc}")
+        return None
+    if seed is not None and seed != state["loop"]["seed"]:
+        print(f"⚠️ {path} holds seed {state['loop']['seed']}, not {seed}; starting fresh")
+        return None
+    loop = apply_checkpoint(state)
+    print(f"📦 restored {path} in {(time.perf_counter() - start) * 1e3:.2f} ms "
+          f"(step {loop['step']}, {engine.system_phase})")
+    return loop
+
+def simulation_loop(backend=None, updaters=None, seed=None, sim_clock=None, steps=None,
+                    checkpoint=None):
+    """
+    Run a cycle every CYCLE_SECONDS of clock time, forever or for `steps`
+    cycles.  sim_clock replaces the module clock for the run; with a
+    VirtualClock the pause costs nothing and the loop runs as fast as
+    inference allows, while event timestamps still advance CYCLE_SECONDS
+    per cycle.
+    With a checkpoint path the loop resumes from that file when it holds
+    a run (of `seed`, if one is given) and rewrites it every
+    CHECKPOINT_SECONDS of wall time and on the way out, so a restarted
+    process carries on where the last one stopped.
+    """
+    global clock
+    if sim_clock is not None:
+        clock = sim_clock
+    if _resume(checkpoint, seed) is None:
+        seed_simulation(seed)
+    print(f"🎲 simulation seed {simulation_state['seed']} ({type(clock).__name__})")
+
+    step = 0
+    saved = time.monotonic()
+    try:
+        while steps is None or step < steps:
+            # Models swapped in by a hot reload are picked up on the next cycle
+            with registry.pinned():
+                run_cycle(backend, updaters)
+            step += 1
+            clock.sleep(CYCLE_SECONDS)
+
+            if checkpoint and time.monotonic() - saved >= CHECKPOINT_SECONDS:
+                save_checkpoint(checkpoint)
+                saved = time.monotonic()
+    finally:
+        if checkpoint:
+            save_checkpoint(checkpoint)
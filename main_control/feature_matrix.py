@@ -0,0 +1,40 @@
+import numpy as np
+
+
+def to_matrix(samples, features, encoders=None):
+    """
+    Turn a batch of samples into a 2-D float array with one column per feature.
+
+    samples  -> list of dicts, or an array already shaped (n_rows, len(features))
+    features -> column order expected by the model
+    encoders -> optional {feature: (source_field, {raw_value: code})} for
+                categorical dict fields: the column is filled with
+                code = mapping[sample[source_field]],
+                e.g. {"fault_type_encoded": ("fault_type", FAULT_MAP)}
+
+    An empty batch (empty list or zero-size array) gives a (0, len(features))
+    array.
+    """
+
+    if len(samples) == 0:
+        return np.empty((0, len(features)), dtype=np.float64)
+
+    if isinstance(samples, np.ndarray):
+        matrix = np.asarray(samples, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(features):
+            raise ValueError(
+                f"expected array of shape (n, {len(features)}), got {matrix.shape}"
+            )
+        return matrix
+
+    encoders = encoders or {}
+    matrix = np.empty((len(samples), len(features)), dtype=np.float64)
+
+    for j, name in enumerate(features):
+        if name in encoders:
+            source, mapping = encoders[name]
+            matrix[:, j] = [mapping[s[source]] for s in samples]
+        else:
+            matrix[:, j] = [s[name] for s in samples]
+
+    return matrix
@@ -0,0 +1,29 @@
+import math
+
+# Reference point for distance_km (centre of India), the city table
+# events and hazard cells are labelled with, and the regions events are
+# placed in
+USER_LAT, USER_LON = 20.59, 78.96
+
+CITIES = [
+("Srinagar",34.08,74.79),("Shimla",31.10,77.17),("Dehradun",30.32,78.03),
+("Delhi",28.61,77.20),("Jaipur",26.91,75.79),("Ahmedabad",23.02,72.57),
+("Mumbai",19.07,72.87),("Bangalore",12.97,77.59),
+("Hyderabad",17.38,78.48),("Chennai",13.08,80.27),
+("Kochi",9.93,76.26),("Visakhapatnam",17.69,83.22),
+("Kolkata",22.57,88.36)
+]
+
+HIMALAYAS = [(30,79),(32,77),(34,75)]
+BAY_OF_BENGAL = [(12,88),(14,90),(16,92)]
+ARABIAN_SEA = [(18,66),(14,70)]
+
+def haversine(a,b,c,d):
+    R = 6371
+    dlat = math.radians(c-a)
+    dlon = math.radians(d-b)
+    x = math.sin(dlat/2)**2 + math.cos(math.radians(a))*math.cos(math.radians(c))*math.sin(dlon/2)**2
+    return 2*R*math.atan2(math.sqrt(x), math.sqrt(1-x))
+
+def nearest_city(lat,lon):
+    return min(CITIES, key=lambda c: haversine(lat,lon,c[1],c[2]))[0]
@@ -0,0 +1,231 @@
+"""
+Estimate long-run hazard rates from many independent simulation runs.
+
+    python hazard_stats.py [--runs 16] [--cycles 5000] [--burn-in 200]
+                           [--workers N] [--seed S] [--json out.json]
+
+Each run is a fresh simulation seeded from --seed (spawn_seeds), stepped
+through the real run_cycle with the models in-process.  Runs go to a
+process pool, one per task; a run keeps only counters and a magnitude
+histogram per phase and returns those, never its events, so the parent
+just adds small arrays and the work scales with the number of cores.
+
+Reported: event rates per 1,000 cycles (model alerts and EVENT_GAP_LIMIT
+forced events apart), the share of each hazard's events that were
+forced, and the magnitude distribution in each phase.  Every figure is
+a ratio of totals over runs; its confidence interval is a percentile
+bootstrap that resamples whole runs (runs are independent, cycles within
+a run are not), so rates never go below 0 and shares stay in [0, 1].
+With fewer than MIN_RUNS informative runs no interval is given.
+"""
+import argparse
+import contextlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import event_stream_with_models as stream
+from model_registry import registry
+from simengine import PHASES, new_seed, spawn_seeds
+
+# (event type, source) pairs counted per phase
+EVENT_KEYS = [
+    ("earthquake", "model"),
+    ("tsunami", "model"),
+    ("tsunami", "forced"),
+    ("landslide", "model"),
+    ("landslide", "forced"),
+]
+EVENT_INDEX = {key: i for i, key in enumerate(EVENT_KEYS)}
+
+MAGNITUDE_BINS = np.round(np.arange(4.5, 9.5 + 1e-9, 0.1), 2)
+STRONG_MAGNITUDE = 7.0
+
+CONFIDENCE = 0.95
+BOOTSTRAP_RESAMPLES = 2000
+MIN_RUNS = 5
+
+
+# ----------------------------------------------------
+# 🎲 ONE RUN (worker side)
+# ----------------------------------------------------
+def _run(seed, cycles, burn_in):
+    """
+    Step one seeded simulation and tally it.  Returns {"events": counts
+    per (EVENT_KEYS, phase), "phase_cycles", "magnitude": histogram per
+    phase}, all small integer arrays.
+    """
+    events = np.zeros((len(EVENT_KEYS), len(PHASES)), dtype=np.int64)
+    phase_cycles = np.zeros(len(PHASES), dtype=np.int64)
+    magnitude = np.zeros((len(PHASES), len(MAGNITUDE_BINS) - 1), dtype=np.int64)
+
+    emitted = []
+    stream.listeners.append(emitted.append)
+    try:
+        # emit_event prints every event; nobody reads a worker's stdout
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            stream.seed_simulation(seed)
+            for step in range(burn_in + cycles):
+                emitted.clear()
+                with registry.pinned():
+                    s = stream.run_cycle()
+                if step < burn_in:
+                    continue
+
+                phase = PHASES.index(s["phase"])
+                phase_cycles[phase] += 1
+                bin_ = np.searchsorted(MAGNITUDE_BINS, s["magnitude"], side="right") - 1
+                magnitude[phase, min(max(bin_, 0), magnitude.shape[1] - 1)] += 1
+                for event in emitted:
+                    source = "forced" if event.get("forced") else "model"
+                    events[EVENT_INDEX[event["type"], source], phase] += 1
+    finally:
+        stream.listeners.remove(emitted.append)
+
+    return {"events": events, "phase_cycles": phase_cycles, "magnitude": magnitude}
+
+
+# ----------------------------------------------------
+# 📊 MERGING & INTERVALS
+# ----------------------------------------------------
+def interval(numerators, denominators, scale=1.0, confidence=CONFIDENCE, seed=0):
+    """
+    scale * sum(numerators) / sum(denominators) over runs, with a
+    percentile-bootstrap confidence interval from resampling runs.  Runs
+    with a zero denominator carry no information and are left out.
+    """
+    num = np.asarray(numerators, dtype=float)
+    den = np.asarray(denominators, dtype=float)
+    keep = den > 0
+    num, den = num[keep], den[keep]
+    out = {"mean": None, "low": None, "high": None, "runs": int(keep.sum())}
+    if len(den) == 0:
+        return out
+    out["mean"] = float(scale * num.sum() / den.sum())
+    if len(den) < MIN_RUNS:
+        return out
+
+    picks = np.random.default_rng(seed).integers(0, len(den), (BOOTSTRAP_RESAMPLES, len(den)))
+    ratios = scale * num[picks].sum(axis=1) / den[picks].sum(axis=1)
+    tail = (1 - confidence) / 2 * 100
+    out["low"], out["high"] = (float(v) for v in np.percentile(ratios, [tail, 100 - tail]))
+    return out
+
+
+def summarize(runs):
+    """Per-run tallies -> rates, forced shares and magnitude stats with CIs."""
+    events = np.stack([r["events"] for r in runs])             # run, key, phase
+    phase_cycles = np.stack([r["phase_cycles"] for r in runs])  # run, phase
+    magnitude = sum(r["magnitude"] for r in runs)               # phase, bin
+    cycles = phase_cycles.sum(axis=1)
+
+    out = {"runs": len(runs), "cycles": int(cycles.sum()), "confidence": CONFIDENCE,
+           "rates_per_1000_cycles": {}, "forced_share": {}, "phases": {}}
+
+    per_key = events.sum(axis=2)
+    for (event_type, source), i in EVENT_INDEX.items():
+        out["rates_per_1000_cycles"][f"{event_type} {source}"] = interval(per_key[:, i], cycles, 1000)
+
+    for event_type in ("tsunami", "landslide"):
+        model = per_key[:, EVENT_INDEX[event_type, "model"]]
+        forced = per_key[:, EVENT_INDEX[event_type, "forced"]]
+        out["forced_share"][event_type] = interval(forced, forced + model)
+
+    strong = np.searchsorted(MAGNITUDE_BINS, STRONG_MAGNITUDE)
+    centers = (MAGNITUDE_BINS[:-1] + MAGNITUDE_BINS[1:]) / 2
+    for p, phase in enumerate(PHASES):
+        counts = magnitude[p]
+        total = int(counts.sum())
+        run_counts = np.stack([r["magnitude"][p] for r in runs])
+        cdf = np.cumsum(counts) / total if total else None
+        out["phases"][phase] = {
+            "share_of_cycles": interval(phase_cycles[:, p], cycles),
+            "cycles": total,
+            "magnitude_mean": float(counts @ centers / total) if total else None,
+            "magnitude_quantiles": {
+                q: float(MAGNITUDE_BINS[np.searchsorted(cdf, q) + 1]) for q in (0.1, 0.5, 0.9)
+            } if total else None,
+            f"share_m{STRONG_MAGNITUDE:g}_plus": interval(
+                run_counts[:, strong:].sum(axis=1), run_counts.sum(axis=1)),
+            "histogram": counts.tolist(),
+        }
+    out["magnitude_bins"] = MAGNITUDE_BINS.tolist()
+    return out
+
+
+# ----------------------------------------------------
+# 🖨️ REPORT
+# ----------------------------------------------------
+def _fmt(ci, scale=1.0, digits=2):
+    if ci["mean"] is None:
+        return "n/a"
+    if ci["low"] is None:
+        return f"{ci['mean'] * scale:.{digits}f}  (no CI: {ci['runs']} runs, need {MIN_RUNS})"
+    return (f"{ci['mean'] * scale:.{digits}f}  "
+            f"[{ci['low'] * scale:.{digits}f}, {ci['high'] * scale:.{digits}f}]")
+
+
+def report(summary):
+    level = f"{summary['confidence']:.0%} CI"
+    print(f"\n{summary['runs']} runs, {summary['cycles']:,} cycles  (estimate  [{level}, bootstrap over runs])\n")
+
+    print("Events per 1,000 cycles")
+    for name, ci in summary["rates_per_1000_cycles"].items():
+        print(f"  {name:<22}{_fmt(ci)}")
+
+    print("\nShare of events forced by EVENT_GAP_LIMIT")
+    for name, ci in summary["forced_share"].items():
+        print(f"  {name:<22}{_fmt(ci, 100, 1)} %")
+
+    print("\nMagnitude by phase")
+    for phase, p in summary["phases"].items():
+        print(f"  {phase:<10} {_fmt(p['share_of_cycles'], 100, 1)} % of cycles")
+        if p["cycles"]:
+            q = p["magnitude_quantiles"]
+            strong = p[f"share_m{STRONG_MAGNITUDE:g}_plus"]
+            print(f"             mean M{p['magnitude_mean']:.2f}, "
+                  f"p10/p50/p90 M{q[0.1]:.1f}/{q[0.5]:.1f}/{q[0.9]:.1f}, "
+                  f"M{STRONG_MAGNITUDE:g}+ {_fmt(strong, 100, 1)} %")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=16)
+    parser.add_argument("--cycles", type=int, default=5000, help="counted cycles per run")
+    parser.add_argument("--burn-in", type=int, default=200, help="uncounted cycles per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="pool size; 0 runs everything in this process")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="also write the full summary here")
+    args = parser.parse_args()
+
+    seed = new_seed() if args.seed is None else args.seed
+    seeds = spawn_seeds(seed, args.runs)
+    print(f"🎲 seed {seed}: {args.runs} runs x {args.cycles:,} cycles "
+          f"on {args.workers or 1} {'worker' if args.workers else 'process'}(s)")
+
+    start = time.perf_counter()
+    if args.workers:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            runs = list(pool.map(_run, seeds, [args.cycles] * args.runs, [args.burn_in] * args.runs))
+    else:
+        runs = [_run(s, args.cycles, args.burn_in) for s in seeds]
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(runs)
+    summary["seed"] = seed
+    summary["elapsed_s"] = round(elapsed, 2)
+    report(summary)
+    print(f"\n✅ {summary['cycles'] + args.runs * args.burn_in:,} cycles in {elapsed:.1f} s "
+          f"({(summary['cycles'] + args.runs * args.burn_in) / elapsed:,.0f} cycles/s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
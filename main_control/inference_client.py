@@ -0,0 +1,140 @@
+import itertools
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future
+
+# Where inference_daemon.py listens; one daemon serves every process on the host
+SOCKET_PATH = os.environ.get("INFERENCE_SOCKET", "/tmp/hazard_inference.sock")
+
+
+class InferenceClient:
+    """
+    Thin client for inference_daemon.py.
+
+    Holds no models: requests go over the daemon's Unix socket as one JSON
+    line each and come back tagged with their id, so any number can be in
+    flight on one connection.  The helpers are named after the predictor
+    functions and return futures, like InferencePool's, so a client can
+    stand in as the simulation's inference backend; the model versions the
+    daemon scored with are on each future's model_versions attribute.
+    With a timeout, a request the daemon has not answered (or a send it
+    has not accepted) within that many seconds fails its future with
+    TimeoutError instead of waiting forever.  Only the standard library
+    is imported.
+    """
+
+    def __init__(self, path=SOCKET_PATH, timeout=None):
+        self.path = path
+        self.timeout = timeout
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(path)
+        # Bounds sendall() and wakes the reader to expire overdue requests
+        self._sock.settimeout(timeout)
+
+        self._ids = itertools.count()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._read_loop, name="inference-client", daemon=True)
+        self._thread.start()
+
+    def submit(self, task, payload=None):
+        """Future for the daemon's answer to (task, payload)."""
+        future = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            if self._closed:
+                raise ConnectionError(f"inference daemon connection closed ({self.path})")
+            request_id = next(self._ids)
+            self._pending[request_id] = (future, time.monotonic())
+            line = json.dumps({"id": request_id, "task": task, "payload": payload}).encode() + b"\n"
+            # Sent under the lock so lines from several threads never interleave
+            try:
+                self._sock.sendall(line)
+            except OSError as exc:
+                # A partly sent line would garble the stream: give up on the
+                # connection (the reader then fails whatever is in flight)
+                self._pending.pop(request_id, None)
+                self._closed = True
+                future.set_exception(exc if isinstance(exc, TimeoutError) else
+                                     ConnectionError(f"inference daemon unreachable ({self.path}): {exc}"))
+                try:
+                    self._sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        return future
+
+    def _read_loop(self):
+        buffer = b""
+        try:
+            while True:
+                try:
+                    chunk = self._sock.recv(1 << 16)
+                except TimeoutError:
+                    self._expire()
+                    continue
+                if not chunk:
+                    break
+                *lines, buffer = (buffer + chunk).split(b"\n")
+                for line in lines:
+                    self._deliver(json.loads(line))
+                self._expire()
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._closed = True
+                pending, self._pending = self._pending, {}
+            for future, _ in pending.values():
+                future.set_exception(ConnectionError(f"inference daemon went away ({self.path})"))
+
+    def _deliver(self, reply):
+        with self._lock:
+            future, _ = self._pending.pop(reply["id"], (None, None))
+        if future is None:
+            return                              # answered after it timed out
+        if "error" in reply:
+            future.set_exception(RuntimeError(reply["error"]))
+        else:
+            future.model_versions = reply.get("model_versions", {})
+            future.set_result(reply["result"])
+
+    def _expire(self):
+        if self.timeout is None:
+            return
+        cutoff = time.monotonic() - self.timeout
+        with self._lock:
+            overdue = [i for i, (_, sent) in self._pending.items() if sent < cutoff]
+            futures = [self._pending.pop(i)[0] for i in overdue]
+        for future in futures:
+            future.set_exception(TimeoutError(
+                f"no reply from inference daemon within {self.timeout} s ({self.path})"))
+
+    # ------------------------------------------------
+    # PREDICTOR SHORTCUTS
+    # ------------------------------------------------
+    def is_earthquake_event(self, sample):
+        return self.submit("event", sample)
+
+    def evaluate_tsunami(self, sample):
+        return self.submit("tsunami", sample)
+
+    def predict_landslide_risk(self, sample):
+        return self.submit("landslide", sample)
+
+    def stats(self):
+        """The daemon's counters (blocking)."""
+        return self.submit("stats").result(self.timeout)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        self._thread.join()
@@ -0,0 +1,269 @@
+"""
+Serve the hazard models to every process on this host over a Unix socket.
+
+    python inference_daemon.py [--socket /tmp/hazard_inference.sock]
+                               [--window-ms 2] [--max-batch 256] [--no-watch]
+
+The daemon loads, compiles and warms the event, tsunami and landslide
+models once, and hot-reloads them like any registry user.  Clients
+(inference_client.InferenceClient) send one JSON line per request:
+{"id": 7, "task": "tsunami", "payload": {...}}.  A dispatcher thread
+takes the first queued request, waits up to --window-ms for more (at
+most --max-batch), and scores each task's group with one *_batch call, so
+one predict_proba covers requests from any number of connections.  Each
+reply {"id": 7, "result": {...}, "model_versions": {...}} is what the
+predictor function would have returned for that sample alone, with the
+model versions that scored it.  A request that fails is retried
+alone, so it cannot fail the rest of its batch.
+"""
+import argparse
+import collections
+import json
+import os
+import queue
+import signal
+import socketserver
+import sys
+import threading
+import time
+
+import numpy as np
+
+from event_classifier import is_earthquake_event, is_earthquake_event_batch
+from inference_client import SOCKET_PATH
+from inference_pool import PRELOAD_MODELS
+from landslide_predictor import predict_landslide_risk, predict_landslide_risk_batch
+from model_registry import registry
+from tsunami_evaluator import evaluate_tsunami, evaluate_tsunami_batch
+
+# task -> (batch function, single-sample function)
+TASKS = {
+    "event": (is_earthquake_event_batch, is_earthquake_event),
+    "tsunami": (evaluate_tsunami_batch, evaluate_tsunami),
+    "landslide": (predict_landslide_risk_batch, predict_landslide_risk),
+}
+
+WINDOW_MS = 2.0
+MAX_BATCH = 256
+LATENCY_WINDOW = 1024
+
+Request = collections.namedtuple("Request", "id task payload reply received")
+
+
+def _json_default(value):
+    # numpy scalars (e.g. the np.bool_ flags) -> plain Python
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# ----------------------------------------------------
+# 📦 BATCHING
+# ----------------------------------------------------
+class Batcher:
+    """
+    Groups queued requests into batches.  Requests arriving within
+    window_ms of the first one in a batch (up to max_batch) are scored
+    together, one *_batch call per task.
+    """
+
+    def __init__(self, window_ms=WINDOW_MS, max_batch=MAX_BATCH):
+        self.window = window_ms / 1e3
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.model_calls = 0
+        self.failed = 0
+        self.largest_batch = 0
+        self._latency_ms = collections.deque(maxlen=LATENCY_WINDOW)
+        self._thread = threading.Thread(target=self._run, name="inference-batcher", daemon=True)
+        self._thread.start()
+
+    def put(self, request):
+        self._queue.put(request)
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._queue.put(None)       # stop after this batch
+                    break
+                batch.append(request)
+            self._score(batch)
+
+    def _score(self, batch):
+        groups = collections.defaultdict(list)
+        for request in batch:
+            groups[request.task].append(request)
+
+        # One model version for the whole batch, as in the simulation loop
+        with registry.pinned():
+            versions = registry.versions(PRELOAD_MODELS)
+            for task, requests in groups.items():
+                batch_fn, single_fn = TASKS[task]
+                try:
+                    results = batch_fn([r.payload for r in requests])
+                    outcomes = [(result, None) for result in results]
+                except Exception:
+                    outcomes = [self._score_one(single_fn, r.payload) for r in requests]
+                with self._lock:
+                    self.model_calls += 1
+
+                for request, (result, error) in zip(requests, outcomes):
+                    request.reply(request.id, result, error, versions)
+
+        now = time.perf_counter()
+        with self._lock:
+            self.requests += len(batch)
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self._latency_ms.extend((now - r.received) * 1e3 for r in batch)
+
+    def _score_one(self, fn, payload):
+        try:
+            return fn(payload), None
+        except Exception as exc:
+            with self._lock:
+                self.failed += 1
+            return None, f"{type(exc).__name__}: {exc}"
+
+    def stats(self):
+        with self._lock:
+            latency = np.array(self._latency_ms)
+            out = {
+                "window_ms": self.window * 1e3,
+                "max_batch": self.max_batch,
+                "queue_depth": self._queue.qsize(),
+                "requests": self.requests,
+                "batches": self.batches,
+                "model_calls": self.model_calls,
+                "mean_batch": round(self.requests / self.batches, 2) if self.batches else None,
+                "largest_batch": self.largest_batch,
+                "failed": self.failed,
+            }
+        if len(latency):
+            out["latency_ms"] = {
+                "mean": round(float(latency.mean()), 3),
+                "p50": round(float(np.percentile(latency, 50)), 3),
+                "p99": round(float(np.percentile(latency, 99)), 3)
+            }
+        else:
+            out["latency_ms"] = None
+        return out
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+
+# ----------------------------------------------------
+# 🔌 SOCKET SERVER
+# ----------------------------------------------------
+class _Connection(socketserver.StreamRequestHandler):
+    def handle(self):
+        write_lock = threading.Lock()
+
+        def reply(request_id, result=None, error=None, versions=None):
+            message = {"id": request_id}
+            if error is None:
+                message["result"] = result
+            else:
+                message["error"] = error
+            if versions is not None:
+                message["model_versions"] = versions
+            line = json.dumps(message, default=_json_default).encode() + b"\n"
+            with write_lock:
+                try:
+                    self.wfile.write(line)
+                    self.wfile.flush()
+                except OSError:
+                    pass                        # client left; nothing to answer
+
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+                request_id, task = message["id"], message["task"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            if task == "stats":
+                reply(request_id, self.server.stats())
+            elif task not in TASKS:
+                reply(request_id, error=f"unknown inference task: {task}")
+            else:
+                self.server.batcher.put(Request(request_id, task, message.get("payload"),
+                                                reply, time.perf_counter()))
+
+
+class InferenceDaemon(socketserver.ThreadingUnixStreamServer):
+    """One thread per client connection, one shared Batcher behind them."""
+
+    daemon_threads = True
+
+    def __init__(self, path=SOCKET_PATH, window_ms=WINDOW_MS, max_batch=MAX_BATCH,
+                 models=PRELOAD_MODELS, watch=True):
+        # Load, compile and warm every model before the first client connects
+        for name in models:
+            registry.entry(name).warm_up()
+        if watch:
+            registry.start_watching()
+
+        if os.path.exists(path):
+            os.unlink(path)                     # stale socket from a previous run
+        self.path = path
+        self.batcher = Batcher(window_ms, max_batch)
+        self.started = time.time()
+        super().__init__(path, _Connection)
+
+    def stats(self):
+        return {
+            "socket": self.path,
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "model_versions": registry.versions(),
+            **self.batcher.stats()
+        }
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    parser.add_argument("--window-ms", type=float, default=WINDOW_MS)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--no-watch", action="store_true")
+    args = parser.parse_args()
+
+    daemon = InferenceDaemon(args.socket, args.window_ms, args.max_batch, watch=not args.no_watch)
+    # SIGTERM unwinds through the finally below, so the socket file goes away
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"✅ inference daemon on {args.socket} "
+          f"(window {args.window_ms} ms, max batch {args.max_batch})")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import collections
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import numpy as np
+
+from event_classifier import MODEL_NAME as EVENT_MODEL
+from event_classifier import is_earthquake_event, is_earthquake_event_batch
+from landslide_predictor import MODEL_NAME as LANDSLIDE_MODEL
+from landslide_predictor import predict_landslide_risk, predict_landslide_risk_batch
+from model_registry import registry
+from tsunami_evaluator import MODEL_NAME as TSUNAMI_MODEL
+from tsunami_evaluator import evaluate_tsunami, evaluate_tsunami_batch
+
+# Work a pool worker knows how to run, by name (functions themselves
+# are looked up in the worker, only the name and payload are pickled)
+TASKS = {
+    "event": is_earthquake_event,
+    "event_batch": is_earthquake_event_batch,
+    "tsunami": evaluate_tsunami,
+    "tsunami_batch": evaluate_tsunami_batch,
+    "landslide": predict_landslide_risk,
+    "landslide_batch": predict_landslide_risk_batch,
+}
+
+PRELOAD_MODELS = [EVENT_MODEL, TSUNAMI_MODEL, LANDSLIDE_MODEL]
+
+LATENCY_WINDOW = 1024
+
+
+# ----------------------------------------------------
+# 👷 WORKER SIDE
+# ----------------------------------------------------
+def _init_worker(models, watch):
+    # Load, compile and warm every model once per worker, not per task
+    for name in models:
+        registry.entry(name).warm_up()
+    if watch:
+        registry.start_watching()
+
+
+def _run_task(task, payload):
+    start = time.perf_counter()
+    with registry.pinned():
+        result = TASKS[task](payload)
+        versions = registry.versions(PRELOAD_MODELS)
+    return result, (time.perf_counter() - start) * 1e3, versions
+
+
+# ----------------------------------------------------
+# 🏭 POOL
+# ----------------------------------------------------
+class InferencePool:
+    """
+    Model inference in a pool of worker processes.
+
+    Each worker loads and warms up the models in its initializer and
+    (with watch=True) hot-reloads them on its own.  submit() and the
+    helpers named after the predictor functions return futures that
+    resolve to exactly what the inline function would return; the model
+    versions the worker had pinned for the call are on the future's
+    model_versions attribute (the parent process holds no models).
+
+    With max_pending set, submit() blocks while that many tasks are in
+    flight, so a fast producer cannot queue unbounded work.  With
+    submit_timeout it blocks at most that long: if no slot frees up (the
+    workers are stuck) the returned future fails with TimeoutError, so the
+    caller can score elsewhere instead of hanging.
+    """
+
+    def __init__(self, workers=None, models=PRELOAD_MODELS, max_pending=None, watch=True,
+                 submit_timeout=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.submit_timeout = submit_timeout
+        # spawn, not fork: the pool is created from the threaded server
+        # process, and a forked child could inherit a lock held by another
+        # thread at that moment
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(list(models), watch)
+        )
+        self._slots = threading.BoundedSemaphore(max_pending) if max_pending else None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._latency_ms = collections.deque(maxlen=LATENCY_WINDOW)
+        self._service_ms = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def submit(self, task, payload):
+        """Future for TASKS[task](payload), run in a worker."""
+        if task not in TASKS:
+            raise ValueError(f"Unknown inference task: {task}")
+        if self._slots is not None and not self._slots.acquire(timeout=self.submit_timeout):
+            with self._lock:
+                self.rejected += 1
+            rejected = Future()
+            rejected.set_running_or_notify_cancel()
+            rejected.set_exception(TimeoutError(
+                f"{self.max_pending} inference tasks still pending after {self.submit_timeout:g} s"))
+            return rejected
+
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._pending += 1
+            self.submitted += 1
+
+        try:
+            inner = self._executor.submit(_run_task, task, payload)
+        except Exception:
+            self._task_done(submitted_at, None)
+            raise
+
+        # Hand back a future for the bare result; the worker timing stays here
+        outer = Future()
+        outer.set_running_or_notify_cancel()
+        inner.add_done_callback(lambda f: self._finish(f, outer, submitted_at))
+        return outer
+
+    def _finish(self, inner, outer, submitted_at):
+        try:
+            result, service_ms, versions = inner.result()
+        except BaseException as exc:
+            self._task_done(submitted_at, None)
+            outer.set_exception(exc)
+            return
+        self._task_done(submitted_at, service_ms)
+        outer.model_versions = versions
+        outer.set_result(result)
+
+    def _task_done(self, submitted_at, service_ms):
+        with self._lock:
+            self._pending -= 1
+            if service_ms is None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self._latency_ms.append((time.perf_counter() - submitted_at) * 1e3)
+                self._service_ms.append(service_ms)
+        if self._slots is not None:
+            self._slots.release()
+
+    # ------------------------------------------------
+    # PREDICTOR SHORTCUTS
+    # ------------------------------------------------
+    def is_earthquake_event(self, sample):
+        return self.submit("event", sample)
+
+    def is_earthquake_event_batch(self, samples):
+        return self.submit("event_batch", samples)
+
+    def evaluate_tsunami(self, sample):
+        return self.submit("tsunami", sample)
+
+    def evaluate_tsunami_batch(self, samples):
+        return self.submit("tsunami_batch", samples)
+
+    def predict_landslide_risk(self, sample):
+        return self.submit("landslide", sample)
+
+    def predict_landslide_risk_batch(self, samples):
+        return self.submit("landslide_batch", samples)
+
+    # ------------------------------------------------
+    # STATUS
+    # ------------------------------------------------
+    def stats(self):
+        """
+        Worker count, tasks in flight (queue depth) and, over the last
+        LATENCY_WINDOW tasks, end-to-end latency (submit -> result) next to
+        the time spent inside the worker; the gap is queueing + IPC.
+        """
+        with self._lock:
+            latency = np.array(self._latency_ms)
+            service = np.array(self._service_ms)
+            out = {
+                "workers": self.workers,
+                "queue_depth": self._pending,
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+        for label, samples in (("latency_ms", latency), ("service_ms", service)):
+            if len(samples):
+                out[label] = {
+                    "mean": round(float(samples.mean()), 3),
+                    "p50": round(float(np.percentile(samples, 50)), 3),
+                    "p99": round(float(np.percentile(samples, 99)), 3)
+                }
+            else:
+                out[label] = None
+        return out
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
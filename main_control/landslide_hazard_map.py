@@ -0,0 +1,206 @@
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cascade import LANDSLIDE_RAIN_MM, LANDSLIDE_SLOPE_DEG
+from geo import nearest_city
+from landslide_predictor import FEATURES, MODEL_NAME, landslide_risk_arrays
+from model_registry import get_compiled, registry
+
+
+def _smooth_field(rng, shape, coarse=8):
+    """Random field in [0, 1] bilinearly upsampled from a coarse grid."""
+    knots = rng.random((coarse + 1, coarse + 1))
+    y = np.linspace(0, coarse, shape[0])
+    x = np.linspace(0, coarse, shape[1])
+    y0 = np.minimum(y.astype(int), coarse - 1)
+    x0 = np.minimum(x.astype(int), coarse - 1)
+    fy = (y - y0)[:, None]
+    fx = (x - x0)[None, :]
+    top = knots[y0][:, x0] * (1 - fx) + knots[y0][:, x0 + 1] * fx
+    bottom = knots[y0 + 1][:, x0] * (1 - fx) + knots[y0 + 1][:, x0 + 1] * fx
+    return top * (1 - fy) + bottom * fy
+
+
+def _init_worker():
+    # Pay the model load once per worker, not per tile
+    get_compiled(MODEL_NAME)
+
+
+def _score_tile(features):
+    # Alerts only where the landslide cascade would let the model speak
+    probs, alerts = landslide_risk_arrays(features)
+    gate = (features[:, 0] > LANDSLIDE_RAIN_MM) & (features[:, 2] > LANDSLIDE_SLOPE_DEG)
+    return probs.astype(np.float32), alerts & gate
+
+
+class LandslideHazardMap:
+    """
+    Landslide risk over a lat/lon grid of terrain cells.
+
+    The grid is cut into square tiles, each scored with one vectorized
+    model call, optionally spread over a process pool.  Rainfall is
+    bucketed (rainfall_bucket_mm) before scoring and every tile remembers
+    the bucket pattern it was scored with, so refresh() after a rainfall
+    update only re-scores tiles whose buckets actually changed.  The
+    landslide model version is part of every tile key, so a hot swap
+    re-scores the whole map (and restarts the pool, whose workers loaded
+    the old model).
+
+    Terrain (slope, vegetation, soil type, base moisture and a rainfall
+    pattern) is synthesized from `seed` in the ranges SimulationEngine uses.
+    """
+
+    def __init__(self, lat_range=(28.0, 36.0), lon_range=(72.0, 82.0), resolution=0.05,
+                 tile_size=32, rainfall_bucket_mm=10.0, workers=None, seed=7):
+        self.lats = np.arange(lat_range[0], lat_range[1], resolution)
+        self.lons = np.arange(lon_range[0], lon_range[1], resolution)
+        self.shape = (len(self.lats), len(self.lons))
+        self.tile_size = tile_size
+        self.rainfall_bucket_mm = rainfall_bucket_mm
+
+        # ---------------- TERRAIN ----------------
+        rng = np.random.default_rng(seed)
+        self.slope_angle_deg = 15 + 40 * _smooth_field(rng, self.shape)
+        self.vegetation_index = 0.3 + 0.5 * _smooth_field(rng, self.shape)
+        self.soil_type = np.minimum((4 * _smooth_field(rng, self.shape)).astype(int), 3)
+        self.base_moisture = 0.35 + 0.3 * _smooth_field(rng, self.shape)
+        self.rain_pattern = 0.6 + 0.8 * _smooth_field(rng, self.shape)
+
+        self.rainfall_mm = np.zeros(self.shape)
+        self.ground_vibration = 0.0
+
+        # ---------------- OUTPUT ----------------
+        self.risk = np.zeros(self.shape, dtype=np.float32)
+        self.alert = np.zeros(self.shape, dtype=bool)
+
+        self.tiles = [
+            (slice(r, r + tile_size), slice(c, c + tile_size))
+            for r in range(0, self.shape[0], tile_size)
+            for c in range(0, self.shape[1], tile_size)
+        ]
+        self._tile_keys = [None] * len(self.tiles)
+        self.tiles_scored = 0
+        self.tiles_reused = 0
+
+        self.workers = workers
+        self._pool = None
+        self._model_version = None
+
+    # ------------------------------------------------
+    # INPUTS
+    # ------------------------------------------------
+    def update_rainfall(self, rainfall_mm):
+        """Scalar (spread with the terrain rain pattern) or a full raster."""
+        if np.isscalar(rainfall_mm):
+            rainfall_mm = rainfall_mm * self.rain_pattern
+        self.rainfall_mm = np.clip(np.asarray(rainfall_mm, dtype=float), 0, 300)
+
+    def set_ground_vibration(self, value):
+        self.ground_vibration = round(float(value), 2)
+
+    def invalidate(self):
+        """Forget cached tiles, so the next refresh() re-scores the whole map."""
+        self._tile_keys = [None] * len(self.tiles)
+
+    # ------------------------------------------------
+    # SCORING
+    # ------------------------------------------------
+    def _start_pool(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+        # spawn: the map lives in the threaded server process
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                         mp_context=multiprocessing.get_context("spawn"))
+
+    def _tile_features(self, rows, cols, version):
+        buckets = np.floor(self.rainfall_mm[rows, cols] / self.rainfall_bucket_mm)
+        rainfall = (buckets + 0.5) * self.rainfall_bucket_mm
+        moisture = np.minimum(self.base_moisture[rows, cols] + rainfall / 850, 1.0)
+
+        columns = {
+            "rainfall_mm": rainfall,
+            "soil_moisture": moisture,
+            "slope_angle_deg": self.slope_angle_deg[rows, cols],
+            "vegetation_index": self.vegetation_index[rows, cols],
+            "soil_type": self.soil_type[rows, cols],
+            "ground_vibration": np.full(rainfall.shape, self.ground_vibration)
+        }
+        features = np.stack([columns[name].ravel() for name in FEATURES], axis=1)
+
+        key = hashlib.blake2b(buckets.astype(np.int16).tobytes(), digest_size=16)
+        key.update(repr((self.ground_vibration, version)).encode())
+        return features, key.digest()
+
+    def refresh(self):
+        """Re-score the tiles whose rainfall buckets or model changed.  Returns how many."""
+        version = registry.entry(MODEL_NAME).version
+        if self.workers != 0 and version != self._model_version:
+            self._start_pool()
+        self._model_version = version
+
+        pending = []
+        for i, (rows, cols) in enumerate(self.tiles):
+            features, key = self._tile_features(rows, cols, version)
+            if key == self._tile_keys[i]:
+                self.tiles_reused += 1
+                continue
+            pending.append((i, features, key))
+
+        if self._pool is None:
+            results = [_score_tile(features) for _, features, _ in pending]
+        else:
+            results = self._pool.map(_score_tile, [features for _, features, _ in pending])
+
+        for (i, _, key), (probs, alerts) in zip(pending, results):
+            rows, cols = self.tiles[i]
+            tile_shape = self.risk[rows, cols].shape
+            self.risk[rows, cols] = probs.reshape(tile_shape)
+            self.alert[rows, cols] = alerts.reshape(tile_shape)
+            self._tile_keys[i] = key
+
+        self.tiles_scored += len(pending)
+        return len(pending)
+
+    # ------------------------------------------------
+    # OUTPUT
+    # ------------------------------------------------
+    def hot_cells(self, n=10):
+        """The n highest-risk cells, ready for the map / alert panels."""
+        flat = self.risk.ravel()
+        n = min(n, flat.size)
+        if n <= 0:
+            return []                           # argpartition(flat, -0)[-0:] is every cell
+        top = np.argpartition(flat, -n)[-n:]
+        top = top[np.argsort(flat[top])[::-1]]
+
+        cells = []
+        for idx in top:
+            r, c = np.unravel_index(idx, self.shape)
+            lat, lon = float(self.lats[r]), float(self.lons[c])
+            cells.append({
+                "lat": round(lat, 3),
+                "lon": round(lon, 3),
+                "location": nearest_city(lat, lon),
+                "risk_score": round(float(flat[idx]), 3),
+                "landslide_alert": bool(self.alert[r, c])
+            })
+        return cells
+
+    def snapshot(self, n=10):
+        return {
+            "bounds": [round(float(v), 3) for v in
+                       (self.lats[0], self.lons[0], self.lats[-1], self.lons[-1])],
+            "shape": list(self.shape),
+            "alert_cells": int(self.alert.sum()),
+            "tiles_scored": self.tiles_scored,
+            "tiles_reused": self.tiles_reused,
+            "hot_cells": self.hot_cells(n)
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
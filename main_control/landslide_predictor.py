@@ -1,15 +1,60 @@
-import joblib
 import numpy as np
-import os
 
-MODEL_PATH = os.path.join("Models", "landslide_model.pkl")
+from feature_matrix import to_matrix
+from model_registry import get_compiled, registry
+from prediction_cache import PredictionCache, quantize
 
-print("🌄 Loading Landslide Model...")
-model = joblib.load(MODEL_PATH)
-print("✅ Landslide Model Ready")
+MODEL_NAME = "landslide_model"
 
+FEATURES = [
+    "rainfall_mm",
+    "soil_moisture",
+    "slope_angle_deg",
+    "vegetation_index",
+    "soil_type",
+    "ground_vibration"
+]
+
+
+# -----------------------------
+# OPT-IN PREDICTION CACHE
+# -----------------------------
+# Cache keys use the precision SimulationEngine.build_scenario rounds to,
+# so repeated scenarios hit instead of re-running the forest.
+QUANTIZATION = {
+    "rainfall_mm": 1,
+    "soil_moisture": 2,
+    "slope_angle_deg": 1,
+    "vegetation_index": 2,
+    "soil_type": None,
+    "ground_vibration": 2
+}
+
+_cache = None
+
+def enable_cache(maxsize=4096, ttl=None, max_bytes=4 * 1024 * 1024):
+    global _cache
+    _cache = PredictionCache(maxsize=maxsize, ttl=ttl, max_bytes=max_bytes)
+    return _cache
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+def cache_stats():
+    return _cache.stats() if _cache is not None else None
 
 def predict_landslide_risk(sample):
+    if _cache is None:
+        return _predict_landslide_risk(sample)
+
+    return _cache.get_or_compute(
+        registry.entry(MODEL_NAME).version,
+        quantize(sample, QUANTIZATION),
+        lambda: _predict_landslide_risk(sample)
+    )
+
+def _predict_landslide_risk(sample):
     """
     sample = {
         "rainfall_mm": float,
@@ -30,10 +75,46 @@ def predict_landslide_risk(sample):
         sample["ground_vibration"]
     ]])
 
+    model = get_compiled(MODEL_NAME)
+
     prob = model.predict_proba(features)[0][1]
     risk = model.predict(features)[0]
 
     return {
         "landslide_alert": bool(risk),
         "risk_score": float(prob)
-    }
\ No newline at end of file
+    }
+
+
+def predict_landslide_risk_batch(samples):
+    """
+    samples: list of terrain dicts or array shaped (n, 6) in FEATURES order.
+    The label is taken from the same predict_proba call (argmax over
+    classes_, which is what model.predict does), so each row matches
+    predict_landslide_risk.
+    """
+
+    features = to_matrix(samples, FEATURES)
+    if len(features) == 0:
+        return []                               # sklearn rejects 0-row input
+
+    probs, risks = landslide_risk_arrays(features)
+
+    return [
+        {
+            "landslide_alert": bool(risk),
+            "risk_score": float(prob)
+        }
+        for prob, risk in zip(probs, risks)
+    ]
+
+
+def landslide_risk_arrays(features):
+    """(risk_score, landslide_alert) arrays for a (n, 6) feature matrix."""
+
+    model = get_compiled(MODEL_NAME)
+
+    proba = model.predict_proba(features)
+    risks = model.classes_.take(np.argmax(proba, axis=1))
+
+    return proba[:, 1], risks.astype(bool)
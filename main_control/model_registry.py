@@ -0,0 +1,349 @@
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+
+from compiled_forest import CompiledForest
+from shared_forests import bundle_names, open_bundle
+
+# Resolved from this file, not the working directory, so the models are
+# found no matter where the process was started from.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, "Models")
+VARIANT_DIR = os.path.join(MODEL_DIR, "variants")
+MANIFEST_NAME = "manifest.json"
+
+
+def parse_variants(spec):
+    """"earthquake_magnitude=t75-d12-f32-p,landslide_model=..." -> dict"""
+    pairs = (item.split("=", 1) for item in spec.split(",") if item.strip())
+    return {name.strip(): variant.strip() for name, variant in pairs}
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def file_sha256(path):
+    """Hash of a file, or of every file in a (columnar dataset) directory."""
+    if os.path.isdir(path):
+        files = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+    else:
+        files = [path]
+
+    digest = hashlib.sha256()
+    for name in files:
+        with open(name, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_version(model_dir, name, path):
+    """
+    The version train_models recorded for the model file at `path`: the
+    published one if the hashes match, else whichever recorded version has
+    that hash.  A file the manifest does not know (no manifest yet, or a
+    pickle copied in by hand) is named by the first 12 hex digits of its
+    SHA-256, so the same file gets the same version in every process.
+    """
+    sha = file_sha256(path)
+    try:
+        with open(os.path.join(model_dir, MANIFEST_NAME), "r") as f:
+            entry = json.load(f)["models"].get(name, {})
+    except (OSError, ValueError, KeyError):
+        entry = {}
+
+    matches = [v["version"] for v in entry.get("versions", []) if v.get("sha256") == sha]
+    if entry.get("published") in matches:
+        return entry["published"]
+    if matches:
+        return max(matches)
+    return sha[:12]
+
+
+class ModelVersion:
+    """
+    One loaded revision of a model file.  Never mutated after swap-in.
+    version is the manifest version of the pickle (manifest_version).
+
+    For a compact variant the .npz forest is what gets loaded; the raw
+    sklearn model is then only unpickled if something asks for .model.
+    """
+
+    def __init__(self, name, version, signature, load_ms, model=None, compiled=None,
+                 variant=None, model_loader=None):
+        self.name = name
+        self.version = version
+        self.variant = variant
+        self.signature = signature
+        self.load_ms = load_ms
+        self.compile_ms = None
+        self.loaded_at = time.time()
+        self._model = model
+        self._model_loader = model_loader
+        self._compiled = compiled
+        self._lock = threading.RLock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._model_loader()
+        return self._model
+
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            with self._lock:
+                if self._compiled is None:
+                    start = time.perf_counter()
+                    self._compiled = CompiledForest.from_sklearn(self.model)
+                    self.compile_ms = round((time.perf_counter() - start) * 1e3, 2)
+        return self._compiled
+
+    def warm_up(self):
+        """Run one prediction so the first real call pays no first-touch cost."""
+        forest = self.compiled
+        row = np.zeros((1, forest.n_features))
+        if forest.is_classifier:
+            forest.predict_proba(row)
+        else:
+            forest.predict(row)
+
+
+class ModelRegistry:
+    """
+    Lazily loaded, hot-reloadable models from main_control/Models.
+
+    Nothing is unpickled until a model is first asked for, so a process only
+    pays for the models it actually uses.  Loads go through joblib with
+    mmap_mode, so arrays joblib stored separately stay paged out until
+    touched (sklearn trees copy their node arrays on unpickle, so the saving
+    there is limited to the raw file pages).
+
+    With start_watching() the model files are polled; a changed file is
+    loaded and warmed up on the watcher thread and then swapped in with a
+    single dict assignment.  Code running inside pinned() keeps the versions
+    it first saw until the block exits, so an in-flight simulation cycle
+    never mixes old and new models.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, mmap_mode="r", variants=None, bundle=None):
+        self.model_dir = model_dir
+        self.mmap_mode = mmap_mode
+        if variants is None:
+            variants = parse_variants(os.environ.get("MODEL_VARIANTS", ""))
+        self.variants = variants
+        # A shared forest bundle (shared_forests.py) takes precedence for
+        # the models it contains
+        self.bundle = bundle or os.environ.get("MODEL_BUNDLE") or None
+        self._active = {}
+        self._failed = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._watcher = None
+        self._stop = threading.Event()
+
+    def path(self, name):
+        return os.path.join(self.model_dir, name + ".pkl")
+
+    def variant_path(self, name):
+        variant = self.variants.get(name)
+        if variant is None:
+            return None
+        return os.path.join(self.model_dir, "variants", f"{name}__{variant}.npz")
+
+    def in_bundle(self, name):
+        if self.bundle is None:
+            return False
+        try:
+            return name in bundle_names(self.bundle)
+        except (OSError, ValueError):
+            return False
+
+    def source_path(self, name):
+        """The file a model is actually loaded from (and watched for changes)."""
+        if self.in_bundle(name):
+            return self.bundle
+        return self.variant_path(name) or self.path(name)
+
+    # ------------------------------------------------
+    # LOADING
+    # ------------------------------------------------
+    def _load(self, name):
+        path = self.source_path(name)
+        signature = file_signature(path)
+        pickle_path = self.path(name)
+        version = manifest_version(self.model_dir, name, pickle_path)
+
+        def load_pickle():
+            return joblib.load(pickle_path, mmap_mode=self.mmap_mode)
+
+        start = time.perf_counter()
+        if path == pickle_path:
+            entry_args = {"model": load_pickle()}
+        elif path == self.bundle:
+            entry_args = {"compiled": open_bundle(path, [name])[name], "model_loader": load_pickle,
+                          "variant": "bundle"}
+        else:
+            entry_args = {"compiled": CompiledForest.load(path), "model_loader": load_pickle,
+                          "variant": self.variants[name]}
+        load_ms = round((time.perf_counter() - start) * 1e3, 2)
+
+        label = f"{name} v{version}" + (f" [{entry_args['variant']}]" if "variant" in entry_args else "")
+        print(f"📦 {label}: load took {load_ms:.1f} ms")
+        return ModelVersion(name, version, signature, load_ms, **entry_args)
+
+    def _current(self, name):
+        entry = self._active.get(name)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            if name not in self._active:
+                self._active[name] = self._load(name)
+            return self._active[name]
+
+    def entry(self, name):
+        """The ModelVersion to use right now (the pinned one inside pinned())."""
+        pins = getattr(self._local, "pins", None)
+        if pins is None:
+            return self._current(name)
+        if name not in pins:
+            pins[name] = self._current(name)
+        return pins[name]
+
+    def get(self, name):
+        """The raw unpickled model, loaded on first use."""
+        return self.entry(name).model
+
+    def compiled(self, name):
+        """The model as a CompiledForest, built on first use."""
+        return self.entry(name).compiled
+
+    @contextlib.contextmanager
+    def pinned(self):
+        """
+        Freeze the active versions for the current thread.  Models already
+        loaded are pinned on entry, others when first used inside the block.
+        """
+        outer = getattr(self._local, "pins", None)
+        if outer is not None:
+            yield outer
+            return
+
+        self._local.pins = dict(self._active)
+        try:
+            yield self._local.pins
+        finally:
+            self._local.pins = None
+
+    # ------------------------------------------------
+    # HOT RELOAD
+    # ------------------------------------------------
+    def reload(self, name):
+        """
+        Load the file on disk as a new version, warm it up and swap it in.
+        On failure the current version stays active.
+        """
+        current = self._active.get(name)
+
+        try:
+            entry = self._load(name)
+            entry.warm_up()
+        except Exception as exc:
+            kept = f"v{current.version}" if current is not None else "nothing"
+            print(f"⚠️ reload of {name} failed, keeping {kept}: {exc}")
+            return None
+
+        with self._lock:
+            self._active[name] = entry
+        print(f"🔄 {name} swapped to v{entry.version}")
+        return entry
+
+    def check_for_updates(self, pending):
+        """
+        One watcher pass.  A changed file is only reloaded once its
+        signature has been seen unchanged on two polls in a row, so a
+        model that is still being written is not picked up half-way.
+        """
+        for name, entry in list(self._active.items()):
+            try:
+                signature = file_signature(self.source_path(name))
+            except OSError:
+                continue
+
+            if signature == entry.signature or self._failed.get(name) == signature:
+                pending.pop(name, None)
+            elif pending.get(name) == signature:
+                pending.pop(name)
+                if self.reload(name) is None:
+                    self._failed[name] = signature
+            else:
+                pending[name] = signature
+
+    def start_watching(self, interval=2.0):
+        """Poll the loaded model files every interval seconds and hot-swap changes."""
+        # (a watcher inherited through fork is a dead thread; start a new one)
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+
+        def watch():
+            pending = {}
+            while not self._stop.wait(interval):
+                self.check_for_updates(pending)
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=watch, name="model-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    # ------------------------------------------------
+    # STATUS
+    # ------------------------------------------------
+    def versions(self, names=None):
+        """
+        name -> version for the models in use (pinned ones inside pinned()).
+        With names, exactly those models, loading any not loaded yet, so
+        the answer does not depend on which models happened to run first.
+        """
+        if names is not None:
+            return {name: self.entry(name).version for name in names}
+        pins = getattr(self._local, "pins", None)
+        source = pins if pins is not None else self._active
+        return {name: entry.version for name, entry in source.items()}
+
+    def loaded(self):
+        return sorted(self._active)
+
+    def timings(self):
+        return {
+            name: {"version": e.version, "variant": e.variant,
+                   "load_ms": e.load_ms, "compile_ms": e.compile_ms}
+            for name, e in self._active.items()
+        }
+
+
+# ----------------------------------------------------
+# 🔌 REGISTRY ACCESS
+# ----------------------------------------------------
+registry = ModelRegistry()
+
+def get_model(name):
+    return registry.get(name)
+
+def get_compiled(name):
+    return registry.compiled(name)
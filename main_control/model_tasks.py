@@ -0,0 +1,143 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from columnar_dataset import to_frame
+
+# The learning tasks behind main_control/Models, as defined by the
+# training scripts in the repository root (event_classifier.py,
+# earthquake_detector.py, tsunami_evaluator.py).  Each task turns its
+# dataset into (X, y) exactly like the script does and uses the same
+# 80/20 split, so models can be re-trained or re-evaluated consistently.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.dirname(BASE_DIR)
+
+DATASETS = {
+    "earthquake": os.path.join(DATA_DIR, "earthquake_synthetic_dataset.json"),
+    "tsunami": os.path.join(DATA_DIR, "tsunami_synthetic_dataset.json"),
+}
+
+SEISMIC_FEATURES = [
+    "p_wave_amplitude",
+    "s_wave_amplitude",
+    "ps_time_diff_sec",
+    "frequency_hz"
+]
+
+TSUNAMI_FEATURES = [
+    "magnitude",
+    "depth_km",
+    "ocean_depth_m",
+    "fault_type_encoded",
+    "vertical_displacement_m",
+    "distance_to_coast_km"
+]
+
+FAULT_MAP = {"normal": 0, "strike-slip": 1, "reverse": 2}
+
+
+def load_dataset(path):
+    """A JSON dataset file, or a directory written by columnar_dataset.convert."""
+    if os.path.isdir(path):
+        return to_frame(path)
+    with open(path, "r") as f:
+        return pd.DataFrame(json.load(f))
+
+
+# -------------------------------------------------
+# TASK PREPARATION (mirrors the training scripts)
+# -------------------------------------------------
+def _event_classifier(df):
+    y = df["label"].map({"normal": 0, "abnormal": 1})
+    return df[SEISMIC_FEATURES], y
+
+
+def _abnormal(df):
+    return df[df["label"] == "abnormal"].reset_index(drop=True)
+
+
+def _earthquake_magnitude(df):
+    df = _abnormal(df)
+    return df[SEISMIC_FEATURES], (df["p_wave_amplitude"] + df["s_wave_amplitude"]) * 2.5
+
+
+def _earthquake_depth(df):
+    df = _abnormal(df)
+    return df[SEISMIC_FEATURES], df["depth_km"]
+
+
+def _earthquake_magnitude_depth(df):
+    # Both regression targets as one (n, 2) matrix, for a multi-output forest
+    df = _abnormal(df)
+    X, magnitude = _earthquake_magnitude(df)
+    return X, pd.DataFrame({"magnitude": magnitude, "depth_km": df["depth_km"]})
+
+
+def _earthquake_epicenter(df):
+    # Even longitude -> ocean (1), odd -> land (0)
+    df = _abnormal(df)
+    return df[SEISMIC_FEATURES], df["longitude"].apply(lambda x: 1 if int(abs(x)) % 2 == 0 else 0)
+
+
+def _tsunami_model(df):
+    df = df[df["label"].isin(["no_tsunami", "tsunami_risk"])].copy()
+    df["fault_type_encoded"] = df["fault_type"].map(FAULT_MAP)   # "thrust" stays NaN
+    return df[TSUNAMI_FEATURES], df["label"].map({"no_tsunami": 0, "tsunami_risk": 1})
+
+
+TASKS = {
+    "event_classifier": {
+        "dataset": "earthquake", "kind": "classifier", "prepare": _event_classifier,
+        "n_estimators": 100, "stratify": False,
+    },
+    "earthquake_magnitude": {
+        "dataset": "earthquake", "kind": "regressor", "prepare": _earthquake_magnitude,
+        "n_estimators": 100, "stratify": False,
+    },
+    "earthquake_depth": {
+        "dataset": "earthquake", "kind": "regressor", "prepare": _earthquake_depth,
+        "n_estimators": 100, "stratify": False,
+    },
+    # Optional: replaces the magnitude / depth pair with one multi-output
+    # forest (EARTHQUAKE_JOINT=1 in earthquake_detector)
+    "earthquake_magnitude_depth": {
+        "dataset": "earthquake", "kind": "regressor", "prepare": _earthquake_magnitude_depth,
+        "n_estimators": 100, "stratify": False, "optional": True,
+    },
+    "earthquake_epicenter": {
+        "dataset": "earthquake", "kind": "classifier", "prepare": _earthquake_epicenter,
+        "n_estimators": 100, "stratify": False,
+    },
+    "tsunami_model": {
+        "dataset": "tsunami", "kind": "classifier", "prepare": _tsunami_model,
+        "n_estimators": 200, "stratify": True,
+    },
+}
+
+# What the tools train / evaluate unless asked for specific tasks
+DEFAULT_TASKS = [name for name, task in TASKS.items() if not task.get("optional")]
+
+
+def split_task(name, df):
+    """(X_train, X_test, y_train, y_test) for a task, same split as its script."""
+    task = TASKS[name]
+    X, y = task["prepare"](df)
+    return train_test_split(
+        X, y, test_size=0.2, random_state=42,
+        stratify=y if task["stratify"] else None
+    )
+
+
+def score(kind, y_true, y_pred):
+    """
+    Accuracy for classifiers, mean absolute error for regressors (over
+    every output of a multi-output regressor).
+    """
+    y_true = np.asarray(y_true)
+    if kind == "classifier":
+        return "accuracy", float(np.mean(y_true == np.asarray(y_pred)))
+    return "mae", float(np.mean(np.abs(y_true - np.asarray(y_pred))))
@@ -0,0 +1,220 @@
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from event_classifier import FEATURES as EVENT_FEATURES
+from event_classifier import MODEL_NAME as EVENT_MODEL
+from feature_matrix import to_matrix
+from model_registry import registry as default_registry
+from train_models import manifest_lock, next_version, read_manifest, record_version, write_manifest
+from tsunami_evaluator import FAULT_MAP
+from tsunami_evaluator import FEATURES as TSUNAMI_FEATURES
+from tsunami_evaluator import MODEL_NAME as TSUNAMI_MODEL
+
+
+class OnlineUpdater:
+    """
+    Incremental updates of one forest from labelled samples.
+
+    observe() drops a sample into a fixed-size ring buffer (O(1), safe to
+    call from the simulation loop).  update() grows trees_per_update new
+    trees on the buffer with warm_start, on a private copy of the published
+    model, retires the oldest trees beyond max_trees, then publishes the
+    result as a new version through the artifact directory (versions/ +
+    manifest.json) and hot-swaps it into the registry.  If something else
+    published the model while the update was fitting, the update is
+    dropped rather than overwrite it.  start() runs
+    update() on a background thread whenever min_new samples arrived.
+    """
+
+    def __init__(self, name, features, encoders=None, capacity=5000, trees_per_update=10,
+                 max_trees=None, min_new=200, registry=default_registry):
+        self.name = name
+        self.features = features
+        self.encoders = encoders
+        self.capacity = capacity
+        self.trees_per_update = trees_per_update
+        self.max_trees = max_trees
+        self.min_new = min_new
+        self.registry = registry
+
+        self._X = np.empty((capacity, len(features)))
+        self._y = np.empty(capacity, dtype=np.int64)
+        self._head = 0
+        self._count = 0
+        self.new_samples = 0
+
+        self.updates = 0
+        self.skipped = 0
+        self.last_update = None
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    # ------------------------------------------------
+    # BUFFER
+    # ------------------------------------------------
+    def observe(self, sample, label):
+        row = to_matrix([sample], self.features, self.encoders)[0]
+        with self._lock:
+            self._X[self._head] = row
+            self._y[self._head] = label
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            self.new_samples += 1
+
+    def _snapshot(self):
+        with self._lock:
+            return self._X[:self._count].copy(), self._y[:self._count].copy(), self.new_samples
+
+    # ------------------------------------------------
+    # UPDATE
+    # ------------------------------------------------
+    def update(self):
+        """Grow / retire trees and publish.  Returns the new version, or None if skipped."""
+        with self._update_lock:
+            X, y, new = self._snapshot()
+
+            # Private copy of the published model; the live one is never touched
+            with manifest_lock(self.registry.model_dir):
+                manifest = read_manifest(self.registry.model_dir)
+                base = manifest["models"].get(self.name, {}).get("published")
+                upcoming = next_version(manifest, self.name)
+                model = joblib.load(self.registry.path(self.name))
+
+            # Only forests can grow trees (select_models may publish a single
+            # tree); warm_start re-derives classes_ from y, so the buffer
+            # must hold exactly the classes the forest already knows
+            if not hasattr(model, "estimators_") or not np.array_equal(np.unique(y), model.classes_):
+                self.skipped += 1
+                return None
+
+            retired = 0
+            if self.max_trees is not None:
+                retired = max(0, len(model.estimators_) + self.trees_per_update - self.max_trees)
+                model.estimators_ = model.estimators_[retired:]
+
+            # A fixed random_state would give every update the same new-tree
+            # seeds; derive one per version so reruns still reproduce
+            random_state = int(np.random.SeedSequence(
+                [model.random_state or 0, upcoming]).generate_state(1)[0])
+
+            start = time.perf_counter()
+            model.set_params(warm_start=True, n_jobs=None, random_state=random_state,
+                             n_estimators=len(model.estimators_) + self.trees_per_update)
+            if hasattr(model, "feature_names_in_"):
+                model.fit(pd.DataFrame(X, columns=model.feature_names_in_), y)
+            else:
+                model.fit(X, y)
+            model.set_params(warm_start=False)
+            fit_s = round(time.perf_counter() - start, 2)
+
+            # Shared with the other updater and with train_models/select_models
+            with manifest_lock(self.registry.model_dir):
+                manifest = read_manifest(self.registry.model_dir)
+                published = manifest["models"].get(self.name, {}).get("published")
+                if published != base:
+                    self.skipped += 1
+                    print(f"⚠️ {self.name}: v{published} published during the update; "
+                          f"dropping it (built on v{base})")
+                    return None
+                version = record_version(
+                    manifest, self.name, model, self.registry.model_dir, publish=True,
+                    source="online", buffer_rows=len(y), new_samples=new,
+                    trees_added=self.trees_per_update, trees_retired=retired, fit_seconds=fit_s
+                )
+                write_manifest(manifest, self.registry.model_dir)
+
+            with self._lock:
+                self.new_samples -= new
+            self.registry.reload(self.name)
+
+            self.updates += 1
+            self.last_update = {
+                "version": version,
+                "trees": len(model.estimators_),
+                "trees_retired": retired,
+                "buffer_rows": len(y),
+                "fit_seconds": fit_s,
+                "at": time.time()
+            }
+            print(f"🌱 {self.name}: online update v{version} "
+                  f"(+{self.trees_per_update}/-{retired} trees, {len(y)} samples)")
+            return version
+
+    # ------------------------------------------------
+    # BACKGROUND
+    # ------------------------------------------------
+    def start(self, interval=30.0):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                if self.new_samples < self.min_new:
+                    continue
+                try:
+                    self.update()
+                except Exception as exc:       # keep the loop alive; report via stats()
+                    self.last_error = repr(exc)
+                    print(f"⚠️ {self.name}: online update failed: {exc!r}")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name=f"online-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        return {
+            "buffer_rows": self._count,
+            "capacity": self.capacity,
+            "new_samples": self.new_samples,
+            "updates": self.updates,
+            "skipped": self.skipped,
+            "last_update": self.last_update,
+            "last_error": self.last_error
+        }
+
+
+# ----------------------------------------------------
+# 🔌 SIMULATION HOOKS
+# ----------------------------------------------------
+def create_updaters(**kwargs):
+    """Updaters for the event classifier and the tsunami model."""
+    return {
+        EVENT_MODEL: OnlineUpdater(EVENT_MODEL, EVENT_FEATURES, **kwargs),
+        TSUNAMI_MODEL: OnlineUpdater(
+            TSUNAMI_MODEL, TSUNAMI_FEATURES,
+            {"fault_type_encoded": ("fault_type", FAULT_MAP)}, **kwargs
+        ),
+    }
+
+
+def scenario_labels(scenario):
+    """
+    Ground truth the simulator knows: a real quake is the engine's EVENT
+    phase, and it carries tsunami risk when it happens under the sea on a
+    reverse (uplifting) fault.
+    """
+    quake = scenario["phase"] == "EVENT"
+    tsunami = quake and scenario["ocean_depth_m"] > 50 and scenario["fault_type"] == "reverse"
+    return int(quake), int(tsunami)
+
+
+def observe_cycle(updaters, scenario, seismic):
+    quake, tsunami = scenario_labels(scenario)
+    if EVENT_MODEL in updaters:
+        updaters[EVENT_MODEL].observe(seismic, quake)
+    if TSUNAMI_MODEL in updaters:
+        updaters[TSUNAMI_MODEL].observe(scenario, tsunami)
@@ -0,0 +1,123 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def quantize(sample, precision):
+    """
+    Cache key for a sample: one entry per field in `precision`, rounded to
+    that many decimals (None keeps the value as is).
+    """
+    return tuple(
+        sample[name] if digits is None else round(sample[name], digits)
+        for name, digits in precision.items()
+    )
+
+
+def _entry_size(key, value):
+    size = sys.getsizeof(key) + sum(sys.getsizeof(k) for k in key)
+    size += sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(v) for v in value.values())
+    return size
+
+
+class PredictionCache:
+    """
+    LRU + TTL memo for one model's predictions.
+
+    Entries belong to a model version: the first lookup made with a new
+    version drops everything cached for the old one.  The cache is bounded
+    both by entry count and by an estimated memory budget; whichever limit
+    is hit first evicts the least recently used entries.
+    """
+
+    def __init__(self, maxsize=4096, ttl=None, max_bytes=4 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.version = None
+        self._entries = OrderedDict()       # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._bytes = 0
+            self.version = version
+
+    def get(self, version, key):
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, version, key, value):
+        size = _entry_size(key, value)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+        with self._lock:
+            self._check_version(version)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+            self._entries[key] = (dict(value), size, expires_at)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.maxsize or
+                (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, (_, old_size, _) = self._entries.popitem(last=False)
+                self._bytes -= old_size
+                self.evictions += 1
+
+    def get_or_compute(self, version, key, compute):
+        value = self.get(version, key)
+        if value is None:
+            value = compute()
+            self.put(version, key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,254 @@
+"""
+Pick a model family per task under a latency budget.
+
+    python select_models.py [--tasks event_classifier ...] [--budget-ms 0.2]
+                            [--batch-budget-us 50] [--repeat 300] [--publish]
+
+For every task in model_tasks.DEFAULT_TASKS (or --tasks) it trains a random forest (today's
+choice), a shallow forest, a single shallow tree, histogram gradient
+boosting and a linear baseline.  Each candidate is scored on the task's
+holdout split and timed the way it would be served: tree models through
+CompiledForest, linear models as one NumPy dot product over their
+coefficients (imputer and scaler folded in), boosting through sklearn.
+Candidates within the budget (single-row p99, and optionally per-row
+batch cost) are ranked by quality, the rest follow by quality.  The winner of each task is written
+to Models/selected/<task>.pkl next to report.json.
+
+--publish also installs winners as the live model (versioned, via the
+manifest), but only tree models: the serving path compiles forests, so a
+boosting or linear winner stays in Models/selected/.
+"""
+import argparse
+import json
+import os
+import pickle
+import time
+
+import joblib
+import numpy as np
+from sklearn.ensemble import (HistGradientBoostingClassifier, HistGradientBoostingRegressor,
+                              RandomForestClassifier, RandomForestRegressor)
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+
+from compiled_forest import CompiledForest
+from model_registry import MODEL_DIR
+from model_tasks import DATASETS, DEFAULT_TASKS, TASKS, load_dataset, score, split_task
+from train_models import manifest_lock, read_manifest, record_version, write_manifest
+
+SELECTED_DIR = os.path.join(MODEL_DIR, "selected")
+BATCH_ROWS = 1000
+
+
+# ----------------------------------------------------
+# 🧪 CANDIDATES
+# ----------------------------------------------------
+def candidates(task, multi_output=False):
+    """family -> unfitted estimator for a task."""
+    if task["kind"] == "classifier":
+        return {
+            "random_forest": RandomForestClassifier(n_estimators=task["n_estimators"], random_state=42),
+            "shallow_forest": RandomForestClassifier(n_estimators=30, max_depth=6, random_state=42),
+            "decision_tree": DecisionTreeClassifier(max_depth=6, random_state=42),
+            "hist_gradient_boosting": HistGradientBoostingClassifier(max_iter=100, random_state=42),
+            "logistic": make_pipeline(SimpleImputer(), StandardScaler(),
+                                      LogisticRegression(max_iter=1000)),
+        }
+    families = {
+        "random_forest": RandomForestRegressor(n_estimators=task["n_estimators"], random_state=42),
+        "shallow_forest": RandomForestRegressor(n_estimators=30, max_depth=8, random_state=42),
+        "decision_tree": DecisionTreeRegressor(max_depth=8, random_state=42),
+        "hist_gradient_boosting": HistGradientBoostingRegressor(max_iter=100, random_state=42),
+        "ridge": make_pipeline(SimpleImputer(), StandardScaler(), Ridge()),
+    }
+    if multi_output:
+        del families["hist_gradient_boosting"]     # single target only
+    return families
+
+
+def is_tree_model(model):
+    return isinstance(model, (RandomForestClassifier, RandomForestRegressor,
+                              DecisionTreeClassifier, DecisionTreeRegressor))
+
+
+def linear_fn(model, kind):
+    """
+    An imputer -> scaler -> linear pipeline as plain array code: fill NaNs
+    with the imputer means, then one dot product with the coefficients the
+    scaler has been folded into.  Same outputs as the pipeline without
+    sklearn's per-call validation, which costs more than the model itself.
+    """
+    imputer, scaler, linear = (step for _, step in model.steps)
+    fill = imputer.statistics_
+    coef = np.atleast_2d(linear.coef_) / scaler.scale_
+    intercept = np.atleast_1d(linear.intercept_) - coef @ scaler.mean_
+    squeeze = np.ndim(linear.coef_) == 1
+
+    def decision(X):
+        X = np.where(np.isnan(X), fill, X)
+        return X @ coef.T + intercept
+
+    if kind != "classifier":
+        return (lambda X: decision(X)[:, 0]) if squeeze else decision
+
+    def predict_proba(X):
+        z = decision(X)
+        if z.shape[1] == 1:
+            p = 1 / (1 + np.exp(-z[:, 0]))
+            return np.column_stack([1 - p, p])
+        z = np.exp(z - z.max(axis=1, keepdims=True))
+        return z / z.sum(axis=1, keepdims=True)
+
+    return predict_proba
+
+
+def is_linear_pipeline(model):
+    return (hasattr(model, "steps") and len(model.steps) == 3
+            and isinstance(model.steps[-1][1], (LogisticRegression, Ridge))
+            and not np.isnan(model.steps[0][1].statistics_).any())
+
+
+def serving_fn(model, kind):
+    """The call inference would make, and which engine runs it."""
+    if is_tree_model(model):
+        forest = CompiledForest.from_sklearn(model)
+        return (forest.predict_proba if kind == "classifier" else forest.predict), "compiled"
+    if is_linear_pipeline(model):
+        return linear_fn(model, kind), "numpy"
+    return (model.predict_proba if kind == "classifier" else model.predict), "sklearn"
+
+
+# ----------------------------------------------------
+# ⏱️ MEASUREMENT
+# ----------------------------------------------------
+def single_row_ms(fn, X, repeat):
+    samples = []
+    for i in range(repeat):
+        row = X[i % len(X)][None, :]
+        t = time.perf_counter()
+        fn(row)
+        samples.append(time.perf_counter() - t)
+    return np.percentile(samples, 50) * 1e3, np.percentile(samples, 99) * 1e3
+
+
+def batch_row_us(fn, X, repeat=3):
+    rows = np.resize(X, (BATCH_ROWS, X.shape[1]))
+    best = np.inf
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - t)
+    return best / BATCH_ROWS * 1e6
+
+
+def evaluate_task(name, df, repeat):
+    task = TASKS[name]
+    X_train, X_test, y_train, y_test = split_task(name, df)
+    X_train, X_test = X_train.to_numpy(), X_test.to_numpy()
+
+    rows = []
+    for family, model in candidates(task, multi_output=np.ndim(y_train) > 1).items():
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_s = time.perf_counter() - start
+
+        metric, value = score(task["kind"], y_test, model.predict(X_test))
+        fn, engine = serving_fn(model, task["kind"])
+        p50, p99 = single_row_ms(fn, X_test, repeat)
+        rows.append({
+            "family": family,
+            "model": model,
+            "engine": engine,
+            "metric": metric,
+            "value": round(value, 4),
+            "p50_ms": round(float(p50), 4),
+            "p99_ms": round(float(p99), 4),
+            "batch_us_per_row": round(float(batch_row_us(fn, X_test)), 3),
+            "size_kb": round(len(pickle.dumps(model)) / 1024, 1),
+            "fit_s": round(fit_s, 2),
+        })
+    return rows
+
+
+def rank(rows, budget_ms, batch_budget_us=None):
+    """Within-budget candidates first, each group best quality first, then fastest."""
+    for row in rows:
+        row["within_budget"] = row["p99_ms"] <= budget_ms and (
+            batch_budget_us is None or row["batch_us_per_row"] <= batch_budget_us
+        )
+    quality = lambda row: row["value"] if row["metric"] == "mae" else -row["value"]
+    return sorted(rows, key=lambda row: (not row["within_budget"], quality(row), row["p99_ms"]))
+
+
+# ----------------------------------------------------
+# 📋 REPORT
+# ----------------------------------------------------
+def print_ranking(name, ranked):
+    header = (f"  {'#':<3}{'family':<24}{'engine':<10}{'metric':>9}{'score':>9}"
+              f"{'p50 ms':>9}{'p99 ms':>9}{'batch us/row':>14}{'size KB':>10}{'budget':>8}")
+    print(f"\n{name}")
+    print(header)
+    print("  " + "-" * (len(header) - 2))
+    for i, row in enumerate(ranked, 1):
+        print(f"  {i:<3}{row['family']:<24}{row['engine']:<10}{row['metric']:>9}{row['value']:>9.4f}"
+              f"{row['p50_ms']:>9.3f}{row['p99_ms']:>9.3f}{row['batch_us_per_row']:>14.2f}"
+              f"{row['size_kb']:>10.1f}{'ok' if row['within_budget'] else '-':>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", nargs="+", default=DEFAULT_TASKS, choices=list(TASKS))
+    parser.add_argument("--earthquake", default=DATASETS["earthquake"])
+    parser.add_argument("--tsunami", default=DATASETS["tsunami"])
+    parser.add_argument("--budget-ms", type=float, default=0.2, help="single-row p99 budget")
+    parser.add_argument("--batch-budget-us", type=float, default=None, help="per-row batch budget")
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--out", default=SELECTED_DIR)
+    parser.add_argument("--publish", action="store_true")
+    args = parser.parse_args()
+
+    paths = {"earthquake": args.earthquake, "tsunami": args.tsunami}
+    frames = {}
+    os.makedirs(args.out, exist_ok=True)
+
+    report = {"budget_ms": args.budget_ms, "batch_budget_us": args.batch_budget_us, "tasks": {}}
+    for name in args.tasks:
+        dataset = TASKS[name]["dataset"]
+        if dataset not in frames:
+            frames[dataset] = load_dataset(paths[dataset])
+
+        ranked = rank(evaluate_task(name, frames[dataset], args.repeat),
+                      args.budget_ms, args.batch_budget_us)
+        print_ranking(name, ranked)
+
+        winner = ranked[0]
+        artifact = os.path.join(args.out, f"{name}.pkl")
+        joblib.dump(winner["model"], artifact)
+        print(f"  🏆 {winner['family']} -> {artifact}")
+
+        if args.publish:
+            if is_tree_model(winner["model"]):
+                with manifest_lock():
+                    manifest = read_manifest()
+                    version = record_version(manifest, name, winner["model"], source="select_models",
+                                             family=winner["family"], metric=winner["metric"],
+                                             value=winner["value"])
+                    write_manifest(manifest)
+                print(f"  📦 published as {name} v{version}")
+            else:
+                print(f"  ⚠️ {winner['family']} is not a tree model; not published")
+
+        report["tasks"][name] = {
+            "winner": winner["family"],
+            "ranking": [{k: v for k, v in row.items() if k != "model"} for row in ranked]
+        }
+
+    with open(os.path.join(args.out, "report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
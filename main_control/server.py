@@ -1,11 +1,29 @@
 from flask import Flask, jsonify, render_template
 from flask_cors import CORS
-from event_stream_with_models import EVENT_STREAM, simulation_loop
+from event_stream_with_models import EVENT_STREAM, simulation_loop, simulation_state
+from model_registry import registry
+from landslide_hazard_map import LandslideHazardMap
+from simengine import engine
+import cascade
+import landslide_predictor
+import tsunami_evaluator
 import threading
+import os
 
 app = Flask(__name__, template_folder="templates")
 CORS(app)
 
+hazard_map = None
+hazard_lock = threading.Lock()
+
+# INFERENCE_WORKERS=N moves simulation inference into N worker processes;
+# INFERENCE_SOCKET=path sends it to a running inference_daemon.py instead
+inference_pool = None
+inference_client = None
+
+# ONLINE_UPDATES=1 keeps growing the event / tsunami forests from the stream
+updaters = {}
+
 @app.route("/")
 def home():
     return render_template("map.html")
@@ -14,6 +32,92 @@ def home():
 def events():
     return jsonify(EVENT_STREAM[-50:])
 
+@app.route("/simulation")
+def simulation():
+    # seed + step are enough to replay this run (event_stream_with_models.replay)
+    return jsonify(simulation_state)
+
+@app.route("/models")
+def models():
+    return jsonify({
+        "loaded": registry.loaded(),
+        "timings_ms": registry.timings()
+    })
+
+@app.route("/cache")
+def cache():
+    # None when the cache was not enabled for that predictor
+    return jsonify({
+        "tsunami": tsunami_evaluator.cache_stats(),
+        "landslide": landslide_predictor.cache_stats()
+    })
+
+@app.route("/inference")
+def inference():
+    if inference_client is not None:
+        return jsonify({"backend": "daemon", **inference_client.stats()})
+    if inference_pool is None:
+        return jsonify({"backend": "inline"})
+    return jsonify({"backend": "process_pool", **inference_pool.stats()})
+
+@app.route("/cascade")
+def cascades():
+    # Per-stage pass / short-circuit counts of the rule gates
+    return jsonify(cascade.stats())
+
+@app.route("/online")
+def online():
+    return jsonify({name: u.stats() for name, u in updaters.items()})
+
+@app.route("/hazard")
+def hazard():
+    # Only tiles whose rainfall bucket moved since the last call get re-scored
+    # (one request at a time: the map and its worker pool are shared)
+    global hazard_map
+    with hazard_lock:
+        if hazard_map is None:
+            hazard_map = LandslideHazardMap()
+        hazard_map.update_rainfall(engine.rainfall_mm)
+        hazard_map.set_ground_vibration(engine.ground_vibration)
+        hazard_map.refresh()
+        return jsonify(hazard_map.snapshot(n=20))
+
 if __name__ == "__main__":
-    threading.Thread(target=simulation_loop, daemon=True).start()
+    workers = int(os.environ.get("INFERENCE_WORKERS", "0"))
+    if os.environ.get("INFERENCE_SOCKET"):
+        from inference_client import InferenceClient
+        inference_client = InferenceClient(os.environ["INFERENCE_SOCKET"], timeout=5)
+    elif workers > 0:
+        from event_stream_with_models import BACKEND_TIMEOUT
+        from inference_pool import InferencePool
+        # A cycle submits up to three tasks; a saturated pool must not hold
+        # it past BACKEND_TIMEOUT before run_cycle falls back to inline
+        inference_pool = InferencePool(workers=workers, max_pending=4 * workers,
+                                       submit_timeout=BACKEND_TIMEOUT / 3)
+
+    if os.environ.get("ONLINE_UPDATES") == "1":
+        from online_updates import create_updaters
+        updaters = create_updaters(max_trees=300)
+        for updater in updaters.values():
+            updater.start()
+
+    # SIM_SEED=<int> makes the run reproducible; otherwise a fresh seed is logged
+    # SIM_CHECKPOINT=1 (or =<path>) snapshots the simulation periodically and
+    # resumes from that file on startup if it holds this seed's run, so the
+    # simulation survives restarts (sim_checkpoint.py)
+    checkpoint = os.environ.get("SIM_CHECKPOINT") or None
+    if checkpoint == "1":
+        from sim_checkpoint import CHECKPOINT_PATH
+        checkpoint = CHECKPOINT_PATH
+    seed = int(os.environ["SIM_SEED"]) if os.environ.get("SIM_SEED") else None
+
+    # SIM_CLOCK=virtual runs the loop flat out on simulated time (soak tests)
+    sim_clock = None
+    if os.environ.get("SIM_CLOCK") == "virtual":
+        from sim_clock import VirtualClock
+        sim_clock = VirtualClock()
+
+    registry.start_watching()
+    threading.Thread(target=simulation_loop, args=(inference_client or inference_pool, updaters, seed, sim_clock),
+                     kwargs={"checkpoint": checkpoint}, daemon=True).start()
     app.run(port=5500, debug=False)
@@ -0,0 +1,155 @@
+"""
+Export the forests in Models/ into one memory-mappable bundle.
+
+    python shared_forests.py [--models event_classifier ...] [--out Models/forests.bundle]
+
+Every process that opens the bundle maps the same file read-only, so the
+node arrays live once in the page cache instead of once per process
+(unpickling gives every worker a private copy).  Put the bundle on
+/dev/shm to keep it in shared memory without touching disk.  The
+registry uses it when MODEL_BUNDLE points at the file.
+"""
+import argparse
+import json
+import os
+import struct
+
+import numpy as np
+
+from compiled_forest import CompiledForest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BUNDLE_PATH = os.path.join(BASE_DIR, "Models", "forests.bundle")
+
+MAGIC = b"FORESTB1"
+ALIGN = 64
+
+# Arrays stored per forest; left/right are strided views into children
+BUNDLE_ARRAYS = ("feature", "threshold", "missing_left", "value", "roots", "children", "child_base")
+
+DEFAULT_MODELS = [
+    "event_classifier",
+    "earthquake_magnitude",
+    "earthquake_depth",
+    "earthquake_epicenter",
+    "tsunami_model",
+    "landslide_model"
+]
+
+
+def _aligned(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+# ----------------------------------------------------
+# EXPORT
+# ----------------------------------------------------
+def export_bundle(forests, path=BUNDLE_PATH):
+    """
+    forests: name -> CompiledForest.  Layout: magic, header length, JSON
+    header, then every array 64-byte aligned.  Written to a temp file and
+    renamed, so processes that still map the old bundle keep a valid view.
+    """
+    header, blobs, offset = {}, [], 0
+    for name, forest in forests.items():
+        arrays = {
+            "feature": forest.feature,
+            "threshold": forest.threshold,
+            "missing_left": forest.missing_left,
+            "value": forest.value,
+            "roots": forest.roots,
+            "children": forest.children,
+            "child_base": forest._child_base,
+        }
+        if forest.is_classifier:
+            arrays["classes"] = forest.classes_
+
+        entry = {"max_depth": int(forest.max_depth), "n_features": int(forest.n_features), "arrays": {}}
+        for key, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            offset = _aligned(offset)
+            entry["arrays"][key] = [offset, arr.dtype.str, list(arr.shape)]
+            blobs.append((offset, arr))
+            offset += arr.nbytes
+        header[name] = entry
+
+    raw = json.dumps(header).encode()
+    data_start = _aligned(len(MAGIC) + 8 + len(raw))
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(raw)) + raw)
+        for rel, arr in blobs:
+            f.seek(data_start + rel)
+            f.write(arr.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+# ----------------------------------------------------
+# OPEN
+# ----------------------------------------------------
+def read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a forest bundle")
+        (size,) = struct.unpack("<Q", f.read(8))
+        return json.loads(f.read(size)), _aligned(len(MAGIC) + 8 + size)
+
+
+def bundle_names(path):
+    return list(read_header(path)[0])
+
+
+def open_bundle(path=BUNDLE_PATH, names=None):
+    """
+    name -> CompiledForest whose arrays are read-only views of one shared
+    mapping of the file.  Nothing is copied; pages are faulted in on use.
+    """
+    header, data_start = read_header(path)
+    mapped = np.memmap(path, mode="r", dtype=np.uint8)
+
+    forests = {}
+    for name, entry in header.items():
+        if names is not None and name not in names:
+            continue
+        arrays = {
+            key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=mapped, offset=data_start + offset)
+            for key, (offset, dtype, shape) in entry["arrays"].items()
+        }
+        children = arrays["children"]
+        forests[name] = CompiledForest(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            left=children[0::2],
+            right=children[1::2],
+            missing_left=arrays["missing_left"],
+            value=arrays["value"],
+            roots=arrays["roots"],
+            max_depth=entry["max_depth"],
+            n_features=entry["n_features"],
+            classes=arrays.get("classes"),
+            children=children,
+            child_base=arrays["child_base"],
+        )
+    return forests
+
+
+def main():
+    from model_registry import registry
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models", nargs="+", default=DEFAULT_MODELS)
+    parser.add_argument("--out", default=BUNDLE_PATH)
+    args = parser.parse_args()
+
+    # Configured compact variants (MODEL_VARIANTS) are exported as such
+    forests = {name: registry.compiled(name) for name in args.models}
+    export_bundle(forests, args.out)
+    print(f"✅ {len(forests)} forests -> {args.out} ({os.path.getsize(args.out) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
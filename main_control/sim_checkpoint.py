@@ -0,0 +1,142 @@
+"""
+Compact binary snapshots of the running simulation.
+
+A checkpoint holds the module engine's full state (phase, stress,
+geography, terrain, step count and its random.Random), the placement
+random stream, and the loop's counters (seed, step, cycles_without, clock
+time): about 5 KB of fixed-layout struct records, no pickle.
+
+Layout: magic, then the records below, then a CRC32 of everything
+before it.  Files are written to a temp file, fsynced and renamed, so a
+crash mid-write leaves the previous checkpoint in place, and a torn or
+foreign file fails the magic/CRC check instead of restoring garbage.
+"""
+import os
+import struct
+import zlib
+
+from simengine import PHASES, ZONES
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Default file; server.py checkpoints only when SIM_CHECKPOINT is set
+CHECKPOINT_PATH = os.path.join(BASE_DIR, "simulation.ckpt")
+CHECKPOINT_SECONDS = 30
+
+MAGIC = b"SIMCKPT1"
+
+# seeds are SeedSequence entropy: up to 128 bits
+SEED_BYTES = 16
+
+ENGINE = struct.Struct("<16sQddBBddddddBdB")
+# random.Random.getstate(): 624 Mersenne Twister words + position, gauss_next
+RNG = struct.Struct("<625I?d")
+LOOP = struct.Struct("<16sQIId")
+CRC = struct.Struct("<I")
+
+SIZE = len(MAGIC) + ENGINE.size + 2 * RNG.size + LOOP.size + CRC.size
+
+
+def _seed_bytes(seed):
+    return int(seed).to_bytes(SEED_BYTES, "little")
+
+
+def _seed(raw):
+    return int.from_bytes(raw, "little")
+
+
+def _pack_rng(rng):
+    version, words, gauss = rng.getstate()
+    return RNG.pack(*words, gauss is not None, gauss or 0.0)
+
+
+def _unpack_rng(raw):
+    values = RNG.unpack(raw)
+    return (3, tuple(values[:625]), values[626] if values[625] else None)
+
+
+# ----------------------------------------------------
+# 💾 WRITE
+# ----------------------------------------------------
+def write_checkpoint(path, engine, rng, loop):
+    """
+    Snapshot `engine` (a SimulationEngine), the placement `rng` and
+    `loop` = {"seed", "step", "cycles_without": {"tsunami", "landslide"},
+    "clock"} to path, atomically.
+    """
+    body = MAGIC + ENGINE.pack(
+        _seed_bytes(engine.seed), engine.steps,
+        engine.tectonic_stress, engine.strain_rate,
+        PHASES.index(engine.system_phase), ZONES.index(engine.zone_type),
+        engine.ocean_depth_m, engine.distance_to_coast_km,
+        engine.rainfall_mm, engine.soil_moisture, engine.slope_angle_deg, engine.vegetation_index,
+        engine.soil_type, engine.ground_vibration, engine.post_quake_instability,
+    ) + _pack_rng(engine.rng) + _pack_rng(rng) + LOOP.pack(
+        _seed_bytes(loop["seed"]), loop["step"],
+        loop["cycles_without"]["tsunami"], loop["cycles_without"]["landslide"],
+        loop["clock"] or 0.0,
+    )
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(body + CRC.pack(zlib.crc32(body)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+# ----------------------------------------------------
+# 📂 READ
+# ----------------------------------------------------
+def read_checkpoint(path):
+    """
+    Parse a checkpoint into {"engine": {attribute: value}, "engine_rng",
+    "rng" (random.Random states) and "loop"}.  Raises ValueError if the
+    file is not an intact checkpoint.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) != SIZE or not raw.startswith(MAGIC):
+        raise ValueError(f"{path} is not a simulation checkpoint")
+    body, (crc,) = raw[:-CRC.size], CRC.unpack(raw[-CRC.size:])
+    if zlib.crc32(body) != crc:
+        raise ValueError(f"{path} is corrupt (CRC mismatch)")
+
+    offset = len(MAGIC)
+    (seed, steps, stress, strain, phase, zone, ocean, coast,
+     rain, moisture, slope, vegetation, soil, vibration, instability) = ENGINE.unpack_from(body, offset)
+    offset += ENGINE.size
+    engine_rng = _unpack_rng(body[offset:offset + RNG.size])
+    offset += RNG.size
+    rng = _unpack_rng(body[offset:offset + RNG.size])
+    offset += RNG.size
+    loop_seed, step, tsunami_gap, landslide_gap, clock = LOOP.unpack_from(body, offset)
+
+    return {
+        "engine": {
+            "seed": _seed(seed),
+            "steps": steps,
+            "tectonic_stress": stress,
+            "strain_rate": strain,
+            "system_phase": PHASES[phase],
+            "zone_type": ZONES[zone],
+            "ocean_depth_m": ocean,
+            "distance_to_coast_km": coast,
+            "rainfall_mm": rain,
+            "soil_moisture": moisture,
+            "slope_angle_deg": slope,
+            "vegetation_index": vegetation,
+            "soil_type": soil,
+            "ground_vibration": vibration,
+            "post_quake_instability": instability,
+        },
+        "engine_rng": engine_rng,
+        "rng": rng,
+        "loop": {
+            "seed": _seed(loop_seed),
+            "step": step,
+            "cycles_without": {"tsunami": tsunami_gap, "landslide": landslide_gap},
+            "clock": clock,
+        },
+    }
@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class RealClock:
+    """Wall-clock time; sleep() really waits."""
+
+    def now(self):
+        return time.time()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class VirtualClock:
+    """
+    Simulated time for accelerated runs.  now() starts at `start` (the
+    current wall-clock time by default) and only moves when sleep() is
+    called, which returns immediately after advancing it.  A loop paced by
+    sleep(5) therefore covers a day of simulated time in 17,280 steps,
+    as fast as the steps themselves run.
+    """
+
+    def __init__(self, start=None):
+        self._now = time.time() if start is None else float(start)
+        self._lock = threading.Lock()
+
+    def now(self):
+        with self._lock:
+            return self._now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self._now += seconds
+
+    def set(self, now):
+        """Jump to `now`, e.g. the time saved in a checkpoint."""
+        with self._lock:
+            self._now = float(now)
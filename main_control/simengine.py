@@ -1,22 +1,54 @@
 import random
 
+import numpy as np
+
+
+def new_seed():
+    """Fresh OS entropy as a plain int, so an unseeded run can still be recorded."""
+    return np.random.SeedSequence().entropy
+
+
+def spawn_seeds(seed, n):
+    """
+    n child seeds (plain ints) for independent parallel streams.  The same
+    parent seed always spawns the same children.
+    """
+    children = np.random.SeedSequence(seed).spawn(n)
+    return [int.from_bytes(child.generate_state(4).tobytes(), "little") for child in children]
+
+
 class SimulationEngine:
-    def __init__(self):
+    """
+    One simulated world.  All randomness comes from the engine's own
+    random.Random, seeded from `seed` (fresh entropy when None, recorded in
+    self.seed), so an engine rebuilt from the same seed and stepped the same
+    number of times is in the same state: see replay().
+    """
+
+    def __init__(self, seed=None):
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Start over from `seed`, in place (the module engine stays the same object)."""
+        self.seed = new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.steps = 0
+
         # ---------------- CORE STATE ----------------
-        self.tectonic_stress = random.uniform(45, 60)
-        self.strain_rate = random.uniform(3.5, 6.0)
+        self.tectonic_stress = self.rng.uniform(45, 60)
+        self.strain_rate = self.rng.uniform(3.5, 6.0)
         self.system_phase = "BUILDUP"
 
         # ---------------- ZONE ----------------
-        self.zone_type = random.choice(["OFFSHORE", "COASTAL", "INLAND"])
+        self.zone_type = self.rng.choice(["OFFSHORE", "COASTAL", "INLAND"])
         self.set_geography()
 
         # ---------------- TERRAIN ----------------
-        self.rainfall_mm = random.uniform(20, 80)
-        self.soil_moisture = random.uniform(0.35, 0.65)
-        self.slope_angle_deg = random.uniform(15, 40)
-        self.vegetation_index = random.uniform(0.3, 0.8)
-        self.soil_type = random.randint(0, 3)
+        self.rainfall_mm = self.rng.uniform(20, 80)
+        self.soil_moisture = self.rng.uniform(0.35, 0.65)
+        self.slope_angle_deg = self.rng.uniform(15, 40)
+        self.vegetation_index = self.rng.uniform(0.3, 0.8)
+        self.soil_type = self.rng.randint(0, 3)
 
         # ---------------- DYNAMICS ----------------
         self.ground_vibration = 0
@@ -27,16 +59,16 @@ class SimulationEngine:
     # ------------------------------------------------
     def set_geography(self):
         if self.zone_type == "OFFSHORE":
-            self.ocean_depth_m = random.uniform(2000, 5000)
-            self.distance_to_coast_km = random.uniform(80, 350)
+            self.ocean_depth_m = self.rng.uniform(2000, 5000)
+            self.distance_to_coast_km = self.rng.uniform(80, 350)
 
         elif self.zone_type == "COASTAL":
-            self.ocean_depth_m = random.uniform(50, 500)
-            self.distance_to_coast_km = random.uniform(5, 60)
+            self.ocean_depth_m = self.rng.uniform(50, 500)
+            self.distance_to_coast_km = self.rng.uniform(5, 60)
 
         else:  # INLAND
             self.ocean_depth_m = 0
-            self.distance_to_coast_km = random.uniform(120, 900)
+            self.distance_to_coast_km = self.rng.uniform(120, 900)
 
     # ------------------------------------------------
     # 🔁 PHASE CONTROL
@@ -56,34 +88,34 @@ class SimulationEngine:
     # ------------------------------------------------
     def evolve_tectonics(self):
         if self.system_phase == "BUILDUP":
-            self.tectonic_stress += self.strain_rate * random.uniform(1.0, 1.4)
+            self.tectonic_stress += self.strain_rate * self.rng.uniform(1.0, 1.4)
 
         elif self.system_phase == "EVENT":
-            self.tectonic_stress *= random.uniform(0.25, 0.4)
-            self.ground_vibration = random.uniform(0.8, 1.4)
-            self.post_quake_instability = random.randint(4, 7)
+            self.tectonic_stress *= self.rng.uniform(0.25, 0.4)
+            self.ground_vibration = self.rng.uniform(0.8, 1.4)
+            self.post_quake_instability = self.rng.randint(4, 7)
 
             # Zone migration (plate boundary shift)
-            if random.random() < 0.2:
-                self.zone_type = random.choice(["OFFSHORE", "COASTAL", "INLAND"])
+            if self.rng.random() < 0.2:
+                self.zone_type = self.rng.choice(["OFFSHORE", "COASTAL", "INLAND"])
                 self.set_geography()
 
         else:  # RECOVERY
-            self.tectonic_stress *= random.uniform(0.85, 0.93)
+            self.tectonic_stress *= self.rng.uniform(0.85, 0.93)
             self.ground_vibration *= 0.6
 
     # ------------------------------------------------
     # 🌧️ TERRAIN EVOLUTION
     # ------------------------------------------------
     def evolve_terrain(self):
-        self.rainfall_mm = max(0, min(self.rainfall_mm + random.uniform(-10, 15), 300))
-        self.soil_moisture += self.rainfall_mm / 850 + random.uniform(-0.04, 0.04)
+        self.rainfall_mm = max(0, min(self.rainfall_mm + self.rng.uniform(-10, 15), 300))
+        self.soil_moisture += self.rainfall_mm / 850 + self.rng.uniform(-0.04, 0.04)
 
         if self.post_quake_instability > 0:
             self.post_quake_instability -= 1
-            self.soil_moisture += random.uniform(0.06, 0.12)
-            self.slope_angle_deg += random.uniform(1.2, 2.5)
-            self.ground_vibration = max(self.ground_vibration, random.uniform(0.5, 1.0))
+            self.soil_moisture += self.rng.uniform(0.06, 0.12)
+            self.slope_angle_deg += self.rng.uniform(1.2, 2.5)
+            self.ground_vibration = max(self.ground_vibration, self.rng.uniform(0.5, 1.0))
 
         self.soil_moisture = min(self.soil_moisture, 1.0)
         self.slope_angle_deg = min(self.slope_angle_deg, 55)
@@ -94,29 +126,29 @@ class SimulationEngine:
     def build_scenario(self):
         # --- Magnitude ---
         if self.system_phase == "EVENT":
-            if random.random() < 0.15:
-                magnitude = random.uniform(7.8, 9.2)   # mega event
+            if self.rng.random() < 0.15:
+                magnitude = self.rng.uniform(7.8, 9.2)   # mega event
             else:
-                magnitude = random.uniform(6.8, 7.8)
+                magnitude = self.rng.uniform(6.8, 7.8)
         else:
-            magnitude = random.uniform(4.8, 6.6)
+            magnitude = self.rng.uniform(4.8, 6.6)
 
         # --- Depth ---
-        depth_km = random.uniform(5, 45)
+        depth_km = self.rng.uniform(5, 45)
 
         # --- Fault mechanics ---
-        if self.zone_type in ["OFFSHORE", "COASTAL"] and random.random() < 0.6:
-            fault_type = random.choice(["reverse", "normal"])
+        if self.zone_type in ["OFFSHORE", "COASTAL"] and self.rng.random() < 0.6:
+            fault_type = self.rng.choice(["reverse", "normal"])
         else:
-            fault_type = random.choice(["normal", "strike-slip"])
+            fault_type = self.rng.choice(["normal", "strike-slip"])
 
         # --- Vertical displacement ---
         if fault_type == "reverse":
-            vertical_displacement = random.uniform(0.8, 6.0)
+            vertical_displacement = self.rng.uniform(0.8, 6.0)
         elif fault_type == "normal":
-            vertical_displacement = random.uniform(0.3, 2.0)
+            vertical_displacement = self.rng.uniform(0.3, 2.0)
         else:
-            vertical_displacement = random.uniform(0.05, 0.6)
+            vertical_displacement = self.rng.uniform(0.05, 0.6)
 
         return {
             "magnitude": round(magnitude, 2),
@@ -141,8 +173,24 @@ class SimulationEngine:
         self.evolve_tectonics()
         self.evolve_terrain()
         self.update_phase()
+        self.steps += 1
         return self.build_scenario()
 
+    # ------------------------------------------------
+    # 🎲 SEEDS
+    # ------------------------------------------------
+    def spawn(self, n):
+        """n engines on independent streams derived from this engine's seed."""
+        return [SimulationEngine(child) for child in spawn_seeds(self.seed, n)]
+
+    @classmethod
+    def replay(cls, seed, steps):
+        """The engine a run seeded with `seed` had after `steps` steps."""
+        engine = cls(seed)
+        for _ in range(steps):
+            engine.get_next_state()
+        return engine
+
 
 # ----------------------------------------------------
 # 🔌 ENGINE ACCESS
@@ -151,3 +199,207 @@ engine = SimulationEngine()
 
 def generate_scenario():
     return engine.get_next_state()
+
+
+# ----------------------------------------------------
+# 🧮 ENSEMBLE
+# ----------------------------------------------------
+# Categorical state as int8 codes.  FAULT_TYPES follows the tsunami
+# model's fault_type_encoded, so scenarios can be scored without mapping.
+PHASES = ("BUILDUP", "EVENT", "RECOVERY")
+ZONES = ("OFFSHORE", "COASTAL", "INLAND")
+FAULT_TYPES = ("normal", "strike-slip", "reverse")
+
+BUILDUP, EVENT, RECOVERY = range(3)
+OFFSHORE, COASTAL, INLAND = range(3)
+NORMAL, STRIKE_SLIP, REVERSE = range(3)
+
+# (low, high) per zone code, as in SimulationEngine.set_geography
+OCEAN_DEPTH_RANGE = np.array([(2000, 5000), (50, 500), (0, 0)], dtype=np.float64)
+COAST_DISTANCE_RANGE = np.array([(80, 350), (5, 60), (120, 900)], dtype=np.float64)
+
+# (low, high) per fault code, as in SimulationEngine.build_scenario
+DISPLACEMENT_RANGE = np.array([(0.3, 2.0), (0.05, 0.6), (0.8, 6.0)], dtype=np.float64)
+
+SCENARIO_DTYPE = np.dtype([
+    ("magnitude", np.float64),
+    ("depth_km", np.float64),
+    ("ocean_depth_m", np.float64),
+    ("fault_type", np.int8),                # code into FAULT_TYPES
+    ("vertical_displacement_m", np.float64),
+    ("distance_to_coast_km", np.float64),
+    ("rainfall_mm", np.float64),
+    ("soil_moisture", np.float64),
+    ("slope_angle_deg", np.float64),
+    ("vegetation_index", np.float64),
+    ("soil_type", np.int8),
+    ("ground_vibration", np.float64),
+    ("phase", np.int8),                     # code into PHASES
+])
+
+
+def _uniform(u, low, high):
+    return low + (high - low) * u
+
+
+class EnsembleEngine:
+    """
+    N SimulationEngine worlds held as NumPy arrays, on one seeded generator.
+
+    Each step draws one block of uniforms for every world and applies the
+    scalar engine's branches as masks: evolve_tectonics, evolve_terrain
+    and update_phase have the same transitions and ranges, only
+    vectorized.  build_scenario() returns one SCENARIO_DTYPE record per
+    world, with categoricals as codes (scenario_dicts() decodes them).
+    """
+
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.seed = new_seed() if seed is None else seed
+        self.rng = np.random.default_rng(self.seed)
+        self.steps = 0
+        rng = self.rng
+
+        # ---------------- CORE STATE ----------------
+        self.tectonic_stress = rng.uniform(45, 60, n)
+        self.strain_rate = rng.uniform(3.5, 6.0, n)
+        self.phase = np.full(n, BUILDUP, dtype=np.int8)
+
+        # ---------------- ZONE ----------------
+        self.zone = rng.integers(0, 3, n).astype(np.int8)
+        self.ocean_depth_m = np.empty(n)
+        self.distance_to_coast_km = np.empty(n)
+        self.set_geography(np.ones(n, dtype=bool))
+
+        # ---------------- TERRAIN ----------------
+        self.rainfall_mm = rng.uniform(20, 80, n)
+        self.soil_moisture = rng.uniform(0.35, 0.65, n)
+        self.slope_angle_deg = rng.uniform(15, 40, n)
+        self.vegetation_index = rng.uniform(0.3, 0.8, n)
+        self.soil_type = rng.integers(0, 4, n).astype(np.int8)
+
+        # ---------------- DYNAMICS ----------------
+        self.ground_vibration = np.zeros(n)
+        self.post_quake_instability = np.zeros(n, dtype=np.int8)
+
+    def set_geography(self, mask):
+        """Re-draw ocean depth / coast distance for the worlds in mask."""
+        u = self.rng.random((2, self.n))
+        zone = self.zone
+        ocean = _uniform(u[0], OCEAN_DEPTH_RANGE[zone, 0], OCEAN_DEPTH_RANGE[zone, 1])
+        coast = _uniform(u[1], COAST_DISTANCE_RANGE[zone, 0], COAST_DISTANCE_RANGE[zone, 1])
+        np.copyto(self.ocean_depth_m, ocean, where=mask)
+        np.copyto(self.distance_to_coast_km, coast, where=mask)
+
+    def update_phase(self):
+        phase = self.phase
+        new = phase.copy()
+        new[(phase == BUILDUP) & (self.tectonic_stress > 55)] = EVENT
+        new[phase == EVENT] = RECOVERY
+        new[(phase == RECOVERY) & (self.tectonic_stress < 38)] = BUILDUP
+        self.phase = new
+
+    def evolve_tectonics(self):
+        u = self.rng.random((5, self.n))
+        buildup = self.phase == BUILDUP
+        event = self.phase == EVENT
+
+        self.tectonic_stress = np.where(
+            buildup, self.tectonic_stress + self.strain_rate * _uniform(u[0], 1.0, 1.4),
+            self.tectonic_stress * np.where(event, _uniform(u[0], 0.25, 0.4),
+                                            _uniform(u[0], 0.85, 0.93))
+        )
+        self.ground_vibration = np.where(
+            event, _uniform(u[1], 0.8, 1.4),
+            np.where(buildup, self.ground_vibration, self.ground_vibration * 0.6)
+        )
+        self.post_quake_instability = np.where(
+            event, 4 + (u[2] * 4).astype(np.int8), self.post_quake_instability
+        ).astype(np.int8)
+
+        # Zone migration (plate boundary shift)
+        migrate = event & (u[3] < 0.2)
+        if migrate.any():
+            self.zone = np.where(migrate, (u[4] * 3).astype(np.int8), self.zone).astype(np.int8)
+            self.set_geography(migrate)
+
+    def evolve_terrain(self):
+        u = self.rng.random((5, self.n))
+        self.rainfall_mm = np.clip(self.rainfall_mm + _uniform(u[0], -10, 15), 0, 300)
+        self.soil_moisture = self.soil_moisture + self.rainfall_mm / 850 + _uniform(u[1], -0.04, 0.04)
+
+        unstable = self.post_quake_instability > 0
+        self.post_quake_instability = self.post_quake_instability - unstable.astype(np.int8)
+        self.soil_moisture += np.where(unstable, _uniform(u[2], 0.06, 0.12), 0.0)
+        self.slope_angle_deg = self.slope_angle_deg + np.where(unstable, _uniform(u[3], 1.2, 2.5), 0.0)
+        self.ground_vibration = np.where(
+            unstable, np.maximum(self.ground_vibration, _uniform(u[4], 0.5, 1.0)), self.ground_vibration
+        )
+
+        np.minimum(self.soil_moisture, 1.0, out=self.soil_moisture)
+        np.minimum(self.slope_angle_deg, 55, out=self.slope_angle_deg)
+
+    def build_scenario(self):
+        u = self.rng.random((7, self.n))
+        event = self.phase == EVENT
+
+        # --- Magnitude ---
+        mega = event & (u[0] < 0.15)
+        magnitude = np.where(
+            mega, _uniform(u[1], 7.8, 9.2),
+            np.where(event, _uniform(u[1], 6.8, 7.8), _uniform(u[1], 4.8, 6.6))
+        )
+
+        # --- Fault mechanics ---
+        marine = (self.zone != INLAND) & (u[2] < 0.6)
+        coin = u[3] < 0.5
+        fault = np.where(marine, np.where(coin, REVERSE, NORMAL),
+                         np.where(coin, NORMAL, STRIKE_SLIP)).astype(np.int8)
+
+        # --- Vertical displacement ---
+        displacement = _uniform(u[4], DISPLACEMENT_RANGE[fault, 0], DISPLACEMENT_RANGE[fault, 1])
+
+        out = np.empty(self.n, dtype=SCENARIO_DTYPE)
+        out["magnitude"] = np.round(magnitude, 2)
+        out["depth_km"] = np.round(_uniform(u[5], 5, 45), 1)
+        out["ocean_depth_m"] = self.ocean_depth_m
+        out["fault_type"] = fault
+        out["vertical_displacement_m"] = np.round(displacement, 2)
+        out["distance_to_coast_km"] = np.round(self.distance_to_coast_km, 1)
+        out["rainfall_mm"] = np.round(self.rainfall_mm, 1)
+        out["soil_moisture"] = np.round(self.soil_moisture, 2)
+        out["slope_angle_deg"] = np.round(self.slope_angle_deg, 1)
+        out["vegetation_index"] = np.round(self.vegetation_index, 2)
+        out["soil_type"] = self.soil_type
+        out["ground_vibration"] = np.round(self.ground_vibration, 2)
+        out["phase"] = self.phase
+        return out
+
+    def get_next_state(self):
+        self.evolve_tectonics()
+        self.evolve_terrain()
+        self.update_phase()
+        self.steps += 1
+        return self.build_scenario()
+
+    def spawn(self, k, n=None):
+        """k ensembles (of n worlds, default self.n) on independent streams."""
+        return [EnsembleEngine(n or self.n, child) for child in spawn_seeds(self.seed, k)]
+
+    @classmethod
+    def replay(cls, n, seed, steps):
+        engine = cls(n, seed)
+        for _ in range(steps):
+            engine.get_next_state()
+        return engine
+
+
+def scenario_dicts(scenarios):
+    """Structured scenarios -> dicts shaped like SimulationEngine.build_scenario."""
+    out = []
+    for row in scenarios.tolist():
+        record = dict(zip(SCENARIO_DTYPE.names, row))
+        record["fault_type"] = FAULT_TYPES[record["fault_type"]]
+        record["phase"] = PHASES[record["phase"]]
+        out.append(record)
+    return out
@@ -0,0 +1,151 @@
+import threading
+import time
+
+import numpy as np
+
+
+class SmoothingStore:
+    """
+    Per-source moving-average windows for magnitude and depth.
+
+    Every source ID owns one slot in a set of preallocated arrays (ring
+    buffers plus running sums), so a push is O(1) and allocates nothing
+    per call.  Slots of sources idle for longer than idle_ttl seconds are
+    recycled; when max_sessions is reached the least recently seen source
+    is evicted.  The arrays grow by doubling until max_sessions.
+    """
+
+    def __init__(self, window=3, capacity=1024, max_sessions=65536, idle_ttl=600.0,
+                 clock=time.monotonic):
+        self.window = window
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.clock = clock
+        self.evictions = 0
+
+        self._slots = {}                # source_id -> slot
+        self._owners = {}               # slot -> source_id
+        self._free = []
+        self._lock = threading.Lock()
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = getattr(self, "_capacity", 0)
+
+        def grow(arr, shape, dtype):
+            new = np.zeros(shape, dtype=dtype)
+            if arr is not None:
+                new[:old] = arr
+            return new
+
+        self._mag = grow(getattr(self, "_mag", None), (capacity, self.window), np.float64)
+        self._depth = grow(getattr(self, "_depth", None), (capacity, self.window), np.float64)
+        self._mag_sum = grow(getattr(self, "_mag_sum", None), capacity, np.float64)
+        self._depth_sum = grow(getattr(self, "_depth_sum", None), capacity, np.float64)
+        self._count = grow(getattr(self, "_count", None), capacity, np.int32)
+        self._head = grow(getattr(self, "_head", None), capacity, np.int32)
+        self._last_seen = grow(getattr(self, "_last_seen", None), capacity, np.float64)
+
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self._capacity = capacity
+
+    # ------------------------------------------------
+    # SLOTS
+    # ------------------------------------------------
+    def _release(self, slot):
+        del self._slots[self._owners.pop(slot)]
+        self._count[slot] = 0
+        self._head[slot] = 0
+        self._mag_sum[slot] = 0.0
+        self._depth_sum[slot] = 0.0
+        self._free.append(slot)
+
+    def evict_idle(self, now=None):
+        """Recycle every session idle for longer than idle_ttl.  Returns how many."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            return self._evict_idle(now)
+
+    def _evict_idle(self, now):
+        used = np.fromiter(self._owners, dtype=np.intp, count=len(self._owners))
+        if not len(used):
+            return 0
+        stale = used[self._last_seen[used] < now - self.idle_ttl]
+        for slot in stale:
+            self._release(int(slot))
+        self.evictions += len(stale)
+        return len(stale)
+
+    def _slot_for(self, source_id, now):
+        slot = self._slots.get(source_id)
+        if slot is not None:
+            return slot
+
+        if not self._free:
+            self._evict_idle(now)
+        if not self._free:
+            if self._capacity < self.max_sessions:
+                self._allocate(min(self._capacity * 2, self.max_sessions))
+            else:
+                used = np.fromiter(self._owners, dtype=np.intp, count=len(self._owners))
+                self._release(int(used[np.argmin(self._last_seen[used])]))
+                self.evictions += 1
+
+        slot = self._free.pop()
+        self._slots[source_id] = slot
+        self._owners[slot] = source_id
+        return slot
+
+    # ------------------------------------------------
+    # WINDOWS
+    # ------------------------------------------------
+    def push(self, source_id, mag, depth):
+        """Add one reading; returns (avg_mag, avg_depth, samples_in_window)."""
+        with self._lock:
+            now = self.clock()
+            slot = self._slot_for(source_id, now)
+            head = self._head[slot]
+            count = self._count[slot]
+
+            if count == self.window:
+                self._mag_sum[slot] -= self._mag[slot, head]
+                self._depth_sum[slot] -= self._depth[slot, head]
+            else:
+                count += 1
+                self._count[slot] = count
+
+            self._mag[slot, head] = mag
+            self._depth[slot, head] = depth
+            head = (head + 1) % self.window
+            self._head[slot] = head
+
+            if head == 0:
+                # Re-anchor once per lap so subtract/add rounding never builds up
+                self._mag_sum[slot] = self._mag[slot, :count].sum()
+                self._depth_sum[slot] = self._depth[slot, :count].sum()
+            else:
+                self._mag_sum[slot] += mag
+                self._depth_sum[slot] += depth
+
+            self._last_seen[slot] = now
+            return (
+                float(self._mag_sum[slot]) / int(count),
+                float(self._depth_sum[slot]) / int(count),
+                int(count)
+            )
+
+    def reset(self, source_id):
+        with self._lock:
+            slot = self._slots.get(source_id)
+            if slot is not None:
+                self._release(slot)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def stats(self):
+        return {
+            "sessions": len(self._slots),
+            "capacity": self._capacity,
+            "evictions": self.evictions
+        }
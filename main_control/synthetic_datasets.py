@@ -0,0 +1,260 @@
+"""
+Generate large synthetic earthquake / tsunami datasets.
+
+    python synthetic_datasets.py earthquake out.json --rows 10000000 [--seed 0]
+    python synthetic_datasets.py tsunami data/tsunami --rows 10000000 --format columnar
+
+Rows follow the same schema, label mix and per-label value ranges as
+earthquake_synthetic_dataset.json / tsunami_synthetic_dataset.json.
+Sampling is vectorized per chunk and every chunk is written out before
+the next is drawn, so memory stays flat at roughly one chunk.  Output is
+a JSON array (one record per line, readable by json.load and
+columnar_dataset.iter_records) or a columnar directory that
+columnar_dataset.open_columns maps directly.
+
+The same seed, rows and chunk size always give the same rows, in either
+format.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from columnar_dataset import SCHEMA_NAME
+
+CHUNK_ROWS = 1 << 18
+
+# column -> (low, high, decimals) per label; values are uniform in range,
+# as in the shipped datasets
+EARTHQUAKE = {
+    "labels": {"normal": 0.82, "abnormal": 0.18},
+    "columns": ["p_wave_amplitude", "s_wave_amplitude", "ps_time_diff_sec", "frequency_hz",
+                "depth_km", "latitude", "longitude"],
+    "ranges": {
+        "normal": {
+            "p_wave_amplitude": (0.5, 1.2, 2),
+            "s_wave_amplitude": (0.8, 1.6, 2),
+            "ps_time_diff_sec": (6.0, 8.0, 2),
+            "frequency_hz": (2.0, 4.0, 2),
+            "depth_km": (40.0, 80.0, 1),
+        },
+        "abnormal": {
+            "p_wave_amplitude": (3.0, 8.0, 2),
+            "s_wave_amplitude": (5.0, 12.0, 2),
+            "ps_time_diff_sec": (1.0, 3.5, 2),
+            "frequency_hz": (0.5, 1.5, 2),
+            "depth_km": (5.0, 20.0, 1),
+        },
+        "*": {
+            "latitude": (8.0, 18.0, 3),
+            "longitude": (75.0, 90.0, 3),
+        },
+    },
+    "categorical": {},
+}
+
+TSUNAMI = {
+    "labels": {"no_tsunami": 0.79, "tsunami_risk": 0.21},
+    "columns": ["magnitude", "depth_km", "ocean_depth_m", "fault_type",
+                "vertical_displacement_m", "distance_to_coast_km"],
+    "ranges": {
+        "no_tsunami": {
+            "magnitude": (4.5, 5.8, 2),
+            "depth_km": (40.0, 80.0, 1),
+            "ocean_depth_m": (2000.0, 5000.0, 0),
+            "vertical_displacement_m": (0.0, 0.3, 2),
+            "distance_to_coast_km": (150.0, 800.0, 1),
+        },
+        "tsunami_risk": {
+            "magnitude": (7.2, 9.1, 2),
+            "depth_km": (5.0, 25.0, 1),
+            "ocean_depth_m": (3000.0, 6000.0, 0),
+            "vertical_displacement_m": (1.5, 8.0, 2),
+            "distance_to_coast_km": (20.0, 150.0, 1),
+        },
+    },
+    # fault types each label draws from (uniformly)
+    "categorical": {
+        "fault_type": {
+            "no_tsunami": ["normal", "strike-slip"],
+            "tsunami_risk": ["reverse", "thrust"],
+        },
+    },
+}
+
+KINDS = {"earthquake": EARTHQUAKE, "tsunami": TSUNAMI}
+
+
+# ----------------------------------------------------
+# 🎲 SAMPLING
+# ----------------------------------------------------
+def categories(spec, column):
+    if column == "label":
+        return sorted(spec["labels"])
+    return sorted({v for values in spec["categorical"][column].values() for v in values})
+
+
+def generate_chunk(spec, rng, n):
+    """
+    One chunk as column arrays.  Categorical columns (label, fault_type)
+    come back as int8 codes into categories(spec, column).
+    """
+    labels = sorted(spec["labels"])
+    p = np.array([spec["labels"][name] for name in labels])
+    label = rng.choice(len(labels), size=n, p=p / p.sum()).astype(np.int8)
+
+    out = {"label": label}
+    for column in spec["columns"]:
+        if column in spec["categorical"]:
+            table = categories(spec, column)
+            codes = np.empty(n, dtype=np.int8)
+            for i, name in enumerate(labels):
+                mask = label == i
+                allowed = np.array([table.index(v) for v in spec["categorical"][column][name]])
+                codes[mask] = allowed[rng.integers(0, len(allowed), mask.sum())]
+            out[column] = codes
+            continue
+
+        shared = spec["ranges"].get("*", {}).get(column)
+        if shared is not None:
+            low, high, decimals = shared
+            out[column] = np.round(rng.uniform(low, high, n), decimals)
+            continue
+
+        values = np.empty(n)
+        for i, name in enumerate(labels):
+            mask = label == i
+            low, high, decimals = spec["ranges"][name][column]
+            values[mask] = np.round(rng.uniform(low, high, int(mask.sum())), decimals)
+        out[column] = values
+    return out
+
+
+def iter_chunks(spec, rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """(start, columns) per chunk; each chunk has its own spawned seed."""
+    n_chunks = max(1, -(-rows // chunk_rows))
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_chunks)):
+        start = i * chunk_rows
+        n = min(chunk_rows, rows - start)
+        if n <= 0:
+            break
+        yield start, generate_chunk(spec, np.random.default_rng(child), n)
+
+
+# ----------------------------------------------------
+# 💾 WRITERS
+# ----------------------------------------------------
+def _timestamp_width(rows):
+    return max(4, len(str(rows - 1)))
+
+
+def _decimals(spec, column):
+    for ranges in spec["ranges"].values():
+        if column in ranges:
+            return ranges[column][2]
+    return None
+
+
+def write_json(kind, path, rows, seed=0, chunk_rows=CHUNK_ROWS):
+    spec = KINDS[kind]
+    width = _timestamp_width(rows)
+    columns = ["timestamp"] + spec["columns"] + ["label"]
+
+    # One %-template per record; the values are formatted in bulk per chunk
+    parts = []
+    for column in columns:
+        if column == "timestamp":
+            fmt = f'"%0{width}d"'
+        elif column == "label" or column in spec["categorical"]:
+            fmt = '"%s"'
+        else:
+            fmt = f"%.{max(1, _decimals(spec, column))}f"
+        parts.append(f'"{column}": {fmt}')
+    template = "{" + ", ".join(parts) + "}"
+
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for start, chunk in iter_chunks(spec, rows, seed, chunk_rows):
+            n = len(chunk["label"])
+            values = []
+            for column in columns:
+                if column == "timestamp":
+                    values.append(range(start, start + n))
+                elif column == "label" or column in spec["categorical"]:
+                    table = np.array(categories(spec, column), dtype=object)
+                    values.append(table[chunk[column]].tolist())
+                else:
+                    values.append(chunk[column].tolist())
+            if start:
+                f.write(",\n")
+            f.write(",\n".join(template % row for row in zip(*values)))
+        f.write("\n]\n")
+    os.replace(tmp, path)
+
+
+def write_columnar(kind, out_dir, rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Same rows as write_json, laid out like columnar_dataset.convert."""
+    spec = KINDS[kind]
+    os.makedirs(out_dir, exist_ok=True)
+
+    columns = {"timestamp": {"kind": "string", "dtype": f"S{_timestamp_width(rows)}"}}
+    for column in spec["columns"] + ["label"]:
+        if column == "label" or column in spec["categorical"]:
+            columns[column] = {"kind": "category", "dtype": "int8",
+                               "categories": categories(spec, column)}
+        else:
+            columns[column] = {"kind": "number", "dtype": "float64"}
+    for column, col_spec in columns.items():
+        col_spec["file"] = column + ".npy"
+
+    # Plain appends behind a fixed .npy header: unlike a writable memmap no
+    # dirty pages pile up in this process, so memory stays at one chunk
+    outputs = {}
+    for column, col_spec in columns.items():
+        f = open(os.path.join(out_dir, col_spec["file"]), "wb")
+        np.lib.format.write_array_header_1_0(f, {
+            "descr": np.lib.format.dtype_to_descr(np.dtype(col_spec["dtype"])),
+            "fortran_order": False,
+            "shape": (rows,)
+        })
+        outputs[column] = f
+
+    width = _timestamp_width(rows)
+    try:
+        for start, chunk in iter_chunks(spec, rows, seed, chunk_rows):
+            n = len(chunk["label"])
+            chunk["timestamp"] = np.char.zfill(np.arange(start, start + n).astype(f"S{width}"), width)
+            for column, f in outputs.items():
+                f.write(np.ascontiguousarray(chunk[column], dtype=columns[column]["dtype"]).tobytes())
+    finally:
+        for f in outputs.values():
+            f.close()
+
+    schema = {"rows": rows, "source": f"synthetic:{kind}:seed={seed}", "columns": columns}
+    with open(os.path.join(out_dir, SCHEMA_NAME), "w") as f:
+        json.dump(schema, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("kind", choices=list(KINDS))
+    parser.add_argument("out")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--format", choices=["json", "columnar"], default="json")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    writer = write_json if args.format == "json" else write_columnar
+    writer(args.kind, args.out, args.rows, args.seed, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+    print(f"✅ {args.rows:,} {args.kind} rows -> {args.out} in {elapsed:.1f} s "
+          f"({args.rows / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Train the forests behind main_control/Models from the synthetic datasets.
+
+    python train_models.py [--earthquake PATH] [--tsunami PATH]
+                           [--models event_classifier ...] [--n-jobs -1]
+                           [--parallel 2] [--n-estimators N] [--no-publish]
+
+Dataset paths may be the JSON files or columnar directories written by
+columnar_dataset.py.  Every model is fitted with n_jobs tree-level
+parallelism, and independent models are fitted concurrently (--parallel
+at a time).  Each run writes versioned artifacts to
+Models/versions/<model>.v<N>.pkl, records them in Models/manifest.json
+and, unless --no-publish, atomically replaces Models/<model>.pkl, which a
+watching ModelRegistry then hot-reloads.
+"""
+import argparse
+import contextlib
+import datetime
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import sklearn
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+from model_registry import MANIFEST_NAME, MODEL_DIR, file_sha256
+from model_tasks import DATASETS, DEFAULT_TASKS, TASKS, load_dataset, score, split_task
+
+MANIFEST_LOCK = "manifest.lock"
+
+_manifest_threads = threading.Lock()
+
+
+# ----------------------------------------------------
+# 📒 MANIFEST
+# ----------------------------------------------------
+@contextlib.contextmanager
+def manifest_lock(model_dir=MODEL_DIR):
+    """
+    Hold while reading, recording into and writing the manifest.  The
+    flock on Models/manifest.lock covers other processes (train_models,
+    select_models, online updaters in the server); the thread lock covers
+    updaters of the same process.  Without it concurrent writers lose each
+    other's entries and can hand out the same version number twice.
+    """
+    with _manifest_threads:
+        with open(os.path.join(model_dir, MANIFEST_LOCK), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def read_manifest(model_dir=MODEL_DIR):
+    path = os.path.join(model_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"models": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, model_dir=MODEL_DIR):
+    path = os.path.join(model_dir, MANIFEST_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def next_version(manifest, name):
+    history = manifest["models"].get(name, {}).get("versions", [])
+    return max((v["version"] for v in history), default=0) + 1
+
+
+# ----------------------------------------------------
+# 🏋️ TRAINING
+# ----------------------------------------------------
+def build_model(name, n_jobs, n_estimators=None):
+    task = TASKS[name]
+    cls = RandomForestClassifier if task["kind"] == "classifier" else RandomForestRegressor
+    return cls(n_estimators=n_estimators or task["n_estimators"], random_state=42, n_jobs=n_jobs)
+
+
+def train_one(name, df, n_jobs, n_estimators=None):
+    """Fit one task on its 80/20 split; returns (model, metrics)."""
+    X_train, X_test, y_train, y_test = split_task(name, df)
+    model = build_model(name, n_jobs, n_estimators)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - start
+
+    # Inference runs single-threaded; n_jobs only matters while fitting
+    model.n_jobs = None
+    metric, value = score(TASKS[name]["kind"], y_test, model.predict(X_test))
+    return model, {
+        "metric": metric,
+        "value": round(value, 4),
+        "fit_seconds": round(fit_s, 2),
+        "train_rows": len(X_train),
+        "test_rows": len(X_test)
+    }
+
+
+def save_artifact(name, model, version, model_dir, publish):
+    """Write Models/versions/<name>.v<N>.pkl and optionally publish it."""
+    versions_dir = os.path.join(model_dir, "versions")
+    os.makedirs(versions_dir, exist_ok=True)
+    artifact = os.path.join(versions_dir, f"{name}.v{version}.pkl")
+    joblib.dump(model, artifact)
+
+    if publish:
+        # Copy next to the live file, then rename over it: readers never
+        # see a half-written pickle
+        live = os.path.join(model_dir, name + ".pkl")
+        tmp = live + ".tmp"
+        shutil.copyfile(artifact, tmp)
+        os.replace(tmp, live)
+    return artifact
+
+
+def record_version(manifest, name, model, model_dir=MODEL_DIR, publish=True, **info):
+    """Save `model` as the next version of `name` and add it to the manifest."""
+    version = next_version(manifest, name)
+    artifact = save_artifact(name, model, version, model_dir, publish)
+
+    entry = manifest["models"].setdefault(name, {"versions": []})
+    entry["versions"].append({
+        "version": version,
+        "artifact": os.path.relpath(artifact, model_dir),
+        "sha256": file_sha256(artifact),
+        "trained_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "params": {"n_estimators": getattr(model, "n_estimators", 1), "random_state": model.random_state},
+        "sklearn": sklearn.__version__,
+        **info
+    })
+    if publish:
+        entry["published"] = version
+    return version
+
+
+def train_all(names, dataset_paths, n_jobs=-1, parallel=2, n_estimators=None,
+              model_dir=MODEL_DIR, publish=True):
+    # Each dataset is read once and shared by the tasks that use it
+    needed = {TASKS[name]["dataset"] for name in names}
+    frames = {key: load_dataset(dataset_paths[key]) for key in needed}
+    hashes = {key: file_sha256(dataset_paths[key]) for key in needed}
+
+    def job(name):
+        model, metrics = train_one(name, frames[TASKS[name]["dataset"]], n_jobs, n_estimators)
+        print(f"🏋️ {name}: {metrics['metric']} {metrics['value']} ({metrics['fit_seconds']} s)")
+        return name, model, metrics
+
+    # Tree building releases the GIL, so threads are enough to overlap models
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        results = list(pool.map(job, names))
+
+    with manifest_lock(model_dir):
+        manifest = read_manifest(model_dir)
+        for name, model, metrics in results:
+            dataset = TASKS[name]["dataset"]
+            record_version(manifest, name, model, model_dir, publish,
+                           dataset=os.path.abspath(dataset_paths[dataset]),
+                           dataset_sha256=hashes[dataset], **metrics)
+        write_manifest(manifest, model_dir)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--earthquake", default=DATASETS["earthquake"])
+    parser.add_argument("--tsunami", default=DATASETS["tsunami"])
+    parser.add_argument("--models", nargs="+", default=DEFAULT_TASKS, choices=list(TASKS))
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--parallel", type=int, default=2)
+    parser.add_argument("--n-estimators", type=int, default=None)
+    parser.add_argument("--out", default=MODEL_DIR)
+    parser.add_argument("--no-publish", action="store_true")
+    args = parser.parse_args()
+
+    paths = {"earthquake": args.earthquake, "tsunami": args.tsunami}
+    start = time.perf_counter()
+    train_all(args.models, paths, args.n_jobs, args.parallel, args.n_estimators,
+              args.out, publish=not args.no_publish)
+    print(f"✅ {len(args.models)} models trained in {time.perf_counter() - start:.1f} s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,72 @@
-import os
-import joblib
+import numpy as np
 import pandas as pd
 
-BASE_DIR = os.path.dirname(__file__)
-tsunami_model = joblib.load(os.path.join(BASE_DIR, "Models", "tsunami_model.pkl"))
+from compiled_forest import ANYTIME
+from feature_matrix import to_matrix
+from model_registry import get_compiled, registry
+from prediction_cache import PredictionCache, quantize
 
-def evaluate_tsunami(sample):
+MODEL_NAME = "tsunami_model"
+
+FEATURES = [
+    "magnitude",
+    "depth_km",
+    "ocean_depth_m",
+    "fault_type_encoded",
+    "vertical_displacement_m",
+    "distance_to_coast_km"
+]
+
+FAULT_TYPES = ["normal", "strike-slip", "reverse"]     # index == fault_type_encoded
+FAULT_MAP = {fault: code for code, fault in enumerate(FAULT_TYPES)}
+
+# vertical_factor per fault_type_encoded (see evaluate_tsunami)
+VERTICAL_FACTORS = np.array([0.45, 0.15, 1.0])
+
+# scaled_probability cut-offs for high / medium / low (low: normal faults only)
+SEVERITY_THRESHOLDS = np.array([0.6, 0.4, 0.25])
+
+# -----------------------------
+# OPT-IN PREDICTION CACHE
+# -----------------------------
+# Cache keys use the precision SimulationEngine.build_scenario rounds to,
+# so repeated scenarios hit instead of re-running the forest.
+QUANTIZATION = {
+    "magnitude": 2,
+    "depth_km": 1,
+    "ocean_depth_m": None,          # constant per zone, not rounded by the engine
+    "fault_type": None,
+    "vertical_displacement_m": 2,
+    "distance_to_coast_km": 1
+}
+
+_cache = None
+
+def enable_cache(maxsize=4096, ttl=None, max_bytes=4 * 1024 * 1024):
+    global _cache
+    _cache = PredictionCache(maxsize=maxsize, ttl=ttl, max_bytes=max_bytes)
+    return _cache
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+def cache_stats():
+    return _cache.stats() if _cache is not None else None
+
+def evaluate_tsunami(sample, anytime=ANYTIME):
+    # Anytime results carry bounds, not the full probability: never cached,
+    # so they cannot be served to (or from) full evaluations
+    if _cache is None or anytime:
+        return _evaluate_tsunami(sample, anytime)
+
+    return _cache.get_or_compute(
+        registry.entry(MODEL_NAME).version,
+        quantize(sample, QUANTIZATION),
+        lambda: _evaluate_tsunami(sample, anytime)
+    )
+
+def _evaluate_tsunami(sample, anytime=False):
     """
     Tsunami evaluation with fault-type–aware severity scaling.
     Reverse  -> strong
@@ -13,6 +74,10 @@ def evaluate_tsunami(sample):
     Strike   -> very weak / rare
     """
 
+    if anytime:
+        X = to_matrix([sample], FEATURES, {"fault_type_encoded": ("fault_type", FAULT_MAP)})
+        return _anytime_results(X)[0]
+
     fault_map = {
         "normal": 0,
         "strike-slip": 1,
@@ -29,7 +94,7 @@ def evaluate_tsunami(sample):
     }])
 
     # ML probability
-    tsunami_prob = float(tsunami_model.predict_proba(input_df)[0][1])
+    tsunami_prob = float(get_compiled(MODEL_NAME).predict_proba(input_df)[0][1])
 
     # -----------------------------
     # PHYSICAL SCALING (KEY FIX)
@@ -75,3 +140,99 @@ def evaluate_tsunami(sample):
         "severity": severity,
         "tsunami_alert": tsunami_alert
     }
+
+
+def evaluate_tsunami_batch(samples, anytime=ANYTIME):
+    """
+    Vectorized evaluate_tsunami.
+
+    samples: list of tsunami dicts, or array shaped (n, 6) in FEATURES order
+             (fault type given as fault_type_encoded).
+    One predict_proba call for the batch; the fault scaling and
+    basic_conditions are applied as masks, so every row matches
+    evaluate_tsunami exactly.
+    """
+
+    X = to_matrix(samples, FEATURES, {"fault_type_encoded": ("fault_type", FAULT_MAP)})
+    if len(X) == 0:
+        return []                               # sklearn rejects 0-row input
+    if anytime:
+        return _anytime_results(X)
+
+    input_df = pd.DataFrame(X, columns=FEATURES)
+
+    tsunami_prob = get_compiled(MODEL_NAME).predict_proba(input_df)[:, 1]
+
+    fault_code = X[:, 3].astype(int)
+    scaled_prob = tsunami_prob * VERTICAL_FACTORS[fault_code]
+    severity, tsunami_alert = _severity(X, scaled_prob)
+
+    return [
+        {
+            "tsunami_probability": round(float(tsunami_prob[i]), 3),
+            "scaled_probability": round(float(scaled_prob[i]), 3),
+            "fault_type": FAULT_TYPES[fault_code[i]],
+            "severity": str(severity[i]) or None,
+            "tsunami_alert": bool(tsunami_alert[i])
+        }
+        for i in range(len(X))
+    ]
+
+
+def _basic_conditions(X):
+    return (
+        (X[:, 0] >= 6.5) &
+        (X[:, 1] <= 70) &
+        (X[:, 2] > 50) &
+        (X[:, 4] >= 0.3)
+    )
+
+
+def _severity(X, scaled_prob):
+    """(severity strings, alert flags) per row, exactly as evaluate_tsunami buckets them."""
+    basic_conditions = _basic_conditions(X)
+    fault_code = X[:, 3].astype(int)
+    high_cut, medium_cut, low_cut = SEVERITY_THRESHOLDS
+
+    high = basic_conditions & (scaled_prob >= high_cut)
+    medium = basic_conditions & ~high & (scaled_prob >= medium_cut)
+    low = (
+        basic_conditions & ~high & ~medium &
+        (scaled_prob >= low_cut) & (fault_code == FAULT_MAP["normal"])
+    )
+
+    severity = np.select([high, medium, low], ["high", "medium", "low"], default="")
+    return severity, high | medium | low
+
+
+def _anytime_results(X):
+    """
+    Early-exit scoring for the severity buckets.  Each row's cut-offs are
+    mapped back to raw probability through its fault's vertical factor
+    (and dropped when basic_conditions already rule an alert out), so the
+    trees stop as soon as the bucket is settled.  severity / tsunami_alert
+    always match full evaluation; the probabilities are exact when every
+    tree was needed, otherwise the mean of the trees evaluated.
+    """
+    fault_code = X[:, 3].astype(int)
+    factor = VERTICAL_FACTORS[fault_code]
+
+    thresholds = SEVERITY_THRESHOLDS[None, :] / factor[:, None]
+    thresholds[fault_code != FAULT_MAP["normal"], 2] = np.inf
+    thresholds[~_basic_conditions(X)] = np.inf
+
+    prob, low, _, trees = get_compiled(MODEL_NAME).anytime_proba(X, thresholds)
+    # `low` sits on the same side of every cut-off as the exact probability
+    severity, tsunami_alert = _severity(X, low * factor)
+
+    return [
+        {
+            "tsunami_probability": round(float(prob[i]), 3),
+            "scaled_probability": round(float(prob[i] * factor[i]), 3),
+            "fault_type": FAULT_TYPES[fault_code[i]],
+            "severity": str(severity[i]) or None,
+            "tsunami_alert": bool(tsunami_alert[i]),
+            "trees_evaluated": int(trees[i])
+        }
+        for i in range(len(X))
+    ]
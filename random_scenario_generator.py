@@ -1,7 +1,13 @@
+import os
 import random
-import time
+import sys
 
-random.seed()  # different scenario every run
+# The seeding helpers and simulation clocks live with the engine in
+# main_control/ (appended, so this directory's modules still win)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "main_control"))
+
+from sim_clock import RealClock
+from simengine import new_seed, spawn_seeds
 
 # -------------------------------------------------
 # SCENARIO DEFINITIONS (THE WORLD RULES)
@@ -21,69 +27,99 @@ FAULT_TYPES = ["normal", "strike-slip", "reverse"]
 # SCENARIO GENERATOR
 # -------------------------------------------------
 
+class ScenarioGenerator:
+    """
+    Scenario source with its own random stream.  seed=None draws fresh
+    entropy (kept in self.seed, so the run can be replayed); spawn()
+    derives independent generators for parallel use.  Timestamps come
+    from `clock` (wall time by default); with a sim_clock.VirtualClock
+    started at the same time, a replay of the seed is identical.
+    """
+
+    def __init__(self, seed=None, clock=None):
+        self.seed = new_seed() if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.clock = clock or RealClock()
+
+    def spawn(self, n):
+        return [ScenarioGenerator(seed, self.clock) for seed in spawn_seeds(self.seed, n)]
+
+    def generate(self):
+        scenario_type = self.rng.choice(SCENARIO_TYPES)
+
+        scenario = {
+            "scenario_type": scenario_type,
+            "timestamp": self.clock.now()
+        }
+
+        # -------------------------------
+        # SCENARIO LOGIC
+        # -------------------------------
+
+        if scenario_type == "deep_safe":
+            scenario.update({
+                "magnitude": round(self.rng.uniform(6.0, 8.5), 2),
+                "depth_km": round(self.rng.uniform(80, 120), 1),
+                "fault_type": self.rng.choice(FAULT_TYPES),
+                "vertical_displacement_m": round(self.rng.uniform(0.0, 0.3), 2),
+                "distance_to_coast_km": round(self.rng.uniform(300, 1000), 1),
+                "ocean_depth_m": round(self.rng.uniform(3000, 6000), 1)
+            })
+
+        elif scenario_type == "shallow_reverse_danger":
+            scenario.update({
+                "magnitude": round(self.rng.uniform(7.2, 9.2), 2),
+                "depth_km": round(self.rng.uniform(5, 30), 1),
+                "fault_type": "reverse",
+                "vertical_displacement_m": round(self.rng.uniform(1.0, 8.0), 2),
+                "distance_to_coast_km": round(self.rng.uniform(20, 150), 1),
+                "ocean_depth_m": round(self.rng.uniform(2000, 5000), 1)
+            })
+
+        elif scenario_type == "moderate_monitor":
+            scenario.update({
+                "magnitude": round(self.rng.uniform(6.0, 6.8), 2),
+                "depth_km": round(self.rng.uniform(30, 70), 1),
+                "fault_type": self.rng.choice(["normal", "strike-slip"]),
+                "vertical_displacement_m": round(self.rng.uniform(0.1, 0.6), 2),
+                "distance_to_coast_km": round(self.rng.uniform(150, 400), 1),
+                "ocean_depth_m": round(self.rng.uniform(2500, 5500), 1)
+            })
+
+        elif scenario_type == "strong_far_coast":
+            scenario.update({
+                "magnitude": round(self.rng.uniform(7.5, 9.0), 2),
+                "depth_km": round(self.rng.uniform(10, 40), 1),
+                "fault_type": self.rng.choice(FAULT_TYPES),
+                "vertical_displacement_m": round(self.rng.uniform(0.5, 3.0), 2),
+                "distance_to_coast_km": round(self.rng.uniform(500, 1000), 1),
+                "ocean_depth_m": round(self.rng.uniform(3500, 6000), 1)
+            })
+
+        elif scenario_type == "borderline_case":
+            scenario.update({
+                "magnitude": round(self.rng.uniform(6.3, 6.7), 2),
+                "depth_km": round(self.rng.uniform(60, 75), 1),
+                "fault_type": self.rng.choice(FAULT_TYPES),
+                "vertical_displacement_m": round(self.rng.uniform(0.3, 0.8), 2),
+                "distance_to_coast_km": round(self.rng.uniform(80, 250), 1),
+                "ocean_depth_m": round(self.rng.uniform(2000, 4500), 1)
+            })
+
+        return scenario
+
+
+# Different scenarios every run unless seeded
+_default = ScenarioGenerator()
+
+def seed_generator(seed=None, clock=None):
+    """Re-seed the module-level generator behind generate_scenario()."""
+    global _default
+    _default = ScenarioGenerator(seed, clock)
+    return _default.seed
+
 def generate_scenario():
-    scenario_type = random.choice(SCENARIO_TYPES)
-
-    scenario = {
-        "scenario_type": scenario_type,
-        "timestamp": time.time()
-    }
-
-    # -------------------------------
-    # SCENARIO LOGIC
-    # -------------------------------
-
-    if scenario_type == "deep_safe":
-        scenario.update({
-            "magnitude": round(random.uniform(6.0, 8.5), 2),
-            "depth_km": round(random.uniform(80, 120), 1),
-            "fault_type": random.choice(FAULT_TYPES),
-            "vertical_displacement_m": round(random.uniform(0.0, 0.3), 2),
-            "distance_to_coast_km": round(random.uniform(300, 1000), 1),
-            "ocean_depth_m": round(random.uniform(3000, 6000), 1)
-        })
-
-    elif scenario_type == "shallow_reverse_danger":
-        scenario.update({
-            "magnitude": round(random.uniform(7.2, 9.2), 2),
-            "depth_km": round(random.uniform(5, 30), 1),
-            "fault_type": "reverse",
-            "vertical_displacement_m": round(random.uniform(1.0, 8.0), 2),
-            "distance_to_coast_km": round(random.uniform(20, 150), 1),
-            "ocean_depth_m": round(random.uniform(2000, 5000), 1)
-        })
-
-    elif scenario_type == "moderate_monitor":
-        scenario.update({
-            "magnitude": round(random.uniform(6.0, 6.8), 2),
-            "depth_km": round(random.uniform(30, 70), 1),
-            "fault_type": random.choice(["normal", "strike-slip"]),
-            "vertical_displacement_m": round(random.uniform(0.1, 0.6), 2),
-            "distance_to_coast_km": round(random.uniform(150, 400), 1),
-            "ocean_depth_m": round(random.uniform(2500, 5500), 1)
-        })
-
-    elif scenario_type == "strong_far_coast":
-        scenario.update({
-            "magnitude": round(random.uniform(7.5, 9.0), 2),
-            "depth_km": round(random.uniform(10, 40), 1),
-            "fault_type": random.choice(FAULT_TYPES),
-            "vertical_displacement_m": round(random.uniform(0.5, 3.0), 2),
-            "distance_to_coast_km": round(random.uniform(500, 1000), 1),
-            "ocean_depth_m": round(random.uniform(3500, 6000), 1)
-        })
-
-    elif scenario_type == "borderline_case":
-        scenario.update({
-            "magnitude": round(random.uniform(6.3, 6.7), 2),
-            "depth_km": round(random.uniform(60, 75), 1),
-            "fault_type": random.choice(FAULT_TYPES),
-            "vertical_displacement_m": round(random.uniform(0.3, 0.8), 2),
-            "distance_to_coast_km": round(random.uniform(80, 250), 1),
-            "ocean_depth_m": round(random.uniform(2000, 4500), 1)
-        })
-
-    return scenario
+    return _default.generate()
 
 # -------------------------------------------------
 # DEMO RUN
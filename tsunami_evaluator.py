@@ -1,47 +1,16 @@
-import json
+import os
+import joblib
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
 
 # ----------------------------------
-# 1. LOAD TSUNAMI DATASET (ONLY)
+# 1. LOAD TRAINED MODEL
+# Trained by main_control/train_models.py; nothing is fitted on import.
 # ----------------------------------
-with open(
-    r"D:\Codesprint2k25\detection_engine\tsunami_synthetic_dataset.json",
-    "r"
-) as f:
-    data = json.load(f)
-
-df = pd.DataFrame(data)
-
-# ----------------------------------
-# 2. ENCODE LABELS
-# no_tsunami -> 0
-# tsunami_risk -> 1
-# ----------------------------------
-df = df[df["label"].isin(["no_tsunami", "tsunami_risk"])]
-
-df["label_encoded"] = df["label"].map({
-    "no_tsunami": 0,
-    "tsunami_risk": 1
-})
-
-print("Label distribution:")
-print(df["label_encoded"].value_counts())
-
-# ----------------------------------
-# 3. ENCODE FAULT TYPE
-# ----------------------------------
-df["fault_type_encoded"] = df["fault_type"].map({
-    "normal": 0,
-    "strike-slip": 1,
-    "reverse": 2
-})
+MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "main_control", "Models", "tsunami_model.pkl"
+)
 
-# ----------------------------------
-# 4. FEATURES & TARGET
-# ----------------------------------
 FEATURES = [
     "magnitude",
     "depth_km",
@@ -51,38 +20,16 @@ FEATURES = [
     "distance_to_coast_km"
 ]
 
-X = df[FEATURES]
-y = df["label_encoded"]
-
-# ----------------------------------
-# 5. TRAIN / TEST SPLIT
-# ----------------------------------
-X_train, X_test, y_train, y_test = train_test_split(
-    X,
-    y,
-    test_size=0.2,
-    random_state=42,
-    stratify=y
-)
+_model = None
 
-# ----------------------------------
-# 6. TRAIN MODEL
-# ----------------------------------
-tsunami_model = RandomForestClassifier(
-    n_estimators=200,
-    random_state=42
-)
-tsunami_model.fit(X_train, y_train)
-
-# ----------------------------------
-# 7. EVALUATION
-# ----------------------------------
-y_pred = tsunami_model.predict(X_test)
-print("Tsunami Model Accuracy:",
-      round(accuracy_score(y_test, y_pred), 3))
+def get_model():
+    global _model
+    if _model is None:
+        _model = joblib.load(MODEL_PATH)
+    return _model
 
 # ----------------------------------
-# 8. TSUNAMI EVALUATION FUNCTION
+# 2. TSUNAMI EVALUATION FUNCTION
 # ----------------------------------
 def evaluate_tsunami(sample):
     """
@@ -111,7 +58,7 @@ def evaluate_tsunami(sample):
         "distance_to_coast_km": sample["distance_to_coast_km"]
     }])
 
-    tsunami_prob = tsunami_model.predict_proba(input_df)[0][1]
+    tsunami_prob = get_model().predict_proba(input_df)[0][1]
 
     # PHYSICAL SAFETY RULES (FINAL DECISION)
     tsunami_alert = (
@@ -128,7 +75,7 @@ def evaluate_tsunami(sample):
     }
 
 # ----------------------------------
-# 9. TEST CASES
+# 3. TEST CASES
 # ----------------------------------
 if __name__ == "__main__":
 